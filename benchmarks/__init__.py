@@ -0,0 +1 @@
+"""Benchmarks for honeybee-ifc."""
@@ -0,0 +1,74 @@
+"""Benchmark the compact format against HBJSON.
+
+Each HBJSON file is loaded once and written and loaded again as HBJSON and as
+compressed and uncompressed compact files. The size, the write time and the load
+time of each format are reported. The load time is split into reading the model
+dictionary and creating the Honeybee Model from it.
+
+Usage:
+    python -m benchmarks.compact path/to/model.hbjson [path/to/other.hbjson ...]
+"""
+
+import argparse
+import json
+import pathlib
+import tempfile
+import time
+
+from honeybee.model import Model as HBModel
+
+from honeybee_ifc.compact import load_compact, read_compact, write_compact
+
+
+def _best(function, repeat: int) -> float:
+    """The shortest time of a few runs of a function."""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start)
+    return round(min(seconds), 3)
+
+
+def _read_hbjson(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def benchmark(hbjson_path: str, repeat: int = 3) -> list:
+    """Time writing and loading a model as HBJSON and as compact files."""
+    hb_model = HBModel.from_hbjson(hbjson_path)
+    reports = []
+    with tempfile.TemporaryDirectory() as folder:
+        formats = (
+            ('hbjson', pathlib.Path(folder, 'model.hbjson'),
+             lambda path: hb_model.to_hbjson('model', folder), _read_hbjson,
+             HBModel.from_hbjson),
+            ('compact', pathlib.Path(folder, 'model.hbz'),
+             lambda path: write_compact(hb_model, path), read_compact, load_compact),
+            ('compact-uncompressed', pathlib.Path(folder, 'raw.hbz'),
+             lambda path: write_compact(hb_model, path, compress=False), read_compact,
+             load_compact)
+        )
+        for name, path, write, read, load in formats:
+            report = {'file': hbjson_path, 'format': name}
+            report['write_seconds'] = _best(lambda: write(path), repeat)
+            report['size_mb'] = round(path.stat().st_size / 1024 ** 2, 3)
+            report['read_seconds'] = _best(lambda: read(path), repeat)
+            report['load_seconds'] = _best(lambda: load(path), repeat)
+            reports.append(report)
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('hbjson_files', nargs='+', help='Path to HBJSON files.')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for hbjson_path in args.hbjson_files:
+        for report in benchmark(hbjson_path, args.repeat):
+            print(', '.join(f'{key}: {value}' for key, value in report.items()))
+
+
+if __name__ == '__main__':
+    main()
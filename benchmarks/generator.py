@@ -0,0 +1,239 @@
+"""Generate synthetic IFC2x3 buildings for tests and benchmarks.
+
+Each storey has a row of rooms. Every room is an IfcSpace with walls along its
+front and back, a floor slab and a column in one corner. Windows and doors are
+distributed over the walls with an IfcOpeningElement that voids the wall.
+
+Usage:
+    python -m benchmarks.generator path/to/model.ifc --storeys 3 --rooms 10
+"""
+
+import argparse
+import time
+import uuid
+from typing import Sequence
+
+import ifcopenshell
+import ifcopenshell.guid
+
+ROOM_WIDTH = 5.0
+ROOM_DEPTH = 5.0
+STOREY_HEIGHT = 3.0
+WALL_THICKNESS = 0.2
+SLAB_THICKNESS = 0.2
+COLUMN_SIZE = 0.3
+WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_SILL = 1.2, 1.2, 0.9
+DOOR_WIDTH, DOOR_HEIGHT = 0.9, 2.1
+
+# prefix of the length unit of the file with the number of file units per meter
+LENGTH_UNITS = {'METRE': (None, 1.0), 'MILLIMETRE': ('MILLI', 1000.0)}
+
+
+class _Builder:
+    """A minimal helper to create IFC2x3 entities.
+
+    The lengths are given in meters and are written in the length unit of the file.
+    """
+
+    def __init__(self, name: str, length_unit: str = 'METRE') -> None:
+        prefix, self.scale = LENGTH_UNITS[length_unit]
+        self.file = ifcopenshell.file(schema='IFC2X3')
+        f = self.file
+        person = f.createIfcPerson(None, None, 'honeybee-ifc')
+        organization = f.createIfcOrganization(None, 'honeybee-ifc')
+        application = f.createIfcApplication(
+            organization, '0.0', 'honeybee-ifc benchmarks', 'honeybee-ifc')
+        self.owner_history = f.createIfcOwnerHistory(
+            f.createIfcPersonAndOrganization(person, organization), application,
+            None, 'ADDED', None, None, None, int(time.time()))
+        self.origin = self.axis2placement()
+        self.context = f.createIfcGeometricRepresentationContext(
+            None, 'Model', 3, 1.0e-5, self.origin, None)
+        units = f.createIfcUnitAssignment([
+            f.createIfcSIUnit(None, 'LENGTHUNIT', prefix, 'METRE'),
+            f.createIfcSIUnit(None, 'AREAUNIT', None, 'SQUARE_METRE'),
+            f.createIfcSIUnit(None, 'VOLUMEUNIT', None, 'CUBIC_METRE'),
+            f.createIfcSIUnit(None, 'PLANEANGLEUNIT', None, 'RADIAN')])
+        self.project = f.createIfcProject(
+            self.guid(), self.owner_history, name, None, None, None, None,
+            [self.context], units)
+
+    @staticmethod
+    def guid() -> str:
+        return ifcopenshell.guid.compress(uuid.uuid4().hex)
+
+    def axis2placement(self, x=0.0, y=0.0, z=0.0):
+        f = self.file
+        x, y, z = (float(value * self.scale) for value in (x, y, z))
+        return f.createIfcAxis2Placement3D(
+            f.createIfcCartesianPoint((x, y, z)),
+            f.createIfcDirection((0.0, 0.0, 1.0)), f.createIfcDirection((1.0, 0.0, 0.0)))
+
+    def placement(self, relative_to=None, x=0.0, y=0.0, z=0.0):
+        return self.file.createIfcLocalPlacement(
+            relative_to, self.axis2placement(x, y, z))
+
+    def box(self, x_dim: float, y_dim: float, z_dim: float):
+        """A box shape with its minimum corner at the origin of the placement."""
+        f = self.file
+        x_dim, y_dim, z_dim = (value * self.scale for value in (x_dim, y_dim, z_dim))
+        profile = f.createIfcRectangleProfileDef(
+            'AREA', None,
+            f.createIfcAxis2Placement2D(
+                f.createIfcCartesianPoint((x_dim / 2, y_dim / 2)), None),
+            x_dim, y_dim)
+        solid = f.createIfcExtrudedAreaSolid(
+            profile, self.axis2placement(), f.createIfcDirection((0.0, 0.0, 1.0)), z_dim)
+        representation = f.createIfcShapeRepresentation(
+            self.context, 'Body', 'SweptSolid', [solid])
+        return f.createIfcProductDefinitionShape(None, None, [representation])
+
+    def length(self, value: float) -> float:
+        return value * self.scale
+
+    def product(self, ifc_class: str, name: str, placement, shape, **kwargs):
+        return self.file.create_entity(
+            ifc_class, GlobalId=self.guid(), OwnerHistory=self.owner_history,
+            Name=name, ObjectPlacement=placement, Representation=shape, **kwargs)
+
+    def aggregate(self, parent, children: Sequence) -> None:
+        self.file.createIfcRelAggregates(
+            self.guid(), self.owner_history, None, None, parent, list(children))
+
+    def contain(self, storey, elements: Sequence) -> None:
+        if elements:
+            self.file.createIfcRelContainedInSpatialStructure(
+                self.guid(), self.owner_history, None, None, list(elements), storey)
+
+
+def _fill_wall(builder: _Builder, storey_placement, wall, x, y, fill_class, name,
+               width, height, sill, slot):
+    """Create an opening in a wall and fill it with a window or a door."""
+    offset = 0.5 + (slot * (width + 0.5)) % (ROOM_WIDTH - width - 1.0)
+    opening = builder.product(
+        'IfcOpeningElement', f'Opening {name}',
+        builder.placement(storey_placement, x + offset, y - 0.05, sill),
+        builder.box(width, WALL_THICKNESS + 0.1, height))
+    builder.file.createIfcRelVoidsElement(
+        builder.guid(), builder.owner_history, None, None, wall, opening)
+    element = builder.product(
+        fill_class, name,
+        builder.placement(storey_placement, x + offset, y + WALL_THICKNESS / 2 - 0.025,
+                          sill),
+        builder.box(width, 0.05, height),
+        OverallHeight=builder.length(height), OverallWidth=builder.length(width))
+    builder.file.createIfcRelFillsElement(
+        builder.guid(), builder.owner_history, None, None, opening, element)
+    return element
+
+
+def generate(path: str, storeys: int = 1, rooms: int = 4, windows: int = 4,
+             doors: int = 1, columns: int = 1, spaces: bool = True,
+             slabs: bool = True, length_unit: str = 'METRE') -> str:
+    """Generate a synthetic IFC2x3 building.
+
+    Args:
+        path: Path to the IFC file to write.
+        storeys: Number of storeys.
+        rooms: Number of rooms per storey. Each room has two walls.
+        windows: Number of windows per storey.
+        doors: Number of doors per storey.
+        columns: Number of columns per storey.
+        spaces: Set to False to skip creating an IfcSpace per room.
+        slabs: Set to False to skip creating a floor slab per room.
+        length_unit: Length unit of the file. METRE or MILLIMETRE. The building has
+            the same size in both. Default: METRE.
+
+    Returns:
+        The path to the IFC file.
+    """
+    builder = _Builder('Synthetic building', length_unit)
+    site_placement = builder.placement()
+    site = builder.product(
+        'IfcSite', 'Site', site_placement, None, CompositionType='ELEMENT')
+    building_placement = builder.placement(site_placement)
+    building = builder.product(
+        'IfcBuilding', 'Building', building_placement, None, CompositionType='ELEMENT')
+    builder.aggregate(builder.project, [site])
+    builder.aggregate(site, [building])
+
+    levels = []
+    for level in range(storeys):
+        z = level * STOREY_HEIGHT
+        storey_placement = builder.placement(building_placement, z=z)
+        storey = builder.product(
+            'IfcBuildingStorey', f'Level {level}', storey_placement, None,
+            CompositionType='ELEMENT', Elevation=builder.length(z))
+        levels.append(storey)
+
+        elements, room_spaces, walls = [], [], []
+        for room in range(rooms):
+            x = room * ROOM_WIDTH
+            for side, y in (('front', 0.0), ('back', ROOM_DEPTH - WALL_THICKNESS)):
+                wall = builder.product(
+                    'IfcWallStandardCase', f'Wall {level}-{room}-{side}',
+                    builder.placement(storey_placement, x, y),
+                    builder.box(ROOM_WIDTH, WALL_THICKNESS, STOREY_HEIGHT - SLAB_THICKNESS))
+                walls.append((wall, x, y))
+            if slabs:
+                elements.append(builder.product(
+                    'IfcSlab', f'Slab {level}-{room}',
+                    builder.placement(storey_placement, x, 0.0, -SLAB_THICKNESS),
+                    builder.box(ROOM_WIDTH, ROOM_DEPTH, SLAB_THICKNESS),
+                    PredefinedType='FLOOR'))
+            if spaces:
+                room_spaces.append(builder.product(
+                    'IfcSpace', f'Space {level}-{room}',
+                    builder.placement(storey_placement, x, WALL_THICKNESS),
+                    builder.box(ROOM_WIDTH, ROOM_DEPTH - 2 * WALL_THICKNESS,
+                                STOREY_HEIGHT - SLAB_THICKNESS),
+                    CompositionType='ELEMENT', InteriorOrExteriorSpace='INTERNAL'))
+
+        for count in range(columns):
+            x = (count % max(rooms, 1)) * ROOM_WIDTH + COLUMN_SIZE
+            y = WALL_THICKNESS + COLUMN_SIZE * (1 + 2 * (count // max(rooms, 1)))
+            elements.append(builder.product(
+                'IfcColumn', f'Column {level}-{count}',
+                builder.placement(storey_placement, x, y),
+                builder.box(COLUMN_SIZE, COLUMN_SIZE, STOREY_HEIGHT - SLAB_THICKNESS)))
+
+        for count in range(windows + doors):
+            if not walls:
+                break
+            wall, x, y = walls[count % len(walls)]
+            slot = count // len(walls)
+            if count < windows:
+                elements.append(_fill_wall(
+                    builder, storey_placement, wall, x, y, 'IfcWindow',
+                    f'Window {level}-{count}', WINDOW_WIDTH, WINDOW_HEIGHT,
+                    WINDOW_SILL, slot))
+            else:
+                elements.append(_fill_wall(
+                    builder, storey_placement, wall, x, y, 'IfcDoor',
+                    f'Door {level}-{count}', DOOR_WIDTH, DOOR_HEIGHT, 0.0, slot))
+
+        builder.contain(storey, [wall for wall, _, _ in walls] + elements)
+        if room_spaces:
+            builder.aggregate(storey, room_spaces)
+
+    builder.aggregate(building, levels)
+    builder.file.write(str(path))
+    return str(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', help='Path to the IFC file to write.')
+    parser.add_argument('--storeys', type=int, default=1)
+    parser.add_argument('--rooms', type=int, default=4, help='Rooms per storey.')
+    parser.add_argument('--windows', type=int, default=4, help='Windows per storey.')
+    parser.add_argument('--doors', type=int, default=1, help='Doors per storey.')
+    parser.add_argument('--columns', type=int, default=1, help='Columns per storey.')
+    parser.add_argument('--length-unit', default='METRE', choices=tuple(LENGTH_UNITS))
+    args = parser.parse_args()
+    print(generate(args.path, args.storeys, args.rooms, args.windows, args.doors,
+                   args.columns, length_unit=args.length_unit))
+
+
+if __name__ == '__main__':
+    main()
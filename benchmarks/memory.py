@@ -0,0 +1,127 @@
+"""Measure the memory that a Model keeps for each converted element.
+
+The memory is measured in a fresh Python process after the elements are extracted
+from the IFC file and again after their geometry is built. Python memory is traced
+with tracemalloc. The resident memory also includes the shapes that ifcopenshell
+allocates outside of Python and is only reported on Linux.
+
+The memory after the geometry is built is not reduced by the compact elements. It
+is dominated by the ladybug Polyface3D and Face3D objects that the Model keeps to
+create the Honeybee objects. e.g. about 83 KB per element of resident memory for a
+synthetic building with 8 storeys compared with 30 KB after the extraction. See
+the docstring of the Model.
+
+Usage:
+    python -m benchmarks.memory --storeys 4 --rooms 10 --windows 10
+"""
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+from .generator import generate
+
+MEASURE = '''
+import gc
+import json
+import sys
+import tracemalloc
+
+import ifcopenshell
+from honeybee_ifc.model import Model
+
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    import resource
+    return pages * resource.getpagesize() / 1024 ** 2
+
+
+def instance_bytes(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+ifc_file = ifcopenshell.open(sys.argv[1])
+gc.collect()
+start_rss = rss_mb()
+tracemalloc.start()
+start = tracemalloc.get_traced_memory()[0]
+
+model = Model(sys.argv[1], merge_coplanar={merge_coplanar}, ifc_file=ifc_file)
+elements = model.windows + model.doors + model.slabs + model.shades + model.spaces
+gc.collect()
+extracted = tracemalloc.get_traced_memory()[0]
+extracted_rss = rss_mb()
+
+for wall in model.walls:
+    wall.to_face3ds()
+for element in elements + model._get_openings():
+    element.polyface3d
+gc.collect()
+built = tracemalloc.get_traced_memory()[0]
+built_rss = rss_mb()
+
+objects = model.walls + elements + model._get_openings()
+print(json.dumps({{
+    'elements': len(objects),
+    'instance_bytes': sum(instance_bytes(obj) for obj in objects),
+    'extracted_bytes': extracted - start,
+    'built_bytes': built - start,
+    'extracted_rss_mb': None if start_rss is None else extracted_rss - start_rss,
+    'built_rss_mb': None if start_rss is None else built_rss - start_rss
+}}))
+'''
+
+
+def benchmark_file(ifc_file_path: str, merge_coplanar: bool = False) -> dict:
+    """Measure the memory of a Model per element in a fresh Python process."""
+    output = subprocess.run(
+        [sys.executable, '-c', MEASURE.format(merge_coplanar=merge_coplanar),
+         str(ifc_file_path)], check=True, capture_output=True, text=True).stdout
+    data = json.loads(output.strip().splitlines()[-1])
+    count = max(data['elements'], 1)
+    report = {'file': str(ifc_file_path), 'elements': data['elements']}
+    for key in ('instance', 'extracted', 'built'):
+        report[f'{key}_bytes_per_element'] = round(data[f'{key}_bytes'] / count)
+    for key in ('extracted', 'built'):
+        rss = data[f'{key}_rss_mb']
+        report[f'{key}_rss_kb_per_element'] = \
+            None if rss is None else round(rss * 1024 / count, 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('ifc_files', nargs='*',
+                        help='Path to IFC files. A synthetic building is generated '
+                        'if no file is provided.')
+    parser.add_argument('--storeys', type=int, default=4)
+    parser.add_argument('--rooms', type=int, default=10, help='Rooms per storey.')
+    parser.add_argument('--windows', type=int, default=10, help='Windows per storey.')
+    parser.add_argument('--doors', type=int, default=2, help='Doors per storey.')
+    parser.add_argument('--columns', type=int, default=5, help='Columns per storey.')
+    parser.add_argument('--merge-coplanar', action='store_true')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        ifc_files = args.ifc_files or [generate(
+            pathlib.Path(folder, 'synthetic.ifc'), storeys=args.storeys,
+            rooms=args.rooms, windows=args.windows, doors=args.doors,
+            columns=args.columns)]
+        for ifc_file_path in ifc_files:
+            report = benchmark_file(ifc_file_path, args.merge_coplanar)
+            print(', '.join(f'{key}: {value}' for key, value in report.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark building the Polyface3D of elements with many faces.
+
+get_polyface3d is compared with Polyface3D.from_faces which it replaces. The slabs
+are extruded polygons with many edges and holes. The spaces are boxes with their
+sides split into a grid of faces as in the triangulated spaces of some exporters.
+
+Usage:
+    python -m benchmarks.polyface --sizes 8 16 32
+"""
+
+import argparse
+import math
+import time
+from typing import List
+
+from ladybug_geometry.geometry3d import Face3D, Point3D, Polyface3D, Vector3D
+
+from honeybee_ifc._helper import get_polyface3d
+
+
+def _from_faces(face3ds: List[Face3D], tolerance: float = 0.01) -> Polyface3D:
+    """The Polyface3D of a list of faces as it was built before get_polyface3d."""
+    polyface3d = Polyface3D.from_faces(face3ds, tolerance=tolerance)
+    if polyface3d.is_solid:
+        return polyface3d
+    faces = Polyface3D.get_outward_faces(polyface3d.faces, tolerance)
+    return Polyface3D.from_faces(faces, tolerance=tolerance)
+
+
+def slab(size: int) -> List[Face3D]:
+    """A round slab with size * 8 edges and size square holes."""
+    radius, height = 20.0, 0.3
+    count = size * 8
+    boundary = [Point3D(radius * math.cos(2 * math.pi * i / count),
+                        radius * math.sin(2 * math.pi * i / count), 0)
+                for i in range(count)]
+    holes = []
+    for i in range(size):
+        x = -10 + 20 * i / size
+        holes.append([Point3D(x, -0.25, 0), Point3D(x, 0.25, 0),
+                      Point3D(x + 0.5, 0.25, 0), Point3D(x + 0.5, -0.25, 0)])
+    bottom = Face3D(boundary, holes=holes).flip()
+    top = Face3D(boundary, holes=holes).move(Vector3D(0, 0, height))
+    sides = []
+    for loop in [boundary] + holes:
+        for start, end in zip(loop, loop[1:] + loop[:1]):
+            sides.append(Face3D([start, end, end.move(Vector3D(0, 0, height)),
+                                 start.move(Vector3D(0, 0, height))]))
+    return [bottom, top] + sides
+
+
+def space(size: int) -> List[Face3D]:
+    """A 5 x 5 x 3 m box with each side split into size x size faces."""
+    box = Polyface3D.from_box(5, 5, 3)
+    faces = []
+    for face in box.faces:
+        origin, first, _, last = face.vertices
+        u, v = (first - origin) / size, (last - origin) / size
+        for i in range(size):
+            for j in range(size):
+                corner = origin + u * i + v * j
+                faces.append(Face3D([corner, corner + u, corner + u + v, corner + v]))
+    return faces
+
+
+def benchmark(name: str, face3ds: List[Face3D], repeat: int = 3) -> dict:
+    """Time building the Polyface3D of a list of faces with both methods."""
+    report = {'element': name, 'faces': len(face3ds)}
+    for label, function in (('from_faces', _from_faces), ('welded', get_polyface3d)):
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            polyface3d = function(face3ds)
+            seconds.append(time.perf_counter() - start)
+        report[f'{label}_seconds'] = round(min(seconds), 4)
+        report[f'{label}_solid'] = polyface3d.is_solid
+    report['speedup'] = round(report['from_faces_seconds'] /
+                              max(report['welded_seconds'], 1e-9), 1)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[8, 16, 32],
+                        help='Sizes of the generated slabs and spaces.')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for size in args.sizes:
+        for name, function in (('slab', slab), ('space', space)):
+            report = benchmark(f'{name}-{size}', function(size), args.repeat)
+            print(', '.join(f'{key}: {value}' for key, value in report.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Measure how the conversion of synthetic buildings scales with their size.
+
+For each scale a synthetic IFC file is generated and converted. Time and peak
+Python memory are reported for each stage of the conversion.
+
+Usage:
+    python -m benchmarks.scaling --scales 1 2 4 8 --output scaling.json
+"""
+
+import argparse
+import json
+import pathlib
+import tempfile
+from typing import Dict, List
+
+from honeybee_ifc.model import Model
+from honeybee_ifc.profiler import Profiler
+
+from .generator import generate
+
+STAGES = ('wall extraction', 'element extraction', 'honeybee conversion',
+          'grid generation', 'serialization')
+
+
+def benchmark_file(ifc_file_path: str, target_folder: str, **kwargs) -> Dict[str, dict]:
+    """Convert an IFC file and measure each stage of the conversion."""
+    profiler = Profiler(trace_memory=True)
+    model = Model(ifc_file_path, profile=profiler, **kwargs)
+    model.to_hbjson(target_folder)
+
+    report = profiler.to_dict()
+    report.update(report.pop('stages'))
+    report['counts'] = {
+        'walls': len(model.walls), 'windows': len(model.windows),
+        'doors': len(model.doors), 'slabs': len(model.slabs),
+        'columns': len(model.shades), 'spaces': len(model.spaces),
+        'faces': report['honeybee conversion']['faces'],
+        'sensors': report['grid generation']['sensors']
+    }
+    return report
+
+
+def benchmark(scales: List[int], storeys: int = 1, rooms: int = 10, windows: int = 10,
+              doors: int = 2, columns: int = 5, **kwargs) -> List[dict]:
+    """Generate and convert synthetic buildings for a list of scales.
+
+    The number of storeys is multiplied by the scale. All the other counts are per
+    storey.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for scale in scales:
+            ifc_file_path = generate(
+                pathlib.Path(folder, f'synthetic_{scale}.ifc'), storeys=storeys * scale,
+                rooms=rooms, windows=windows, doors=doors, columns=columns)
+            report = benchmark_file(ifc_file_path, folder, **kwargs)
+            report['scale'] = scale
+            results.append(report)
+    return results
+
+
+def _print_table(results: List[dict]) -> None:
+    print(f'{"scale":>6} {"faces":>8} ' + ' '.join(f'{stage:>20}' for stage in STAGES))
+    for report in results:
+        cells = [f'{report[stage]["seconds"]:>8.3f}s '
+                 f'{report[stage]["peak_traced_mb"]:>8.1f}MB' for stage in STAGES]
+        print(f'{report["scale"]:>6} {report["counts"]["faces"]:>8} ' + ' '.join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--storeys', type=int, default=1, help='Storeys at scale 1.')
+    parser.add_argument('--rooms', type=int, default=10, help='Rooms per storey.')
+    parser.add_argument('--windows', type=int, default=10, help='Windows per storey.')
+    parser.add_argument('--doors', type=int, default=2, help='Doors per storey.')
+    parser.add_argument('--columns', type=int, default=5, help='Columns per storey.')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--output', help='Optional path to write the results as JSON.')
+    args = parser.parse_args()
+
+    results = benchmark(args.scales, args.storeys, args.rooms, args.windows, args.doors,
+                        args.columns, workers=args.workers)
+    _print_table(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
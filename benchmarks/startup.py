@@ -0,0 +1,72 @@
+"""Benchmark import time and time to first result of a Model.
+
+Each measurement runs in a fresh Python process so that it includes the cost of a
+cold start.
+
+Usage:
+    python -m benchmarks.startup path/to/model.ifc
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+IMPORT = '''
+import time
+start = time.perf_counter()
+import honeybee_ifc.model
+print(time.perf_counter() - start)
+'''
+
+FIRST_RESULT = '''
+import sys
+import time
+start = time.perf_counter()
+from honeybee_ifc.model import Model
+model = Model(sys.argv[1], lazy={lazy})
+guids = [window.guid for window in model.windows]
+print(time.perf_counter() - start)
+'''
+
+FIRST_GEOMETRY = '''
+import sys
+import time
+start = time.perf_counter()
+from honeybee_ifc.model import Model
+model = Model(sys.argv[1], lazy={lazy})
+element = (model.windows or model.doors or model.slabs or model.spaces)[0]
+element.polyface3d
+print(time.perf_counter() - start)
+'''
+
+
+def _run(code: str, *args) -> float:
+    """Run code in a fresh interpreter and return the seconds it prints."""
+    output = subprocess.run(
+        [sys.executable, '-c', code, *args], check=True, capture_output=True,
+        text=True).stdout
+    return round(float(output.strip().splitlines()[-1]), 3)
+
+
+def benchmark(ifc_file_path: str) -> dict:
+    """Measure cold start times for eager and lazy models."""
+    report = {'file': ifc_file_path, 'import_seconds': _run(IMPORT)}
+    for lazy in (False, True):
+        mode = 'lazy' if lazy else 'eager'
+        report[f'{mode}_first_result_seconds'] = _run(
+            FIRST_RESULT.format(lazy=lazy), ifc_file_path)
+        report[f'{mode}_first_geometry_seconds'] = _run(
+            FIRST_GEOMETRY.format(lazy=lazy), ifc_file_path)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('ifc_file', help='Path to an IFC file.')
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.ifc_file), indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark merging coplanar wall triangles against the triangulated walls.
+
+Usage:
+    python -m benchmarks.wall_merge path/to/model.ifc [path/to/other.ifc ...]
+"""
+
+import argparse
+import multiprocessing
+import time
+
+import ifcopenshell
+import ifcopenshell.geom
+
+from honeybee_ifc.wall import Wall
+
+
+def _wall_shapes(ifc_file, settings):
+    """Tessellate all the walls of an IFC file once."""
+    walls = ifc_file.by_type('IfcWall')
+    if not walls:
+        return []
+    iterator = ifcopenshell.geom.iterator(
+        settings, ifc_file, multiprocessing.cpu_count(), include=walls)
+    shapes = []
+    if iterator.initialize():
+        while True:
+            shape = iterator.get()
+            shapes.append((ifc_file.by_guid(shape.guid), shape))
+            if not iterator.next():
+                break
+    return shapes
+
+
+def benchmark(ifc_file_path: str) -> dict:
+    """Time the conversion of walls to Face3Ds with and without merging."""
+    ifc_file = ifcopenshell.open(ifc_file_path)
+    settings = Wall._settings()
+    shapes = _wall_shapes(ifc_file, settings)
+
+    report = {'file': ifc_file_path, 'walls': len(shapes)}
+    for label, merge in (('triangles', False), ('merged', True)):
+        start = time.perf_counter()
+        count = sum(len(Wall(element, settings, shape, merge).to_face3ds())
+                    for element, shape in shapes)
+        report[f'{label}_faces'] = count
+        report[f'{label}_seconds'] = round(time.perf_counter() - start, 3)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('ifc_files', nargs='+', help='Path to IFC files.')
+    args = parser.parse_args()
+    for ifc_file_path in args.ifc_files:
+        report = benchmark(ifc_file_path)
+        print(', '.join(f'{key}: {value}' for key, value in report.items()))
+
+
+if __name__ == '__main__':
+    main()
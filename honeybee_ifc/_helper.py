@@ -1,19 +1,21 @@
 """helper methods for other modules."""
 
+import hashlib
+import itertools
+import math
 import time
-from functools import wraps
+from functools import lru_cache, wraps
 from datetime import timedelta
-from typing import List
+from typing import Dict, List, Tuple, Union
 
-from ladybug_geometry.geometry3d import Point3D, Plane, Face3D, LineSegment3D, Polyline3D
+import numpy as np
+from ladybug_geometry.geometry2d import Polygon2D
+from ladybug_geometry.geometry3d import Point3D, Vector3D, Plane, Face3D, Polyface3D
 
 import ifcopenshell
 from ifcopenshell import geom
 from ifcopenshell.entity_instance import entity_instance as Element
 
-import FreeCAD
-import Part
-
 
 def report_time(seconds):
     if seconds <= 60:
@@ -37,42 +39,769 @@ def duration(func):
     return wrapper
 
 
-def get_shape(element: Element, settings: ifcopenshell.geom.settings) -> Part.Shape:
+def guid_identifier(prefix: str, guid: str, index: int = None) -> str:
+    """Get a deterministic Honeybee identifier from the GlobalId of an IFC element.
+
+    The $ character of IFC GlobalIds is not valid in Honeybee identifiers and is
+    replaced with - which is not used in GlobalIds.
+
+    Args:
+        prefix: Prefix of the identifier. e.g. Wall. It should not include _.
+        guid: GlobalId of the IFC element.
+        index: Optional index for elements that are translated to several Honeybee
+            objects. Default: None.
+    """
+    identifier = f'{prefix}_{guid.replace("$", "-")}'
+    return identifier if index is None else f'{identifier}_{index}'
+
+
+def guid_from_identifier(identifier: str) -> str:
+    """Get the GlobalId of the IFC element from an identifier made by guid_identifier.
+
+    Returns None if the identifier is not made by guid_identifier.
+    """
+    _, _, rest = identifier.partition('_')
+    guid = rest[:22]
+    if len(guid) != 22 or (len(rest) > 22 and rest[22] != '_'):
+        return None
+    return guid.replace('-', '$')
+
+
+def _value_hash(value, memo: Dict[int, str]) -> str:
+    if isinstance(value, Element):
+        return entity_hash(value, memo)
+    if isinstance(value, (tuple, list)):
+        return '(' + ','.join(_value_hash(item, memo) for item in value) + ')'
+    return repr(value)
+
+
+def entity_hash(entity: Element, memo: Dict[int, str] = None) -> str:
+    """Get a hash of an IFC entity and all the entities that it references.
+
+    The hash does not depend on the step ids of the entities, so the same entity in
+    two revisions of a file has the same hash. Owner histories are ignored since they
+    change on every save.
+
+    Args:
+        entity: An IFC entity.
+        memo: An optional dictionary to reuse the hashes of the entities that are
+            shared between elements. e.g. placements and representation maps.
+    """
+    memo = {} if memo is None else memo
+    entity_id = entity.id()
+    if entity_id and entity_id in memo:
+        return memo[entity_id]
+    values = [entity.is_a()]
+    for value in entity:
+        if isinstance(value, Element) and value.is_a('IfcOwnerHistory'):
+            continue
+        values.append(_value_hash(value, memo))
+    digest = hashlib.sha1('|'.join(values).encode('utf-8')).hexdigest()
+    if entity_id:
+        memo[entity_id] = digest
+    return digest
+
+
+def get_shape(element: Element, settings: ifcopenshell.geom.settings,
+              shape=None) -> 'Part.Shape':
     """Convert an ifc element to a FreeCAD shape object.
 
     This functions is using the Part module of the FreeCAD package
     https://github.com/FreeCAD/FreeCAD/releases to access the Shape object of an 
-    IFC element.
+    IFC element. FreeCAD is only imported when this function is used and the
+    settings must be set to use BREP data.
 
     Args:
         element: An IFC element
         settings: An ifcopenshell.geom.settings object
+        shape: An optional shape that is already created for the element by
+            ifcopenshell.geom. This is the case when the shapes are generated by
+            ifcopenshell.geom.iterator. If not provided, the shape will be created
+            from the element. Default: None.
 
     Returns:
         A FreeCAD shape object
     """
-    shape = geom.create_shape(settings, element)
-    occ_shape = shape.geometry.brep_data
+    if shape is None:
+        shape = geom.create_shape(settings, element)
+    return get_shape_from_brep(shape.geometry.brep_data)
+
+
+def iterate_shapes(ifc_file: ifcopenshell.file, settings: ifcopenshell.geom.settings,
+                   threads: int, include):
+    """Tessellate IFC elements in parallel with ifcopenshell.geom.iterator.
+
+    Args:
+        ifc_file: An ifcopenshell file.
+        settings: An ifcopenshell.geom.settings object.
+        threads: Number of threads of the iterator.
+        include: A list of IFC class names or IFC elements to tessellate.
+
+    Yields:
+        The shape of each element that has geometry. The GlobalId of the element is
+        shape.guid.
+    """
+    iterator = geom.iterator(settings, ifc_file, threads, include=include)
+    if iterator.initialize():
+        # the iterator is already at the first shape after it is initialized
+        while True:
+            yield iterator.get()
+            if not iterator.next():
+                break
+
+
+def get_shape_from_brep(brep_data: str) -> 'Part.Shape':
+    """Convert the BREP data of an ifcopenshell shape to a FreeCAD shape object."""
+    import FreeCAD  # noqa: F401
+    import Part
+
     fc_shape = Part.Shape()
-    fc_shape.importBrepFromString(occ_shape)
+    fc_shape.importBrepFromString(brep_data)
     return fc_shape
 
 
-def get_face3d_from_shape(shape: Part.Shape.Faces) -> Face3D:
-    """Get a Face3D from a FreeCAD shape object."""
-    edges = shape.Edges
+# offsets of a cell and its neighbors in a 3D hash grid
+_NEIGHBORS = tuple(itertools.product((-1, 0, 1), repeat=3))
+
+
+def _segment_loops(segments: np.ndarray,
+                   tolerance: float = 0.01) -> Tuple[np.ndarray, List[List[int]]]:
+    """Join line segments into closed loops.
+
+    The end points of the segments are snapped into a hash grid with cells of the
+    size of the tolerance so that points closer than the tolerance are one vertex.
+    The loops are then walked over the edges of each vertex in linear time. Segments
+    that collapse to a point and pairs of segments between the same vertices are
+    removed. e.g. the seam of a face.
+
+    Args:
+        segments: An (N, 2, 3) array of the start and end points of the segments.
+        tolerance: The distance to merge the end points. Default: 0.01.
+
+    Returns:
+        A tuple with the (M, 3) array of vertices and a list of loops of vertex
+        indices. Open chains are not returned.
+    """
+    grid, vertices, edges = {}, [], {}
+
+    def vertex_id(point):
+        cell = tuple(math.floor(value / tolerance) for value in point)
+        for offset in _NEIGHBORS:
+            for i in grid.get((cell[0] + offset[0], cell[1] + offset[1],
+                               cell[2] + offset[2]), ()):
+                if sum((a - b) ** 2 for a, b in zip(vertices[i], point)) <= \
+                        tolerance ** 2:
+                    return i
+        grid.setdefault(cell, []).append(len(vertices))
+        vertices.append(point)
+        return len(vertices) - 1
+
+    for start, end in np.asarray(segments, dtype=float).reshape(-1, 2, 3).tolist():
+        a, b = vertex_id(start), vertex_id(end)
+        if a != b:
+            edge = (a, b) if a < b else (b, a)
+            edges[edge] = edges.get(edge, 0) + 1
+
+    adjacency = {}
+    for (a, b), count in edges.items():
+        if count % 2:
+            adjacency.setdefault(a, []).append(b)
+            adjacency.setdefault(b, []).append(a)
+
+    loops = []
+    while adjacency:
+        start = next(iter(adjacency))
+        loop, vertex = [start], start
+        while True:
+            neighbors = adjacency[vertex]
+            following = neighbors.pop()
+            adjacency[following].remove(vertex)
+            for i in (vertex, following):
+                if not adjacency[i]:
+                    del adjacency[i]
+            if following == start:
+                break
+            loop.append(following)
+            vertex = following
+            if vertex not in adjacency:
+                # an open chain
+                loop = None
+                break
+        if loop is not None and len(loop) > 2:
+            loops.append(loop)
+    return np.array(vertices).reshape(-1, 3), loops
+
+
+def face3d_from_segments(segments: np.ndarray, tolerance: float = 0.01,
+                         normal: Vector3D = None) -> Face3D:
+    """Get a Face3D with holes from the line segments of the edges of a planar face.
+
+    The loop with the largest area is the boundary and the other loops are holes.
+
+    Args:
+        segments: An (N, 2, 3) array of the start and end points of the segments.
+        tolerance: The distance to merge the end points. Default: 0.01.
+        normal: An optional normal for the face. The boundary is reversed if it
+            doesn't match the normal. Default: None.
+
+    Returns:
+        A Face3D or None if the segments don't make any closed loop.
+    """
+    vertices, loops = _segment_loops(segments, tolerance)
+    if not loops:
+        return None
+    point3ds = [Point3D(*v) for v in vertices.tolist()]
+    faces = [Face3D([point3ds[i] for i in loop], enforce_right_hand=False)
+             for loop in loops]
+    boundary = max(faces, key=lambda face: face.area)
+    if normal is not None and boundary.normal.dot(normal) < 0:
+        boundary = boundary.flip()
+    plane = boundary.plane
+    holes = []
+    for face in faces:
+        if face is boundary:
+            continue
+        hole = list(face.boundary)
+        polygon = Polygon2D([plane.xyz_to_xy(pt) for pt in hole])
+        holes.append(hole if polygon.is_clockwise else hole[::-1])
+    return Face3D(boundary.boundary, plane, holes or None)
+
 
-    lines = [LineSegment3D.from_end_points(
-        Point3D(edge.Vertexes[0].X, edge.Vertexes[0].Y, edge.Vertexes[0].Z),
-        Point3D(edge.Vertexes[1].X, edge.Vertexes[1].Y, edge.Vertexes[1].Z))
-        for edge in edges]
-    polylines = Polyline3D.join_segments(lines, 0.01)
-    face3d = Face3D(boundary=polylines[0].vertices)
+def get_face3d_from_shape(shape: 'Part.Face', tolerance: float = 0.01) -> Face3D:
+    """Get a Face3D with holes from a FreeCAD shape object.
 
-    return face3d
+    See face3d_from_segments for the details.
+    """
+    segments = [
+        ((edge.Vertexes[0].X, edge.Vertexes[0].Y, edge.Vertexes[0].Z),
+         (edge.Vertexes[-1].X, edge.Vertexes[-1].Y, edge.Vertexes[-1].Z))
+        for edge in shape.Edges]
+    normal = shape.normalAt(0, 0)
+    return face3d_from_segments(
+        segments, tolerance, Vector3D(normal.x, normal.y, normal.z))
 
 
-def get_face3ds_from_shape(shape: Part.Shape) -> List[Face3D]:
+def get_face3ds_from_shape(shape: 'Part.Shape') -> List[Face3D]:
     """Get a list of Face3D from a FreeCAD shape object."""
     face3ds = [get_face3d_from_shape(face) for face in shape.Faces]
+    return [face3d for face3d in face3ds if face3d is not None]
+
+
+def get_triangles(verts: List[float], faces: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Get vertices and triangle indices of a triangulated shape as NumPy arrays.
+
+    Args:
+        verts: X Y Z of vertices in a flattened list as in the geometry of an
+            ifcopenshell shape. e.g. [v1x, v1y, v1z, v2x, v2y, v2z, ...]
+        faces: Indices of vertices per triangle in a flattened list as in the
+            geometry of an ifcopenshell shape. e.g. [f1v1, f1v2, f1v3, f2v1, ...]
+
+    Returns:
+        A tuple with two items.
+
+        -   vertices: An (N, 3) array of vertex coordinates.
+
+        -   triangles: An (M, 3) int32 array of vertex indices per triangle.
+    """
+    vertices = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+    triangles = np.asarray(faces, dtype=np.int32).reshape(-1, 3)
+    return vertices, triangles
+
+
+def get_triangle_normals(vertices: np.ndarray,
+                         triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the unit normals and the areas of triangles in batch.
+
+    Args:
+        vertices: An (N, 3) array of vertex coordinates.
+        triangles: An (M, 3) array of vertex indices per triangle.
+
+    Returns:
+        A tuple with two items.
+
+        -   normals: An (M, 3) array of unit normals. Normals of degenerate
+            triangles are set to zero.
+
+        -   areas: An (M,) array of triangle areas.
+    """
+    pts = vertices[triangles]
+    cross = np.cross(pts[:, 1] - pts[:, 0], pts[:, 2] - pts[:, 0])
+    lengths = np.linalg.norm(cross, axis=1)
+    normals = np.zeros_like(cross)
+    valid = lengths > 0
+    normals[valid] = cross[valid] / lengths[valid, None]
+    return normals, lengths / 2
+
+
+def get_face3ds_from_triangles(vertices: np.ndarray, triangles: np.ndarray,
+                               tolerance: float = 0.01) -> List[Face3D]:
+    """Get a list of triangular Face3D from vertex and triangle arrays.
+
+    Normals, areas and degenerate triangles are computed in batch with NumPy and the
+    ladybug objects are only created for the triangles that are kept.
+
+    Args:
+        vertices: An (N, 3) array of vertex coordinates.
+        triangles: An (M, 3) array of vertex indices per triangle.
+        tolerance: The distance tolerance. Triangles with an area smaller than or
+            equal to the area of a right triangle with two sides of this length are
+            considered degenerate and are skipped. Default: 0.01.
+
+    Returns:
+        A list of Face3D objects.
+    """
+    if not len(triangles):
+        return []
+    normals, areas = get_triangle_normals(vertices, triangles)
+    keep = areas > tolerance ** 2 / 2
+    triangles, normals = triangles[keep], normals[keep]
+
+    # only create a Point3D for the vertices that are used
+    used = np.unique(triangles)
+    point3ds = dict(zip(used.tolist(), (Point3D(*v) for v in vertices[used].tolist())))
+
+    face3ds = []
+    for tri, normal in zip(triangles.tolist(), normals.tolist()):
+        pts = [point3ds[i] for i in tri]
+        face3ds.append(Face3D(pts, plane=Plane(Vector3D(*normal), pts[0])))
+    return face3ds
+
+
+def weld_vertices(vertices: np.ndarray, triangles: np.ndarray,
+                  tolerance: float = 0.01) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge vertices that are equivalent within a tolerance.
+
+    The vertices are compared in the neighboring cells of a hash grid so vertices on
+    both sides of a cell boundary are merged too. See _weld_points. Triangles that
+    collapse after welding are removed.
+
+    Args:
+        vertices: An (N, 3) array of vertex coordinates.
+        triangles: An (M, 3) array of vertex indices per triangle.
+        tolerance: The distance tolerance in x, y and z to merge vertices.
+            Default: 0.01.
+
+    Returns:
+        A tuple with the welded vertices and the re-indexed triangles.
+    """
+    kept, ids = _weld_points(vertices.tolist(), tolerance)
+    triangles = np.array(ids, dtype=triangles.dtype)[triangles]
+    valid = (triangles[:, 0] != triangles[:, 1]) & \
+        (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    return vertices[kept], triangles[valid]
+
+
+def _group_coplanar_triangles(vertices: np.ndarray, triangles: np.ndarray,
+                              normals: np.ndarray, tolerance: float,
+                              angle_tolerance: float) -> np.ndarray:
+    """Get a group id per triangle using a hash of the rounded normal and plane offset.
+
+    Triangles in the same group are coplanar within the tolerances. Nearly coplanar
+    triangles that fall on different sides of a rounding boundary end up in different
+    groups which only means they are not merged.
+    """
+    offsets = np.einsum('ij,ij->i', normals, vertices[triangles[:, 0]])
+    keys = np.column_stack((
+        np.round(normals / angle_tolerance), np.round(offsets / tolerance)
+    )).astype(np.int64)
+    _, group_ids = np.unique(keys, axis=0, return_inverse=True)
+    return group_ids.reshape(-1)
+
+
+def _connected_triangles(triangles: np.ndarray, group_ids: np.ndarray) -> List[List[int]]:
+    """Split triangles into sets of edge-adjacent triangles within the same group."""
+    count = len(triangles)
+    edges = np.sort(
+        np.concatenate((triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]])),
+        axis=1)
+    owners = np.tile(np.arange(count), 3)
+    keys = np.column_stack((edges, group_ids[owners]))
+    order = np.lexsort(keys.T[::-1])
+    keys, owners = keys[order], owners[order]
+    shared = np.all(keys[1:] == keys[:-1], axis=1)
+
+    parents = list(range(count))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    for a, b in zip(owners[:-1][shared].tolist(), owners[1:][shared].tolist()):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parents[root_b] = root_a
+
+    components = {}
+    for i in range(count):
+        components.setdefault(find(i), []).append(i)
+    return list(components.values())
+
+
+def _boundary_loops(triangles: List[List[int]]) -> List[List[int]]:
+    """Get the closed boundary loops of a set of consistently oriented triangles.
+
+    Returns an empty list if the boundary cannot be walked as simple loops. e.g. when
+    two loops touch at a vertex.
+    """
+    directed = {}
+    for a, b, c in triangles:
+        for edge in ((a, b), (b, c), (c, a)):
+            directed[edge] = directed.get(edge, 0) + 1
+    next_vertex = {}
+    for (a, b), count in directed.items():
+        if count > 1 or (b, a) in directed:
+            continue
+        if a in next_vertex:
+            return []
+        next_vertex[a] = b
+
+    loops = []
+    while next_vertex:
+        start, vertex = next_vertex.popitem()
+        loop = [start]
+        while vertex != start:
+            loop.append(vertex)
+            if vertex not in next_vertex:
+                return []
+            vertex = next_vertex.pop(vertex)
+        loops.append(loop)
+    return loops
+
+
+def merge_coplanar_triangles(vertices: np.ndarray, triangles: np.ndarray,
+                             tolerance: float = 0.01,
+                             angle_tolerance: float = 0.001) -> List[Face3D]:
+    """Merge coplanar, edge-adjacent triangles into polygons with holes.
+
+    Triangles are grouped by a hash of their rounded normal and plane offset and each
+    group is split into edge-adjacent sets. The boundary of each set is rebuilt as a
+    single Face3D. Sets that cannot be rebuilt as one face are returned as triangles.
+
+    Args:
+        vertices: An (N, 3) array of vertex coordinates.
+        triangles: An (M, 3) array of vertex indices per triangle.
+        tolerance: The distance tolerance to weld vertices and compare the planes of
+            the triangles. Default: 0.01.
+        angle_tolerance: The tolerance to compare the components of the unit normals
+            of the triangles. Default: 0.001.
+
+    Returns:
+        A list of Face3D objects.
+    """
+    if not len(triangles):
+        return []
+    vertices, triangles = weld_vertices(vertices, triangles, tolerance)
+    normals, areas = get_triangle_normals(vertices, triangles)
+    keep = areas > tolerance ** 2 / 2
+    triangles, normals = triangles[keep], normals[keep]
+    if not len(triangles):
+        return []
+
+    group_ids = _group_coplanar_triangles(
+        vertices, triangles, normals, tolerance, angle_tolerance)
+    point3ds = [Point3D(*v) for v in vertices.tolist()]
+    tri_list = triangles.tolist()
+
+    face3ds = []
+    for component in _connected_triangles(triangles, group_ids):
+        normal = Vector3D(*normals[component].mean(axis=0).tolist())
+        face3d = None
+        if len(component) > 1:
+            face3d = _face3d_from_loops(
+                _boundary_loops([tri_list[i] for i in component]), point3ds, normal,
+                tolerance)
+        if face3d is not None:
+            face3ds.append(face3d)
+            continue
+        for i in component:
+            pts = [point3ds[v] for v in tri_list[i]]
+            face3ds.append(
+                Face3D(pts, plane=Plane(Vector3D(*normals[i].tolist()), pts[0])))
     return face3ds
+
+
+def _face3d_from_loops(loops: List[List[int]], point3ds: List[Point3D],
+                       normal: Vector3D, tolerance: float) -> Face3D:
+    """Create a Face3D from vertex index loops. Counter-clockwise loops are boundaries.
+
+    Returns None if there is not exactly one boundary loop.
+    """
+    boundary, holes = None, []
+    for loop in loops:
+        pts = [point3ds[i] for i in loop]
+        face = Face3D(pts, plane=Plane(normal, pts[0]), enforce_right_hand=False)
+        if face.is_clockwise:
+            holes.append(pts)
+        elif boundary is None:
+            boundary = pts
+        else:
+            return None
+    if boundary is None:
+        return None
+    face3d = Face3D(boundary, plane=Plane(normal, boundary[0]), holes=holes or None)
+    try:
+        return face3d.remove_colinear_vertices(tolerance)
+    except AssertionError:
+        return face3d
+
+
+def uses_brep_data(settings: ifcopenshell.geom.settings) -> bool:
+    """Check if the ifcopenshell.geom settings generate BREP data."""
+    return bool(settings.get(settings.USE_BREP_DATA))
+
+
+@lru_cache(maxsize=None)
+def default_settings(brep_data: bool = False) -> ifcopenshell.geom.settings:
+    """The ifcopenshell.geom settings that are shared by the elements without settings.
+
+    The settings use world coordinates. Don't change the returned object.
+
+    Args:
+        brep_data: Set to True to generate BREP data as the freecad backend of the
+            Model. Default: False.
+    """
+    settings = geom.settings()
+    settings.set(settings.USE_WORLD_COORDS, True)
+    if brep_data:
+        settings.set(settings.USE_BREP_DATA, True)
+    return settings
+
+
+def get_shape_data(element: Element, settings: ifcopenshell.geom.settings,
+                   shape=None) -> Union[str, Tuple[np.ndarray, np.ndarray]]:
+    """Get the geometry of an IFC element in a form that can be sent to other processes.
+
+    Args:
+        element: An IFC element
+        settings: An ifcopenshell.geom.settings object
+        shape: An optional shape that is already created for the element by
+            ifcopenshell.geom. Default: None.
+
+    Returns:
+        The BREP data as a string if the settings are set to use BREP data. Otherwise,
+        a tuple of vertices and triangles arrays. See get_triangles.
+    """
+    if shape is None:
+        shape = geom.create_shape(settings, element)
+    if uses_brep_data(settings):
+        return shape.geometry.brep_data
+    return get_triangles(shape.geometry.verts, shape.geometry.faces)
+
+
+def get_face3ds_from_data(data: Union[str, Tuple[np.ndarray, np.ndarray]],
+                          tolerance: float = 0.01) -> List[Face3D]:
+    """Get the planar faces from the output of get_shape_data.
+
+    BREP data is read with FreeCAD. Triangles are merged into polygons when they are
+    coplanar and edge-adjacent.
+
+    Args:
+        data: BREP data as a string or a tuple of vertices and triangles arrays.
+        tolerance: The distance tolerance used to merge the triangles. Default: 0.01.
+
+    Returns:
+        A list of Face3D objects.
+    """
+    if isinstance(data, str):
+        return get_face3ds_from_shape(get_shape_from_brep(data))
+    vertices, triangles = data
+    return merge_coplanar_triangles(vertices, triangles, tolerance)
+
+
+def get_face3ds(element: Element, settings: ifcopenshell.geom.settings,
+                shape=None, tolerance: float = 0.01) -> List[Face3D]:
+    """Get the planar faces of an IFC element as a list of Face3D.
+
+    By default the faces are extracted natively from the triangulated output of
+    ifcopenshell.geom by merging the coplanar and edge-adjacent triangles into
+    polygons. If the settings are set to use BREP data, the faces are extracted from
+    the BREP using FreeCAD instead.
+
+    Args:
+        element: An IFC element
+        settings: An ifcopenshell.geom.settings object
+        shape: An optional shape that is already created for the element by
+            ifcopenshell.geom. Default: None.
+        tolerance: The distance tolerance used to merge the triangles. Default: 0.01.
+
+    Returns:
+        A list of Face3D objects.
+    """
+    return get_face3ds_from_data(get_shape_data(element, settings, shape), tolerance)
+
+
+def _weld_points(points: List[Tuple[float, float, float]],
+                 tolerance: float) -> Tuple[List[int], List[int]]:
+    """Merge the points that are equivalent within a tolerance using a hash grid.
+
+    Each point is merged into the first point before it that is within the tolerance
+    in x, y and z as in Polyface3D.from_faces but only the points in the neighboring
+    cells of the grid are compared.
+
+    Returns:
+        A tuple with the indices of the points that are kept and the index of the
+        kept point that each point is merged into.
+    """
+    grid, kept, ids = {}, [], []
+    for x, y, z in points:
+        cell = (math.floor(x / tolerance), math.floor(y / tolerance),
+                math.floor(z / tolerance))
+        match = None
+        for dx, dy, dz in _NEIGHBORS:
+            for i in grid.get((cell[0] + dx, cell[1] + dy, cell[2] + dz), ()):
+                if match is not None and i > match:
+                    continue
+                px, py, pz = points[kept[i]]
+                if abs(px - x) <= tolerance and abs(py - y) <= tolerance and \
+                        abs(pz - z) <= tolerance:
+                    match = i
+        if match is None:
+            match = len(kept)
+            grid.setdefault(cell, []).append(match)
+            kept.append(len(ids))
+        ids.append(match)
+    return kept, ids
+
+
+def _edge_information(face_indices: List[Tuple[Tuple[int, ...], ...]]) -> dict:
+    """Get the edge information of Polyface3D from its face indices in linear time."""
+    edges, edge_indices, edge_types = {}, [], []
+    for face in face_indices:
+        for loop in face:
+            for i, vertex in enumerate(loop):
+                previous = loop[i - 1]
+                if previous == vertex:
+                    continue
+                key = (previous, vertex) if previous < vertex else (vertex, previous)
+                index = edges.get(key)
+                if index is None:
+                    edges[key] = len(edge_indices)
+                    edge_indices.append((previous, vertex))
+                    edge_types.append(0)
+                else:
+                    edge_types[index] += 1
+    return {'edge_indices': tuple(edge_indices), 'edge_types': tuple(edge_types)}
+
+
+def _is_counterclockwise(points: Tuple[Point3D, ...], normal: Vector3D) -> bool:
+    """Check if a loop of points runs counterclockwise around a normal."""
+    x = y = z = 0
+    for a, b in zip(points, points[1:] + points[:1]):
+        x += (a.y - b.y) * (a.z + b.z)
+        y += (a.z - b.z) * (a.x + b.x)
+        z += (a.x - b.x) * (a.y + b.y)
+    return x * normal.x + y * normal.y + z * normal.z > 0
+
+
+def _outward_flips(face3ds: List[Face3D], face_indices: List[Tuple[Tuple[int, ...], ...]],
+                   vertices: List[Point3D]) -> List[bool]:
+    """Find the faces of a closed polyface that have to be flipped to point outward.
+
+    Adjacent faces must run over their shared edge in opposite directions and each
+    shell must enclose a positive volume.
+
+    Returns:
+        A list of booleans per face or None if the faces can't be oriented from the
+        topology. e.g. a non-orientable surface or a shell inside another shell.
+    """
+    owners: Dict[Tuple[int, int], list] = {}
+    for index, (face, face_loops) in enumerate(zip(face3ds, face_indices)):
+        for count, loop in enumerate(face_loops):
+            # the holes must run clockwise around the normal of the face
+            if count and _is_counterclockwise(face.holes[count - 1], face.normal):
+                loop = loop[::-1]
+            for i, vertex in enumerate(loop):
+                previous = loop[i - 1]
+                if previous != vertex:
+                    key = (previous, vertex) if previous < vertex else (vertex, previous)
+                    owners.setdefault(key, []).append((index, previous < vertex))
+
+    neighbors = [[] for _ in face3ds]
+    for (first, first_forward), (second, second_forward) in owners.values():
+        same_direction = first_forward == second_forward
+        neighbors[first].append((second, same_direction))
+        neighbors[second].append((first, same_direction))
+
+    flips, shells = [None] * len(face3ds), []
+    for start in range(len(face3ds)):
+        if flips[start] is not None:
+            continue
+        flips[start], shell, stack = False, [start], [start]
+        while stack:
+            index = stack.pop()
+            for other, same_direction in neighbors[index]:
+                flip = flips[index] != same_direction
+                if flips[other] is None:
+                    flips[other] = flip
+                    shell.append(other)
+                    stack.append(other)
+                elif flips[other] != flip:
+                    return None
+        shells.append(shell)
+
+    bounds = []
+    for shell in shells:
+        volume = sum(
+            (-1 if flips[i] else 1) * face3ds[i].area *
+            face3ds[i].normal.dot(face3ds[i].boundary[0]) for i in shell)
+        if not volume:
+            return None
+        if volume < 0:
+            for i in shell:
+                flips[i] = not flips[i]
+        points = np.array([(vertices[v].x, vertices[v].y, vertices[v].z)
+                           for i in shell for v in face_indices[i][0]])
+        bounds.append((points.min(axis=0), points.max(axis=0)))
+
+    # a shell inside another shell is a cavity and has to point inward
+    for i, (min_a, max_a) in enumerate(bounds):
+        for min_b, max_b in bounds[i + 1:]:
+            if np.all(min_a >= min_b) and np.all(max_a <= max_b) or \
+                    np.all(min_b >= min_a) and np.all(max_b <= max_a):
+                return None
+    return flips
+
+
+def get_polyface3d(face3ds: List[Face3D], tolerance: float = 0.01) -> Polyface3D:
+    """Get a Polyface3D from a list of Face3D with the faces pointing outward.
+
+    The vertices are welded with a hash grid and the edges are counted in one pass
+    instead of comparing every pair of vertices and edges as Polyface3D.from_faces
+    does. The faces of a closed polyface are oriented from its topology. The ray
+    tests of Polyface3D.get_outward_faces are only used for the open polyfaces and
+    the polyfaces that can't be oriented from their topology.
+
+    Args:
+        face3ds: A list of Face3D objects.
+        tolerance: The distance tolerance used to join the faces. Default: 0.01.
+    """
+    loops = [(face.boundary,) + (face.holes or ()) for face in face3ds]
+    points = [pt for face_loops in loops for loop in face_loops for pt in loop]
+    kept, ids = _weld_points([(pt.x, pt.y, pt.z) for pt in points], tolerance)
+    vertices = [points[i] for i in kept]
+    ids = iter(ids)
+    face_indices = [tuple(tuple(next(ids) for _ in loop) for loop in face_loops)
+                    for face_loops in loops]
+    edge_information = _edge_information(face_indices)
+
+    flips = None
+    if all(edge_type == 1 for edge_type in edge_information['edge_types']):
+        flips = _outward_flips(face3ds, face_indices, vertices)
+    if flips is None:
+        faces = Polyface3D.get_outward_faces(face3ds, tolerance)
+        flips = [outward is not face for outward, face in zip(faces, face3ds)]
+    else:
+        faces = [face.flip() if flip else face for face, flip in zip(face3ds, flips)]
+
+    # Face3D.flip reverses the boundary and keeps the holes
+    face_indices = [(face[0][::-1],) + face[1:] if flip else face
+                    for face, flip in zip(face_indices, flips)]
+    polyface3d = Polyface3D(vertices, face_indices, edge_information)
+    # keep the faces with their planes as Polyface3D.from_faces does. The constructor
+    # has no argument for the faces and Polyface3D.faces would rebuild them from the
+    # welded vertices and run the ray tests again. This relies on the _faces attribute
+    # of ladybug-geometry 1.x which is pinned in requirements.txt.
+    polyface3d._faces = tuple(faces)
+    return polyface3d
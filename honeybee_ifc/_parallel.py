@@ -0,0 +1,170 @@
+"""Build the geometry, the Honeybee objects and the sensor grids of a model in a
+process pool.
+
+IFC elements and the shapes of ifcopenshell can't be sent to other processes.
+Instead, the geometry of each element is exported as plain data in the main process
+and the Face3D and Polyface3D objects are built by the workers. The Honeybee objects
+are sent back to the main process as dictionaries. The results are collected in the
+same order as the input so the output of a Model is deterministic.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+from ladybug_geometry.geometry3d import Face3D
+
+from ._helper import get_face3ds_from_data, get_polyface3d
+from .door import Door
+from .element import Element
+from .grid import faces_grid
+from .shade import Shade
+from .slab import Slab
+from .space import Space
+from .wall import Wall
+from .window import Window
+
+
+def _polyface3d_from_data(data):
+    return get_polyface3d(get_face3ds_from_data(data))
+
+
+def _wall_face3ds_from_data(args):
+    data, merge_coplanar = args
+    return Wall.face3ds_from_data(data, merge_coplanar)
+
+
+def _grid_data(args):
+    return faces_grid(*args)
+
+
+def _wall_faces(guid: str, face3ds: List[Face3D], sub_faces: Dict[int, List[dict]],
+                filled: Dict[int, List[Face3D]]):
+    """Same as Wall.faces_from_face3ds but the hosted sub-faces are dictionaries."""
+    from honeybee.aperture import Aperture
+    from honeybee.door import Door as HBDoor
+
+    sub_faces = {
+        count: [Aperture.from_dict(data) if data['type'] == 'Aperture'
+                else HBDoor.from_dict(data) for data in items]
+        for count, items in sub_faces.items()}
+    return Wall.faces_from_face3ds(guid, face3ds, sub_faces, filled)
+
+
+def _honeybee_dicts(args):
+    function, function_args = args
+    objects = function(*function_args)
+    if not isinstance(objects, list):
+        objects = [objects]
+    return [obj.to_dict() for obj in objects]
+
+
+def _honeybee_args(element, sub_faces: Dict[str, Dict[int, list]],
+                   filled: Dict[str, Dict[int, List[Face3D]]]):
+    """The function and the plain arguments to create the Honeybee objects of an
+    element in another process."""
+    if isinstance(element, Wall):
+        items = sub_faces.get(element.guid, {})
+        return _wall_faces, (
+            element.guid, element.to_face3ds(),
+            {count: [sub_face.to_dict() for sub_face in sub_face_list]
+             for count, sub_face_list in items.items()},
+            filled.get(element.guid))
+    if isinstance(element, Slab):
+        return Slab.faces_from_polyface3d, (element.guid, element.polyface3d)
+    if isinstance(element, Shade):
+        return Shade.shades_from_polyface3d, (element.guid, element.polyface3d)
+    if isinstance(element, Window):
+        return Window.aperture_from_face3d, \
+            (element.guid, element.moved_opening_face3d())
+    if isinstance(element, Door):
+        return Door.door_from_face3d, (element.guid, element.moved_opening_face3d())
+    raise ValueError(f'Unsupported element: {type(element).__name__}')
+
+
+def _chunksize(count: int, workers: int) -> int:
+    return max(1, count // (workers * 4))
+
+
+def build_geometry(elements: List[Element], walls: List[Wall], workers: int) -> None:
+    """Build the Polyface3D of elements and the Face3Ds of walls in a process pool.
+
+    Elements and walls that already have their geometry are skipped. The geometry of
+    the elements that are instances of a prototype is derived when it is used.
+
+    Args:
+        elements: A list of Honeybee-IFC elements.
+        walls: A list of Honeybee-IFC walls.
+        workers: Number of processes to use.
+    """
+    elements = [element for element in elements
+                if not element.has_polyface3d and not element.is_instance]
+    walls = [wall for wall in walls if not wall.has_face3ds]
+    if not elements and not walls:
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        polyface3ds = executor.map(
+            _polyface3d_from_data, [element.shape_data() for element in elements],
+            chunksize=_chunksize(len(elements), workers))
+        face3ds = executor.map(
+            _wall_face3ds_from_data,
+            [(wall.shape_data(), wall.merge_coplanar) for wall in walls],
+            chunksize=_chunksize(len(walls), workers))
+
+        for element, polyface3d in zip(elements, polyface3ds):
+            element.set_polyface3d(polyface3d)
+        for wall, wall_face3ds in zip(walls, face3ds):
+            wall.set_face3ds(wall_face3ds)
+
+
+def build_grids(spaces: List[Space], size: float, offset: float, workers: int,
+                mesh: bool = True) -> List[Tuple[np.ndarray, ...]]:
+    """Calculate the sensor grids of spaces in a process pool.
+
+    The floor faces of each space are sent to the workers which return the arrays
+    of the grid. See Space.grid_data for the output.
+
+    Args:
+        spaces: A list of Honeybee-IFC spaces.
+        size: Size of the grid cells.
+        offset: Distance between the floor and the sensors.
+        workers: Number of processes to use.
+        mesh: Set to False to skip calculating the mesh of the grids. Default: True.
+    """
+    args = [(space.floor_faces(), size, offset, True, mesh) for space in spaces]
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(
+            _grid_data, args, chunksize=_chunksize(len(args), workers)))
+
+
+def convert_elements(elements: List[Element], workers: int,
+                     sub_faces: Dict[str, Dict[int, list]] = None,
+                     filled: Dict[str, Dict[int, List[Face3D]]] = None
+                     ) -> Iterator[List[dict]]:
+    """Create the Honeybee objects of elements in a process pool.
+
+    The Face3Ds of the windows and doors are moved to their openings in the main
+    process. The Honeybee objects are created by the workers and returned as
+    dictionaries. Use the from_dict method of each Honeybee class to load them.
+
+    Args:
+        elements: A list of Honeybee-IFC walls, slabs, shades, windows or doors.
+        workers: Number of processes to use.
+        sub_faces: An optional dictionary of the hosted Honeybee Apertures and Doors
+            keyed by the GlobalId of the wall and the index of its face. See
+            Model._host. Default: None.
+        filled: An optional dictionary of the Face3Ds that fill the openings of the
+            faces of the walls. See Model._host. Default: None.
+
+    Yields:
+        A list of the dictionaries of the Honeybee objects of each element in the
+        same order as the elements.
+    """
+    if not elements:
+        return
+    args = [_honeybee_args(element, sub_faces or {}, filled or {})
+            for element in elements]
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(
+            _honeybee_dicts, args, chunksize=_chunksize(len(args), workers))
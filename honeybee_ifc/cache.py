@@ -0,0 +1,166 @@
+"""Honeybee-IFC on-disk geometry cache."""
+
+import hashlib
+import os
+import pathlib
+import pickle
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Tuple
+
+import ifcopenshell
+import ifcopenshell.geom
+
+# change this value when the format of the cached geometry changes
+CACHE_VERSION = '1'
+
+
+def file_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Get the SHA-256 hash of the content of a file."""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def settings_key(settings: ifcopenshell.geom.settings) -> str:
+    """Get a string that identifies the flags of an ifcopenshell.geom.settings object."""
+    if hasattr(settings, 'setting_names'):
+        # newer versions of ifcopenshell list the options by name
+        options = [(name, name) for name in settings.setting_names()]
+    else:
+        options = [(name, getattr(settings, name)) for name in dir(settings)
+                   if name.isupper()]
+    values = []
+    for name, option in sorted(options):
+        try:
+            values.append(f'{name}={settings.get(option)}')
+        except Exception:
+            # not every constant is a settings option
+            continue
+    return ';'.join(values)
+
+
+class GeometryCache:
+    """Honeybee-IFC on-disk geometry cache.
+
+    Geometry is stored in one file per element inside the cache folder. Each file is
+    keyed by the hash of the IFC file content, the GlobalId of the element and the
+    flags of the ifcopenshell.geom settings used to create it. When the size of the
+    folder exceeds the maximum size, the least recently used files are removed. The
+    order of use is kept in the index of the cache from the least to the most
+    recently used file. The files that are already in the folder are ordered by
+    their modification time.
+
+    The cache uses pickle and should only be pointed to a trusted folder.
+
+    Args:
+        folder: Path to the cache folder. It will be created if it doesn't exist.
+        max_size: Maximum size of the cache folder in bytes. Default: 1 GB.
+    """
+
+    SUFFIX = '.geom'
+
+    def __init__(self, folder: str, max_size: int = 1024 ** 3) -> None:
+        self.folder = pathlib.Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        stats = [(path.name, path.stat())
+                 for path in self.folder.glob(f'*{self.SUFFIX}')]
+        self._sizes = {name: stat.st_size for name, stat in stats}
+        self._size = sum(self._sizes.values())
+        # the files from the least to the most recently used. Ties of the
+        # modification time are broken by name.
+        self._used = OrderedDict(
+            (name, None) for name, _ in
+            sorted(stats, key=lambda item: (item[1].st_mtime_ns, item[0])))
+
+    @property
+    def size(self) -> int:
+        """Size of the cached files in bytes."""
+        return self._size
+
+    @staticmethod
+    def key(ifc_hash: str, guid: str, settings: ifcopenshell.geom.settings,
+            *extra: Any) -> str:
+        """Get the cache key for the geometry of an element.
+
+        Args:
+            ifc_hash: Hash of the content of the IFC file. See file_hash.
+            guid: GlobalId of the element.
+            settings: The ifcopenshell.geom.settings used to create the geometry.
+            extra: Any other values that change the geometry. e.g. merging triangles.
+        """
+        values = (CACHE_VERSION, ifc_hash, guid, settings_key(settings)) + \
+            tuple(str(value) for value in extra)
+        return hashlib.sha256('|'.join(values).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.folder.joinpath(key + self.SUFFIX)
+
+    def __contains__(self, key: str) -> bool:
+        return key + self.SUFFIX in self._sizes
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value or the default value if the key is not in the cache."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return default
+        # mark the file as recently used
+        self._use(path.name)
+        os.utime(path)
+        return value
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get a dictionary of the cached values for the keys that are in the cache."""
+        values = {}
+        for key in keys:
+            if key in self:
+                value = self.get(key)
+                if value is not None:
+                    values[key] = value
+        return values
+
+    def set(self, key: str, value: Any) -> None:
+        """Add a value to the cache."""
+        path = self._path(key)
+        temp = path.with_name(f'{path.name}.{uuid.uuid4().hex}.tmp')
+        with open(temp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, path)
+        size = path.stat().st_size
+        self._size += size - self._sizes.get(path.name, 0)
+        self._sizes[path.name] = size
+        self._use(path.name)
+        self._evict()
+
+    def set_many(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Add several key, value pairs to the cache."""
+        for key, value in items:
+            self.set(key, value)
+
+    def clear(self) -> None:
+        """Remove all the cached files."""
+        for name in list(self._sizes):
+            self._remove(name)
+
+    def _use(self, name: str) -> None:
+        self._used[name] = None
+        self._used.move_to_end(name)
+
+    def _remove(self, name: str) -> None:
+        try:
+            self.folder.joinpath(name).unlink()
+        except FileNotFoundError:
+            pass
+        self._size -= self._sizes.pop(name, 0)
+        self._used.pop(name, None)
+
+    def _evict(self) -> None:
+        """Remove the least recently used files until the cache fits in max_size."""
+        while self._size > self.max_size and self._used:
+            self._remove(next(iter(self._used)))
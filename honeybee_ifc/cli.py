@@ -0,0 +1,382 @@
+"""Convert a batch of IFC files to HBJSON.
+
+The files are converted concurrently with one process per file so a file that runs
+longer than the timeout can be stopped and a file that crashes the process does not
+stop the batch. Each finished file is added to a job log. When the same batch is
+started again the files that are already converted are skipped unless they have
+changed since.
+
+Usage:
+    python -m honeybee_ifc path/to/folder path/to/file.ifc path/to/manifest.txt
+        --output hbjsons --workers 8 --timeout 1800
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import pathlib
+import signal
+import sys
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Dict, List, Sequence, Tuple
+
+# name of the job log in the output folder
+JOB_LOG = 'honeybee-ifc-jobs.jsonl'
+
+
+def collect_files(inputs: Sequence[str], output_folder: str) -> List[Tuple[str, str]]:
+    """Get the IFC files and the folders for their HBJSON files from a list of inputs.
+
+    Args:
+        inputs: A list of paths to IFC files, folders and manifests. The IFC files in
+            a folder and its sub-folders are converted to the same sub-folders of
+            the output folder. A manifest is a text file with a path to an IFC file
+            on each line. Empty lines and lines starting with # are ignored and
+            relative paths are relative to the manifest.
+        output_folder: The folder for the HBJSON files.
+
+    Returns:
+        A list of tuples with the path to each IFC file and its output folder. Files
+        that are listed more than once are only converted once.
+    """
+    output_folder = pathlib.Path(output_folder)
+    files = []
+    for item in inputs:
+        path = pathlib.Path(item)
+        if path.is_dir():
+            for ifc_file in sorted(path.rglob('*')):
+                if ifc_file.suffix.lower() == '.ifc':
+                    folder = output_folder.joinpath(ifc_file.parent.relative_to(path))
+                    files.append((ifc_file, folder))
+        elif path.suffix.lower() == '.ifc':
+            files.append((path, output_folder))
+        elif path.is_file():
+            for line in path.read_text().splitlines():
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    files.append((path.parent.joinpath(line), output_folder))
+        else:
+            raise ValueError(f'Path {path} does not exist.')
+
+    collected, outputs = [], {}
+    for ifc_file, folder in files:
+        if not ifc_file.exists():
+            raise ValueError(f'Path {ifc_file} does not exist.')
+        ifc_file = ifc_file.resolve()
+        output = folder.joinpath(f'{ifc_file.stem}.hbjson')
+        if output in outputs:
+            if outputs[output] != ifc_file:
+                raise ValueError(
+                    f'{ifc_file} and {outputs[output]} are both converted to {output}.')
+            continue
+        outputs[output] = ifc_file
+        collected.append((str(ifc_file), str(folder)))
+    return collected
+
+
+class JobLog:
+    """A log of the converted files that is used to resume a batch.
+
+    Each finished file is appended to the log as a line of JSON. A file is done if
+    the last entry for it is done and the file has the same size and modification
+    time.
+
+    Args:
+        path: Path to the log file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = pathlib.Path(path)
+        self.entries: Dict[str, dict] = {}
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            # the last line is incomplete if the batch crashed. Remove it so the next
+            # entry starts on its own line.
+            end = data.rfind(b'\n') + 1
+            if end < len(data):
+                f.truncate(end)
+        for line in data[:end].decode('utf-8').splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            self.entries[entry['path']] = entry
+
+    @staticmethod
+    def _stamp(path: str) -> Tuple[int, float]:
+        """Size and modification time of a file or None if the file is not found."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, None
+        return stat.st_size, stat.st_mtime
+
+    def is_done(self, path: str) -> bool:
+        """Whether a file is converted and has not changed since."""
+        entry = self.entries.get(path)
+        return entry is not None and entry['status'] == 'done' and \
+            [entry['size'], entry['mtime']] == list(self._stamp(path)) and \
+            pathlib.Path(entry['output']).exists()
+
+    def add(self, entry: dict) -> None:
+        """Add an entry to the log and write it to the disk right away."""
+        entry['size'], entry['mtime'] = self._stamp(entry['path'])
+        self.entries[entry['path']] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _convert(ifc_file_path: str, output_folder: str, options: dict, connection) -> None:
+    """Convert one IFC file in a child process and send the result to the parent."""
+    if hasattr(os, 'setpgrp'):
+        # the processes that the conversion starts are terminated with it
+        os.setpgrp()
+    from .model import Model
+
+    options = dict(options)
+    stream = options.pop('stream', False)
+    pipeline = options.pop('pipeline', False)
+    if pipeline:
+        # tessellate the elements in the pipeline
+        options['lazy'] = True
+    try:
+        pathlib.Path(output_folder).mkdir(parents=True, exist_ok=True)
+        path = Model(ifc_file_path, **options).to_hbjson(
+            output_folder, stream=stream, pipeline=pipeline)
+        connection.send(('done', path))
+    except Exception:
+        connection.send(('failed', traceback.format_exc(limit=5)))
+    finally:
+        connection.close()
+
+
+def _terminate(process: multiprocessing.Process) -> None:
+    """Terminate the process of a conversion and the processes that it started."""
+    if hasattr(os, 'killpg'):
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except OSError:
+            # the process has already exited
+            pass
+    else:
+        process.terminate()
+    process.join()
+
+
+def convert_files(files: Sequence[Tuple[str, str]], workers: int = 1,
+                  timeout: float = None, job_log: JobLog = None, options: dict = None,
+                  progress=None) -> List[dict]:
+    """Convert IFC files concurrently with one process per file.
+
+    Args:
+        files: A list of tuples with the path to each IFC file and its output folder.
+        workers: Maximum number of files that are converted at the same time.
+            Default: 1.
+        timeout: Optional maximum time in seconds for each file. The process of a
+            file that takes longer is terminated. Default: None.
+        job_log: An optional JobLog. The files that are done in the log are
+            skipped and the results are added to the log. Default: None.
+        options: Arguments for the Model and stream and pipeline for to_hbjson. The
+            CPUs are split between the files for the threads of the geometry
+            iterator of each Model unless the options set threads.
+        progress: An optional function that is called with each result.
+
+    Returns:
+        A list of results with the path, status, output, error, seconds and size in
+        MB of each file. The status is one of done, failed, timeout or skipped. The
+        size is None if the file is not found anymore.
+    """
+    options = dict(options or {})
+    options.setdefault('threads', max(1, multiprocessing.cpu_count() // workers))
+    results = []
+    pending = deque()
+    for path, output_folder in files:
+        if job_log is not None and job_log.is_done(path):
+            entry = dict(job_log.entries[path], status='skipped')
+            results.append(entry)
+            if progress:
+                progress(entry)
+        else:
+            pending.append((path, output_folder))
+
+    def finish(job, status, value, start):
+        path = job[0]
+        try:
+            size = round(os.path.getsize(path) / 1024 ** 2, 3)
+        except OSError:
+            # the file is removed or moved while it is converted
+            size = None
+        entry = {
+            'path': path, 'status': status,
+            'output': value if status == 'done' else None,
+            'error': value if status != 'done' else None,
+            'seconds': round(time.perf_counter() - start, 3),
+            'size_mb': size
+        }
+        if job_log is not None:
+            job_log.add(entry)
+        results.append(entry)
+        if progress:
+            progress(entry)
+
+    running = {}
+    try:
+        _run_jobs(pending, running, workers, timeout, options, finish)
+    finally:
+        # don't leave the conversions running if the batch is stopped
+        for process, (_, receiver, _) in running.items():
+            _terminate(process)
+            receiver.close()
+
+    return results
+
+
+def _run_jobs(pending: deque, running: dict, workers: int, timeout: float,
+              options: dict, finish) -> None:
+    """Run the pending jobs with up to a number of workers and finish each job.
+
+    The jobs run in processes that are not daemonic so a Model can start its own
+    process pool. The processes that take longer than the timeout are terminated.
+    """
+    while pending or running:
+        while pending and len(running) < workers:
+            job = pending.popleft()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_convert, args=(job[0], job[1], options, sender))
+            process.start()
+            sender.close()
+            running[process] = (job, receiver, time.perf_counter())
+
+        now = time.perf_counter()
+        wait_time = None
+        if timeout is not None:
+            wait_time = max(0, min(start + timeout - now
+                                   for _, _, start in running.values()))
+        wait([receiver for _, receiver, _ in running.values()] +
+             [process.sentinel for process in running], wait_time)
+
+        for process, (job, receiver, start) in list(running.items()):
+            if receiver.poll():
+                try:
+                    status, value = receiver.recv()
+                except EOFError:
+                    # the process stopped without sending a result
+                    status, value = None, None
+                process.join()
+                if status is None:
+                    status = 'failed'
+                    value = f'Process exited with code {process.exitcode}.'
+            elif not process.is_alive():
+                status, value = 'failed', f'Process exited with code {process.exitcode}.'
+            elif timeout is not None and time.perf_counter() - start > timeout:
+                _terminate(process)
+                status, value = 'timeout', f'Conversion took more than {timeout} seconds.'
+            else:
+                continue
+            receiver.close()
+            del running[process]
+            finish(job, status, value, start)
+
+
+def report(results: List[dict], seconds: float) -> dict:
+    """Summarize the results of convert_files."""
+    converted = [result for result in results if result['status'] != 'skipped']
+    done = [result for result in converted
+            if result['status'] == 'done' and result['size_mb'] is not None]
+    size = sum(result['size_mb'] for result in done)
+    busy = sum(result['seconds'] for result in done)
+    return {
+        'files': len(results),
+        'statuses': {status: sum(1 for result in results if result['status'] == status)
+                     for status in ('done', 'failed', 'timeout', 'skipped')},
+        'seconds': round(seconds, 3),
+        'files_per_minute': round(len(converted) / seconds * 60, 3) if seconds else None,
+        'mb_per_second': round(size / busy, 3) if busy else None,
+        'results': results
+    }
+
+
+def _print_result(result: dict) -> None:
+    if result['status'] == 'skipped':
+        print(f'skipped  {result["path"]}')
+        return
+    size = result['size_mb'] or 0
+    speed = size / result['seconds'] if result['seconds'] else 0
+    print(f'{result["status"]:<8} {result["path"]} {result["seconds"]:.1f}s '
+          f'{size:.1f}MB {speed:.2f}MB/s')
+    if result['error']:
+        print(result['error'], file=sys.stderr)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='honeybee-ifc', description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='+',
+                        help='IFC files, folders with IFC files or manifest files.')
+    parser.add_argument('-o', '--output', default='.',
+                        help='Folder for the HBJSON files. Default: current folder.')
+    parser.add_argument('-w', '--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='Number of files to convert at the same time. The CPUs '
+                        'are split between the files.')
+    parser.add_argument('-t', '--timeout', type=float,
+                        help='Maximum time for each file in seconds.')
+    parser.add_argument('--log', help=f'Path to the job log. Default: {JOB_LOG} in '
+                        'the output folder.')
+    parser.add_argument('--restart', action='store_true',
+                        help='Convert all the files even if they are in the job log.')
+    parser.add_argument('--report', help='Optional path to write the report as JSON.')
+    parser.add_argument('--merge-coplanar', action='store_true',
+                        help='Merge the coplanar triangles of the walls.')
+    parser.add_argument('--backend', default='freecad', choices=('freecad', 'native'))
+    parser.add_argument('--instancing', action='store_true',
+                        help='Convert the windows, doors and columns with the same '
+                        'representation once.')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write the HBJSON files one object at a time.')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Tessellate, convert and write the elements of each file '
+                        'at the same time.')
+    parser.add_argument('--config', default='full',
+                        help='Name of a conversion profile (full, energy or daylight) '
+                        'or path to a JSON file with a conversion config. Default: full.')
+    args = parser.parse_args(argv)
+
+    from .config import ConversionConfig
+    try:
+        files = collect_files(args.inputs, args.output)
+        config = ConversionConfig.from_value(args.config).to_dict()
+    except ValueError as error:
+        parser.error(str(error))
+
+    log_path = pathlib.Path(args.log or pathlib.Path(args.output, JOB_LOG))
+    if args.restart and log_path.exists():
+        log_path.unlink()
+    options = {'merge_coplanar': args.merge_coplanar, 'backend': args.backend,
+               'instancing': args.instancing, 'stream': args.stream,
+               'pipeline': args.pipeline, 'config': config}
+
+    start = time.perf_counter()
+    results = convert_files(files, max(1, args.workers), args.timeout,
+                            JobLog(log_path), options, _print_result)
+    summary = report(results, time.perf_counter() - start)
+
+    print(f'{summary["files"]} files in {summary["seconds"]:.1f}s: ' +
+          ', '.join(f'{count} {status}' for status, count in summary['statuses'].items())
+          + f'. {summary["files_per_minute"] or 0:.2f} files/min, '
+          f'{summary["mb_per_second"] or 0:.2f} MB/s.')
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(summary, f, indent=4)
+
+    return 0 if summary['statuses']['failed'] + summary['statuses']['timeout'] == 0 \
+        else 1
@@ -0,0 +1,218 @@
+"""Write and read Honeybee models in a compact binary format.
+
+The points of the Face3Ds and the sensors of the grids are stored as packed arrays
+in a NumPy .npz container. The rest of the model is stored in the same container as
+a JSON header where each Face3D and each sensor grid only keeps its index in the
+arrays. The dictionaries that repeat in the header are stored once. e.g. the
+properties and the boundary conditions of the faces. The container can be compressed.
+Use load_compact to get the Honeybee Model back.
+
+The arrays of the container are:
+
+-   header: UTF-8 bytes of the JSON header.
+
+-   points: An (N, 3) float array of the points of the loops of all the Face3Ds.
+
+-   loops: Number of points of each loop.
+
+-   face3ds: Number of loops of each Face3D. The first loop is the boundary and the
+    other loops are the holes.
+
+-   planes: An (F, 9) float array with the normal, the origin and the x axis of the
+    plane of each Face3D. The rows of the Face3Ds without a plane are NaN.
+
+-   sensors: An (S, 6) float array of the positions and directions of the sensors.
+
+-   grids: Number of sensors of each sensor grid.
+"""
+
+import json
+import pathlib
+from itertools import accumulate
+from typing import Any, Dict, List, Union
+
+import numpy as np
+from honeybee.model import Model as HBModel
+
+FORMAT = 'honeybee-ifc-compact'
+VERSION = 1
+EXTENSION = '.hbz'
+# dictionaries with a shorter JSON are not shared
+_SHARED_LENGTH = 32
+
+
+class _Packer:
+    """Move the Face3Ds and the sensors of a model dictionary to lists of numbers."""
+
+    def __init__(self) -> None:
+        self.points: List[List[float]] = []
+        self.loops: List[int] = []
+        self.face3ds: List[int] = []
+        self.planes: List[List[float]] = []
+        self.sensors: List[List[float]] = []
+        self.grids: List[int] = []
+        self.shared: List[dict] = []
+        self._shared_ids: Dict[str, int] = {}
+
+    def pack(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if value.get('type') == 'Face3D' and 'boundary' in value:
+                return self._face3d(value)
+            if value.get('type') == 'SensorGrid' and 'sensors' in value and all(
+                    'pos' in sensor and 'dir' in sensor for sensor in value['sensors']):
+                return self._grid(value)
+            geometry = len(self.face3ds) + len(self.grids)
+            packed = {key: self.pack(item) for key, item in value.items()}
+            # the dictionaries with geometry are unique
+            if len(self.face3ds) + len(self.grids) > geometry:
+                return packed
+            return self._share(packed)
+        # lists of numbers are kept as they are
+        if isinstance(value, (list, tuple)) and value and \
+                isinstance(value[0], (dict, list, tuple)):
+            return [self.pack(item) for item in value]
+        return value
+
+    def _share(self, data: dict) -> dict:
+        """Replace a dictionary with a reference to the shared dictionaries."""
+        key = json.dumps(data, separators=(',', ':'))
+        if len(key) < _SHARED_LENGTH:
+            return data
+        index = self._shared_ids.get(key)
+        if index is None:
+            index = self._shared_ids[key] = len(self.shared)
+            self.shared.append(data)
+        return {'$shared': index}
+
+    def _face3d(self, data: dict) -> dict:
+        loops = [data['boundary']] + list(data.get('holes') or ())
+        for loop in loops:
+            self.points.extend(loop)
+            self.loops.append(len(loop))
+        self.face3ds.append(len(loops))
+        plane = data.get('plane')
+        self.planes.append(
+            [*plane['n'], *plane['o'], *plane['x']] if plane else [np.nan] * 9)
+        return {'type': 'Face3D', 'index': len(self.face3ds) - 1}
+
+    def _grid(self, data: dict) -> dict:
+        self.sensors.extend([*sensor['pos'], *sensor['dir']]
+                            for sensor in data['sensors'])
+        self.grids.append(len(data['sensors']))
+        packed = {key: self.pack(item) for key, item in data.items() if key != 'sensors'}
+        packed['sensors'] = {'index': len(self.grids) - 1}
+        return packed
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            'points': np.array(self.points, dtype=float).reshape(-1, 3),
+            'loops': np.array(self.loops, dtype=np.int32),
+            'face3ds': np.array(self.face3ds, dtype=np.int32),
+            'planes': np.array(self.planes, dtype=float).reshape(-1, 9),
+            'sensors': np.array(self.sensors, dtype=float).reshape(-1, 6),
+            'grids': np.array(self.grids, dtype=np.int32)
+        }
+
+
+class _Unpacker:
+    """Put the Face3Ds and the sensors back in a model dictionary."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], shared: List[dict]) -> None:
+        self.shared = shared
+        # JSON of the unpacked shared dictionaries
+        self._unpacked: Dict[int, str] = {}
+        points = arrays['points'].tolist()
+        loop_ends = list(accumulate(arrays['loops'].tolist()))
+        loops = [points[end - count:end]
+                 for count, end in zip(arrays['loops'].tolist(), loop_ends)]
+        face_ends = list(accumulate(arrays['face3ds'].tolist()))
+        self.face3ds = [loops[end - count:end]
+                        for count, end in zip(arrays['face3ds'].tolist(), face_ends)]
+        self.planes = arrays['planes'].tolist()
+        self.has_plane = (~np.isnan(arrays['planes']).any(axis=1)).tolist()
+        sensors = arrays['sensors'].tolist()
+        grid_ends = list(accumulate(arrays['grids'].tolist()))
+        self.grids = [sensors[end - count:end]
+                      for count, end in zip(arrays['grids'].tolist(), grid_ends)]
+
+    def unpack(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            if '$shared' in value:
+                # each reference gets its own copy so changing one doesn't change
+                # the others. The shared dictionaries don't have any geometry.
+                index = value['$shared']
+                if index not in self._unpacked:
+                    self._unpacked[index] = json.dumps(self.unpack(self.shared[index]))
+                return json.loads(self._unpacked[index])
+            if value.get('type') == 'Face3D' and 'index' in value:
+                return self._face3d(value['index'])
+            if value.get('type') == 'SensorGrid' and \
+                    isinstance(value.get('sensors'), dict):
+                grid = {key: self.unpack(item) for key, item in value.items()}
+                grid['sensors'] = [{'pos': sensor[:3], 'dir': sensor[3:]}
+                                   for sensor in self.grids[value['sensors']['index']]]
+                return grid
+            return {key: self.unpack(item) for key, item in value.items()}
+        if isinstance(value, list) and value and isinstance(value[0], (dict, list)):
+            return [self.unpack(item) for item in value]
+        return value
+
+    def _face3d(self, index: int) -> dict:
+        loops = self.face3ds[index]
+        data = {'type': 'Face3D', 'boundary': loops[0]}
+        if len(loops) > 1:
+            data['holes'] = loops[1:]
+        if self.has_plane[index]:
+            plane = self.planes[index]
+            data['plane'] = {'type': 'Plane', 'n': plane[:3], 'o': plane[3:6],
+                             'x': plane[6:]}
+        return data
+
+
+def write_compact(model: Union[HBModel, dict], path: str, compress: bool = True) -> str:
+    """Write a Honeybee model to a compact file.
+
+    Args:
+        model: A Honeybee Model or its dictionary.
+        path: Path to the file. The extension is not changed. Use .hbz to follow the
+            convention of Model.to_compact.
+        compress: Set to False to store the arrays without compressing them. This is
+            faster to write and to load but the file is larger. Default: True.
+
+    Returns:
+        Path to the written file.
+    """
+    data = model if isinstance(model, dict) else model.to_dict()
+    packer = _Packer()
+    model = packer.pack(data)
+    header = {'format': FORMAT, 'version': VERSION, 'shared': packer.shared,
+              'model': model}
+    arrays = packer.arrays()
+    arrays['header'] = np.frombuffer(
+        json.dumps(header, separators=(',', ':')).encode('utf-8'), dtype=np.uint8)
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # write to a file object so numpy doesn't add .npz to the file name
+    with open(path, 'wb') as f:
+        (np.savez_compressed if compress else np.savez)(f, **arrays)
+    return str(path)
+
+
+def read_compact(path: str) -> dict:
+    """Read the dictionary of a Honeybee model from a compact file."""
+    with np.load(str(path), allow_pickle=False) as container:
+        arrays = {key: container[key] for key in container.files}
+    header = json.loads(arrays.pop('header').tobytes().decode('utf-8'))
+    if header.get('format') != FORMAT or header.get('version', 0) > VERSION:
+        raise ValueError(
+            f'Unsupported file: {path}. Expected version {VERSION} of {FORMAT}.')
+    return _Unpacker(arrays, header['shared']).unpack(header['model'])
+
+
+def load_compact(path: str) -> HBModel:
+    """Load a Honeybee model from a compact file.
+
+    Args:
+        path: Path to a file that is written with write_compact.
+    """
+    return HBModel.from_dict(read_compact(path))
@@ -0,0 +1,271 @@
+"""Compare a converted Honeybee model with a verified reference model.
+
+The objects of each kind are matched with the reference objects by their center
+point through a k-d tree instead of by their position in the model so the order of
+the objects doesn't matter. Matched objects must have the same normal and area
+within the tolerances. Use this to check that a conversion still produces the same
+geometry. e.g. after enabling the parallel, cached or instanced conversion.
+
+Usage:
+    python -m honeybee_ifc.compare path/to/model.hbjson path/to/verified.hbjson
+        --report comparison.json
+"""
+
+import argparse
+import heapq
+import json
+import math
+import sys
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from honeybee.model import Model as HBModel
+
+# kinds of objects that are matched by their geometry
+KINDS = ('faces', 'apertures', 'doors', 'shades')
+
+
+class KDTree:
+    """A static k-d tree over 3D points for nearest neighbor queries.
+
+    Args:
+        points: An (N, 3) array of points.
+        leaf_size: Maximum number of points in a leaf of the tree. Default: 16.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 16) -> None:
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.leaf_size = max(1, leaf_size)
+        self._order = np.arange(len(self.points))
+        # (axis, split, left, right, start, end) per node. Leaves have an axis of -1.
+        self._nodes: List[Tuple[int, float, int, int, int, int]] = []
+        if len(self.points):
+            self._build(0, len(self.points))
+
+    def _build(self, start: int, end: int) -> int:
+        node = len(self._nodes)
+        if end - start <= self.leaf_size:
+            self._nodes.append((-1, 0.0, -1, -1, start, end))
+            return node
+        indices = self._order[start:end]
+        points = self.points[indices]
+        axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+        middle = (end - start) // 2
+        order = np.argpartition(points[:, axis], middle)
+        self._order[start:end] = indices[order]
+        split = float(self.points[self._order[start + middle], axis])
+        self._nodes.append(None)
+        left = self._build(start, start + middle)
+        right = self._build(start + middle, end)
+        self._nodes[node] = (axis, split, left, right, start, end)
+        return node
+
+    def query(self, point: Sequence[float], count: int = 1,
+              max_distance: float = math.inf) -> List[Tuple[float, int]]:
+        """Get the nearest points to a point.
+
+        Args:
+            point: X, Y and Z of the point.
+            count: Maximum number of points to return. Default: 1.
+            max_distance: Maximum distance of the returned points. Default: inf.
+
+        Returns:
+            A list of tuples with the distance and the index of each point sorted by
+            the distance.
+        """
+        if not self._nodes:
+            return []
+        point = np.asarray(point, dtype=float)
+        best: List[Tuple[float, int]] = []  # a max heap of (-distance, index)
+
+        def limit() -> float:
+            return max_distance if len(best) < count else min(max_distance, -best[0][0])
+
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound > limit():
+                continue
+            axis, split, left, right, start, end = self._nodes[node]
+            if axis < 0:
+                indices = self._order[start:end]
+                distances = np.linalg.norm(self.points[indices] - point, axis=1)
+                for distance, index in zip(distances.tolist(), indices.tolist()):
+                    if distance > limit():
+                        continue
+                    if len(best) < count:
+                        heapq.heappush(best, (-distance, index))
+                    else:
+                        heapq.heapreplace(best, (-distance, index))
+                continue
+            offset = point[axis] - split
+            near, far = (left, right) if offset < 0 else (right, left)
+            stack.append((far, abs(offset)))
+            stack.append((near, bound))
+        return sorted((-distance, index) for distance, index in best)
+
+
+def _center(obj) -> Tuple[float, float, float]:
+    center = obj.geometry.center
+    return center.x, center.y, center.z
+
+
+def _angle(obj, reference) -> float:
+    normal, expected = obj.geometry.normal, reference.geometry.normal
+    if not normal.magnitude or not expected.magnitude:
+        return 0.0 if normal.magnitude == expected.magnitude else math.pi
+    return normal.angle(expected)
+
+
+def _area_difference(obj, reference) -> float:
+    """Relative difference between the areas of two objects."""
+    area, expected = obj.geometry.area, reference.geometry.area
+    return abs(area - expected) / max(expected, 1e-9)
+
+
+def match_objects(objects: Sequence, references: Sequence, tolerance: float = 0.01,
+                  angle_tolerance: float = 0.01, area_tolerance: float = 0.01) -> dict:
+    """Match Honeybee objects with reference objects by their center point.
+
+    Each object is matched with the nearest reference object that is not matched
+    yet and is closer than the tolerance. If there is none the object is unmatched.
+    A match is a mismatch if the normals or the areas are different.
+
+    Args:
+        objects: A list of Honeybee objects with a Face3D geometry. e.g. Apertures.
+        references: A list of reference objects of the same kind.
+        tolerance: Maximum distance between the centers of matched objects in meters.
+            Default: 0.01.
+        angle_tolerance: Maximum angle between the normals of matched objects in
+            radians. Default: 0.01.
+        area_tolerance: Maximum difference between the areas of matched objects as
+            a fraction of the area of the reference. Use None to skip comparing the
+            areas. Default: 0.01.
+
+    Returns:
+        A dictionary with the counts, the matched count, the largest differences,
+        the identifiers of the unmatched objects and of the missing reference
+        objects, the mismatches and whether the objects passed the comparison.
+    """
+    tree = KDTree([_center(reference) for reference in references])
+    used = set()
+    unmatched, mismatched = [], []
+    max_distance = max_angle = max_area_difference = 0.0
+    for obj in objects:
+        center, count = _center(obj), 8
+        while True:
+            candidates = tree.query(center, count, tolerance)
+            available = [(d, i) for d, i in candidates if i not in used]
+            if available or len(candidates) < count:
+                break
+            count *= 4
+        if not available:
+            unmatched.append(obj.identifier)
+            continue
+        # prefer the nearest reference with the same normal and area
+        checks = []
+        for distance, index in available:
+            reference = references[index]
+            angle = _angle(obj, reference)
+            area_difference = _area_difference(obj, reference) \
+                if area_tolerance is not None else 0.0
+            valid = angle <= angle_tolerance and \
+                (area_tolerance is None or area_difference <= area_tolerance)
+            checks.append((not valid, distance, index, angle, area_difference))
+        invalid, distance, index, angle, area_difference = min(checks)
+        used.add(index)
+        max_distance = max(max_distance, distance)
+        max_angle = max(max_angle, angle)
+        max_area_difference = max(max_area_difference, area_difference)
+        if invalid:
+            mismatched.append({
+                'identifier': obj.identifier,
+                'reference': references[index].identifier,
+                'distance': round(distance, 6), 'angle': round(angle, 6),
+                'area_difference': round(area_difference, 6)})
+
+    missing = [reference.identifier for count, reference in enumerate(references)
+               if count not in used]
+    return {
+        'count': len(objects), 'reference_count': len(references),
+        'matched': len(used) - len(mismatched),
+        'max_distance': round(max_distance, 6), 'max_angle': round(max_angle, 6),
+        'max_area_difference': round(max_area_difference, 6),
+        'unmatched': unmatched, 'missing': missing, 'mismatched': mismatched,
+        'passed': len(objects) == len(references) and
+        not (unmatched or missing or mismatched)
+    }
+
+
+def compare_models(model: HBModel, reference: HBModel, tolerance: float = 0.01,
+                   angle_tolerance: float = 0.01, area_tolerance: float = 0.01,
+                   kinds: Sequence[str] = KINDS) -> dict:
+    """Compare a Honeybee model with a verified reference model.
+
+    Args:
+        model: A Honeybee model. e.g. the output of Model.to_honeybee.
+        reference: The verified Honeybee model.
+        tolerance: Maximum distance between the centers of matched objects in meters.
+            Default: 0.01.
+        angle_tolerance: Maximum angle between the normals of matched objects in
+            radians. Default: 0.01.
+        area_tolerance: Maximum difference between the areas of matched objects as
+            a fraction of the area of the reference. Default: 0.01.
+        kinds: The kinds of objects to compare. Any of faces, apertures, doors and
+            shades. Default: all of them.
+
+    Returns:
+        A dictionary with a report per kind. See match_objects. The sensor grids are
+        compared by their counts and the number of sensors. The passed key is True if
+        all the kinds passed.
+    """
+    report = {}
+    for kind in kinds:
+        if kind not in KINDS:
+            raise ValueError(f'Unsupported kind: {kind}. Choose from {", ".join(KINDS)}.')
+        report[kind] = match_objects(
+            getattr(model, kind), getattr(reference, kind), tolerance,
+            angle_tolerance, area_tolerance)
+
+    grids = model.properties.radiance.sensor_grids
+    expected = reference.properties.radiance.sensor_grids
+    sensors = sum(len(grid.sensors) for grid in grids)
+    expected_sensors = sum(len(grid.sensors) for grid in expected)
+    report['sensor_grids'] = {
+        'count': len(grids), 'reference_count': len(expected),
+        'sensors': sensors, 'reference_sensors': expected_sensors,
+        'passed': len(grids) == len(expected) and sensors == expected_sensors
+    }
+    report['passed'] = all(value['passed'] for value in report.values())
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('hbjson', help='Path to the converted HBJSON file.')
+    parser.add_argument('reference', help='Path to the verified HBJSON file.')
+    parser.add_argument('--tolerance', type=float, default=0.01,
+                        help='Maximum distance between centers in meters.')
+    parser.add_argument('--angle-tolerance', type=float, default=0.01,
+                        help='Maximum angle between normals in radians.')
+    parser.add_argument('--area-tolerance', type=float, default=0.01,
+                        help='Maximum relative difference between areas.')
+    parser.add_argument('--report', help='Optional path to write the report as JSON.')
+    args = parser.parse_args(argv)
+
+    report = compare_models(
+        HBModel.from_hbjson(args.hbjson), HBModel.from_hbjson(args.reference),
+        args.tolerance, args.angle_tolerance, args.area_tolerance)
+    for kind, result in report.items():
+        if kind == 'passed':
+            continue
+        status = 'passed' if result['passed'] else 'failed'
+        print(f'{kind}: {result["count"]} / {result["reference_count"]} {status}')
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0 if report['passed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
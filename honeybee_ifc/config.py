@@ -0,0 +1,139 @@
+"""Choose the IFC elements that are converted and the outputs that are built.
+
+Each kind of Honeybee-IFC element is selected with a query for the ifcopenshell
+selector. e.g. '.IfcWall | .IfcWallStandardCase'. Only the selected elements are
+tessellated, so a job that doesn't need an output doesn't pay for its geometry.
+There are a few built-in profiles for common jobs.
+"""
+
+import json
+import pathlib
+from typing import Dict, List, Union
+
+import ifcopenshell
+from ifcopenshell.entity_instance import entity_instance as IfcElement
+from ifcopenshell.util.selector import Selector
+
+# kinds of elements with the attribute of the Model that they are added to
+KINDS = ('walls', 'slabs', 'shades', 'windows', 'doors', 'spaces')
+
+# queries of the elements that are converted by default
+QUERIES = {
+    'walls': '.IfcWall | .IfcWallStandardCase',
+    'slabs': '.IfcSlab',
+    'shades': '.IfcColumn',
+    'windows': '.IfcWindow',
+    'doors': '.IfcDoor',
+    'spaces': '.IfcSpace'
+}
+
+# built-in profiles as the values that are different from the default
+PROFILES = {
+    # all the elements and the sensor grids
+    'full': {},
+    # the envelope and the shades without the spaces and their sensor grids
+    'energy': {'spaces': None, 'grids': False},
+    # the envelope and the sensor grids of the spaces without the columns
+    'daylight': {'shades': None}
+}
+
+
+def _profile(name: str) -> dict:
+    """Get a copy of the values of a built-in profile."""
+    if name not in PROFILES:
+        raise ValueError(
+            f'Unsupported profile: {name}. Choose from {", ".join(PROFILES)}.')
+    return dict(PROFILES[name])
+
+
+class ConversionConfig:
+    """Elements and outputs of a conversion.
+
+    Args:
+        walls: Selector query for the elements that are converted to walls. Use None
+            to skip the walls. Default: '.IfcWall | .IfcWallStandardCase'.
+        slabs: Selector query for the slabs. Default: '.IfcSlab'.
+        shades: Selector query for the elements that are converted to shades.
+            Default: '.IfcColumn'.
+        windows: Selector query for the windows. Default: '.IfcWindow'.
+        doors: Selector query for the doors. Default: '.IfcDoor'.
+        spaces: Selector query for the spaces. The spaces are only used for the
+            sensor grids. Default: '.IfcSpace'.
+        grids: Set to False to skip generating the sensor grids of the spaces.
+            Default: True.
+    """
+
+    def __init__(self, walls: str = QUERIES['walls'], slabs: str = QUERIES['slabs'],
+                 shades: str = QUERIES['shades'], windows: str = QUERIES['windows'],
+                 doors: str = QUERIES['doors'], spaces: str = QUERIES['spaces'],
+                 grids: bool = True) -> None:
+        self.walls = walls
+        self.slabs = slabs
+        self.shades = shades
+        self.windows = windows
+        self.doors = doors
+        self.spaces = spaces
+        self.grids = grids
+
+    @classmethod
+    def from_profile(cls, name: str) -> 'ConversionConfig':
+        """Create a config from the name of a built-in profile.
+
+        Args:
+            name: One of full, energy or daylight.
+        """
+        return cls(**_profile(name))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ConversionConfig':
+        """Create a config from a dictionary.
+
+        The dictionary can have a profile key with the name of a built-in profile.
+        The other keys change the values of the profile.
+        """
+        data = dict(data)
+        values = _profile(data.pop('profile', 'full'))
+        unknown = set(data) - set(KINDS) - {'grids'}
+        if unknown:
+            raise ValueError(f'Unsupported config keys: {", ".join(sorted(unknown))}.')
+        values.update(data)
+        return cls(**values)
+
+    @classmethod
+    def from_value(cls, value: Union[str, dict, 'ConversionConfig']) \
+            -> 'ConversionConfig':
+        """Create a config from the name of a profile, a path to a JSON file, a
+        dictionary or a config."""
+        if isinstance(value, ConversionConfig):
+            return value
+        if isinstance(value, dict):
+            return cls.from_dict(value)
+        if value in PROFILES:
+            return cls.from_profile(value)
+        path = pathlib.Path(value)
+        if path.suffix.lower() != '.json' or not path.exists():
+            raise ValueError(
+                f'Unsupported config: {value}. Use a path to a JSON file or one of '
+                f'{", ".join(PROFILES)}.')
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> dict:
+        """Get the config as a dictionary."""
+        data = {kind: getattr(self, kind) for kind in KINDS}
+        data['grids'] = self.grids
+        return data
+
+    def select(self, ifc_file: ifcopenshell.file, kind: str) -> List[IfcElement]:
+        """Get the IFC elements of a kind. An element is only returned once."""
+        query = getattr(self, kind)
+        if not query:
+            return []
+        elements: Dict[int, IfcElement] = {}
+        for element in Selector().parse(ifc_file, query):
+            elements.setdefault(element.id(), element)
+        return list(elements.values())
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{key}={value!r}' for key, value in self.to_dict().items())
+        return f'ConversionConfig({values})'
@@ -1,12 +1,16 @@
 """Honeybee-IFC Door object."""
 
+from typing import Dict, TYPE_CHECKING
+
 import ifcopenshell
 from ifcopenshell.entity_instance import entity_instance as IfcElement
 from ladybug_geometry.geometry3d import Face3D, LineSegment3D
-from honeybee.door import Door as HBDoor
-from honeybee.typing import clean_and_id_string
 from .element import Element
 from .opening import Opening
+from ._helper import guid_identifier
+
+if TYPE_CHECKING:
+    from honeybee.door import Door as HBDoor
 
 
 class Door(Element):
@@ -15,52 +19,89 @@ class Door(Element):
     Args:
         door: IfcDoor element.
         settings: An ifcopenshell.geom.settings object.
+        shape: An optional shape generated by ifcopenshell.geom. Default: None.
+        openings: An optional dictionary of Opening objects keyed by GlobalId that
+            is shared between the elements of a Model so that each IfcOpeningElement
+            is only tessellated once. Default: None.
     """
 
-    def __init__(self, door: IfcElement, settings: ifcopenshell.geom.settings) -> None:
-        super().__init__(door, settings)
-        self.door = door
-        self.settings = settings
+    __slots__ = ('_openings', '_opening', '_face3d')
+
+    def __init__(self, door: IfcElement, settings: ifcopenshell.geom.settings,
+                 shape=None, openings: Dict[str, Opening] = None) -> None:
+        super().__init__(door, settings, shape)
+        self._openings = openings if openings is not None else {}
+        self._opening = None
+        self._face3d = None
+
+    @property
+    def door(self) -> IfcElement:
+        """Original IFC door."""
+        return self.element
 
     @property
     def opening(self) -> Opening:
         """Honeybee-IFC Element for the IfcOpeningElement of an IfcWindow"""
-        return Opening(self.element.FillsVoids[0].RelatingOpeningElement)
+        if self._opening is None:
+            self._opening = Opening.from_cache(
+                self.element.FillsVoids[0].RelatingOpeningElement, self._openings,
+                self.settings)
+        return self._opening
+
+    @property
+    def host_guid(self) -> str:
+        """GlobalId of the element that is voided by the opening. e.g. the wall.
+
+        None if the opening does not void any element.
+        """
+        voids = self.opening.element.VoidsElements
+        return voids[0].RelatingBuildingElement.GlobalId if voids else None
 
     @property
     def face3d(self) -> Face3D:
         """A Face3D representation."""
-        return sorted(self.polyface3d.faces, key=lambda x: x.area, reverse=True)[0]
+        if self._face3d is None:
+            self._face3d = max(self.polyface3d.faces, key=lambda x: x.area)
+        return self._face3d
 
     def moved_opening_face3d(self) -> Face3D:
         """Get a simplified Face3D representation that is moved to the center of the opening."""
 
+        opening_polyface3d = self.opening.polyface3d
+        normal = self.face3d.plane.n.normalize()
         parallel_faces = [
-            face for face in self.opening.polyface3d.faces if
-            face.normal.normalize().is_equivalent(self.face3d.plane.n.normalize(), 0.001)]
+            face for face in opening_polyface3d.faces if
+            face.normal.normalize().is_equivalent(normal, 0.001)]
 
         if not parallel_faces:
             print(f'In Door {self.guid}, the door panel does not seem parallel to the'
                   ' door opening. This door might not be translated correctly.')
             # This means a door or a window is not parallel to the opening.
-            area_sorted_faces = sorted(
-                self.opening.polyface3d.faces, key=lambda x: x.area, reverse=True)
-            face3d = area_sorted_faces[0]
+            face3d = max(opening_polyface3d.faces, key=lambda x: x.area)
             line = LineSegment3D.from_end_points(
-                face3d.center, self.opening.polyface3d.center)
+                face3d.center, opening_polyface3d.center)
             # move the largest face to the center of the opening element
             return face3d.move(line.v)
         else:
             # use the larges face in the opening if the door or the window is not parallel
-            area_sorted_faces = sorted(
-                parallel_faces, key=lambda x: x.area, reverse=True)
-
-            face3d = area_sorted_faces[0]
+            face3d = max(parallel_faces, key=lambda x: x.area)
             line = LineSegment3D.from_end_points(
                 face3d.center, self.polyface3d.center)
             # move the largest face to the center of the opening element
             return face3d.move(line.v)
 
-    def to_honeybee(self) -> HBDoor:
-        """Get a Honeybee Aperture object."""
-        return HBDoor(clean_and_id_string('Door'), self.moved_opening_face3d())
+    def to_honeybee(self, face3d: Face3D = None) -> 'HBDoor':
+        """Get a Honeybee Door object.
+
+        Args:
+            face3d: An optional Face3D to use instead of the moved opening face. e.g.
+                the face projected on its host wall. Default: None.
+        """
+        return self.door_from_face3d(self.guid, face3d or self.moved_opening_face3d())
+
+    @staticmethod
+    def door_from_face3d(guid: str, face3d: Face3D) -> 'HBDoor':
+        """Get a Honeybee Door object for a door from its Face3D."""
+        from honeybee.door import Door as HBDoor
+
+        return HBDoor(guid_identifier('Door', guid), face3d)
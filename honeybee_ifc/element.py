@@ -1,9 +1,12 @@
 """Honeybee-ifc Element object."""
 
 import ifcopenshell
+import numpy as np
 from ladybug_geometry.geometry3d import Polyface3D
 from ifcopenshell.entity_instance import entity_instance as IfcElement
-from ._helper import get_shape, get_face3ds_from_shape
+from ._helper import get_shape_data, get_face3ds_from_data, get_polyface3d, \
+    default_settings
+from .instancing import transform_polyface3d
 
 
 class Element:
@@ -13,20 +16,31 @@ class Element:
 
     Args:
         element: An IFC element.
-        settings: An ifcopenshell.geom.settings object.
+        settings: An ifcopenshell.geom.settings object. The faces are extracted
+            with FreeCAD if the settings are set to use BREP data.
+        shape: An optional shape generated for the element by ifcopenshell.geom.
+            Pass the shape from ifcopenshell.geom.iterator to avoid tessellating
+            the element a second time. The shape is not kept. Only its vertices and
+            triangles arrays or its BREP data are kept until the Polyface3D is
+            computed. Default: None.
     """
 
-    def __init__(self, element: IfcElement, settings: ifcopenshell.geom.settings = None):
+    __slots__ = ('element', 'settings', '_data', '_polyface3d', '_instance')
+
+    def __init__(self, element: IfcElement, settings: ifcopenshell.geom.settings = None,
+                 shape=None):
         self.element = element
         self.settings = settings or self._settings()
-        self._polyface3d = self._get_polyface3d()
+        # the geometry is computed on first access to polyface3d
+        self._data = None
+        self._polyface3d = None
+        self._instance = None
+        if shape is not None:
+            self.set_shape(shape)
 
     @staticmethod
     def _settings() -> ifcopenshell.geom.settings:
-        settings = ifcopenshell.geom.settings()
-        settings.set(settings.USE_WORLD_COORDS, True)
-        settings.set(settings.USE_BREP_DATA, True)
-        return settings
+        return default_settings(brep_data=True)
 
     @property
     def ifc_element(self):
@@ -41,19 +55,67 @@ class Element:
     @property
     def polyface3d(self):
         """Ladybug Polyface3D representation."""
+        if self._polyface3d is None:
+            self._polyface3d = self._get_polyface3d()
+            # the tessellation is not needed anymore
+            self._data = None
         return self._polyface3d
 
+    @property
+    def has_polyface3d(self) -> bool:
+        """Whether the Polyface3D of the element is already computed."""
+        return self._polyface3d is not None
+
+    @property
+    def has_shape_data(self) -> bool:
+        """Whether the tessellation of the element is kept until its Polyface3D is
+        computed."""
+        return self._data is not None
+
+    @property
+    def is_instance(self) -> bool:
+        """Whether the geometry of the element is derived from a prototype."""
+        return self._instance is not None
+
+    def set_instance(self, prototype: 'Element', matrix: np.ndarray) -> None:
+        """Derive the geometry of the element from another element with the same
+        representation instead of tessellating it.
+
+        Args:
+            prototype: A Honeybee-IFC element with the same representation.
+            matrix: A 4x4 matrix that transforms the geometry of the prototype to the
+                element. See instancing.find_instances.
+        """
+        self._instance = prototype, matrix
+        self._data = None
+
+    def set_shape(self, shape) -> None:
+        """Keep the geometry of a shape that is generated by ifcopenshell.geom for the
+        element until its Polyface3D is computed."""
+        self._data = get_shape_data(self.element, self.settings, shape)
+
+    def set_shape_data(self, data) -> None:
+        """Keep the output of shape_data that is created elsewhere. e.g. in another
+        process."""
+        self._data = data
+
+    def shape_data(self):
+        """Geometry of the element that can be sent to other processes.
+
+        See _helper.get_shape_data for the details.
+        """
+        if self._data is not None:
+            return self._data
+        return get_shape_data(self.element, self.settings)
+
+    def set_polyface3d(self, polyface3d: Polyface3D) -> None:
+        """Set a Polyface3D that is computed elsewhere. e.g. in a process pool."""
+        self._polyface3d = polyface3d
+        self._data = None
+
     def _get_polyface3d(self) -> Polyface3D:
         """Polyface3D object from an IFC element."""
-
-        shape = get_shape(self.element, self.settings)
-        face3ds = get_face3ds_from_shape(shape)
-        polyface3d = Polyface3D.from_faces(face3ds, tolerance=0.01)
-        # if the Polyface is solid return it or return a new Polyface with all faces
-        # flipped
-        if polyface3d.is_solid:
-            return polyface3d
-        else:
-            faces = Polyface3D.get_outward_faces(polyface3d.faces, 0.01)
-            polyface3d = Polyface3D.from_faces(faces, tolerance=0.01)
-            return polyface3d
+        if self._instance is not None:
+            prototype, matrix = self._instance
+            return transform_polyface3d(prototype.polyface3d, matrix)
+        return get_polyface3d(get_face3ds_from_data(self.shape_data()))
@@ -0,0 +1,184 @@
+"""Generate sensor grids on the floors of spaces with NumPy.
+
+The grid follows the same rules as Face3D.mesh_grid in ladybug_geometry. A grid of
+cells is laid out over the bounding rectangle of each face in the coordinates of its
+plane and a cell is kept if all of its corners are inside the face. The sensors are
+at the centers of the cells. Instead of creating a Point2D and testing it against the
+polygon one by one, all the corners of a face are tested at once.
+"""
+
+import math
+import pathlib
+from typing import Sequence, Tuple
+
+import numpy as np
+from ladybug_geometry.geometry3d import Face3D
+
+# maximum number of point-edge pairs that are tested at once
+_CHUNK = 2 ** 20
+
+
+def is_floor(face3d: Face3D, angle_tolerance: float = 1.0) -> bool:
+    """Whether a face points downwards within an angle tolerance in degrees."""
+    return face3d.normal.normalize().z <= -math.cos(math.radians(angle_tolerance))
+
+
+def _domain(length: float, size: float) -> Tuple[float, int]:
+    """Corrected cell size and number of cells over a length. Same as Mesh2D."""
+    count = max(int(length / size), 1)
+    return length / count, count
+
+
+def _points_in_loop(points: np.ndarray, loop: np.ndarray,
+                    tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Test which points are inside a closed loop and which ones are on its edges.
+
+    Args:
+        points: A (N, 2) array of points.
+        loop: A (M, 2) array of the vertices of the loop.
+        tolerance: Maximum distance of a point to an edge to be on the edge.
+
+    Returns:
+        Two boolean arrays of length N for the points inside and on the edges.
+    """
+    start, end = loop, np.roll(loop, -1, axis=0)
+    x1, y1 = start[:, 0], start[:, 1]
+    dx, dy = end[:, 0] - x1, end[:, 1] - y1
+    length = dx ** 2 + dy ** 2
+    length[length == 0] = 1
+
+    inside = np.empty(len(points), dtype=bool)
+    on_edge = np.empty(len(points), dtype=bool)
+    step = max(1, _CHUNK // len(loop))
+    for i in range(0, len(points), step):
+        px = points[i:i + step, 0, None]
+        py = points[i:i + step, 1, None]
+        # even-odd rule with a horizontal ray
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x1 + (py - y1) * dx / dy
+        crosses = ((y1 > py) != (y1 + dy > py)) & (px < x_cross)
+        inside[i:i + step] = np.count_nonzero(crosses, axis=1) % 2 == 1
+        # distance to the closest point on each edge
+        t = np.clip(((px - x1) * dx + (py - y1) * dy) / length, 0, 1)
+        distance = (px - x1 - t * dx) ** 2 + (py - y1 - t * dy) ** 2
+        on_edge[i:i + step] = np.any(distance <= tolerance ** 2, axis=1)
+    return inside, on_edge
+
+
+def points_in_face(points: np.ndarray, boundary: np.ndarray,
+                   holes: Sequence[np.ndarray] = (),
+                   tolerance: float = 1e-6) -> np.ndarray:
+    """Test which 2D points are inside a face with holes.
+
+    Points on the edges of the boundary and the holes are inside the face.
+
+    Args:
+        points: A (N, 2) array of points.
+        boundary: A (M, 2) array of the vertices of the boundary.
+        holes: A list of arrays for the vertices of the holes.
+        tolerance: Maximum distance of a point to an edge to be on the edge.
+
+    Returns:
+        A boolean array of length N.
+    """
+    inside, on_edge = _points_in_loop(points, boundary, tolerance)
+    result = inside | on_edge
+    for hole in holes:
+        inside, on_edge = _points_in_loop(points, hole, tolerance)
+        result &= ~inside | on_edge
+    return result
+
+
+def face_grid(face3d: Face3D, size: float, offset: float = 0.75, flip: bool = True,
+              mesh: bool = True) -> Tuple[np.ndarray, ...]:
+    """Get the sensor positions and directions of a grid over a face.
+
+    Args:
+        face3d: A Face3D.
+        size: Size of the grid cells.
+        offset: Distance between the face and the sensors. Default: 0.75.
+        flip: Set to True to reverse the direction of the sensors and the offset
+            from the normal of the face. Floors point downwards so this is True by
+            default.
+        mesh: Set to False to skip calculating the vertices and faces of the mesh of
+            the grid. Default: True.
+
+    Returns:
+        A tuple of four arrays for the positions (N, 3), directions (N, 3), mesh
+        vertices (K, 3) and mesh faces (N, 4) of the grid. The mesh arrays are empty
+        if mesh is False.
+    """
+    plane = face3d.plane
+    origin = np.array((plane.o.x, plane.o.y, plane.o.z))
+    axes = np.array(((plane.x.x, plane.x.y, plane.x.z),
+                     (plane.y.x, plane.y.y, plane.y.z)))
+    normal = np.array((plane.n.x, plane.n.y, plane.n.z)) * (-1 if flip else 1)
+
+    def to_2d(points):
+        return (np.array([(pt.x, pt.y, pt.z) for pt in points]) - origin) @ axes.T
+
+    boundary = to_2d(face3d.boundary)
+    holes = [to_2d(hole) for hole in face3d.holes or ()]
+    low, high = boundary.min(axis=0), boundary.max(axis=0)
+    x_dim, num_x = _domain(high[0] - low[0], size)
+    y_dim, num_y = _domain(high[1] - low[1], size)
+
+    empty = np.zeros((0, 3)), np.zeros((0, 3)), np.zeros((0, 3)), np.zeros((0, 4), int)
+    if x_dim <= 0 or y_dim <= 0:
+        return empty
+
+    # corners of the cells with x as the outer loop. Same as Mesh2D.
+    i, j = np.meshgrid(np.arange(num_x + 1), np.arange(num_y + 1), indexing='ij')
+    corners = low + np.column_stack((i.ravel() * x_dim, j.ravel() * y_dim))
+    inside = points_in_face(corners, boundary, holes).reshape(num_x + 1, num_y + 1)
+    cells = inside[:-1, :-1] & inside[1:, :-1] & inside[1:, 1:] & inside[:-1, 1:]
+    cell_i, cell_j = np.nonzero(cells)
+    if not len(cell_i):
+        return empty
+
+    to_3d = origin + normal * offset
+    centers = low + np.column_stack(((cell_i + 0.5) * x_dim, (cell_j + 0.5) * y_dim))
+    positions = to_3d + centers @ axes
+    directions = np.tile(normal, (len(positions), 1))
+    if not mesh:
+        return positions, directions, empty[2], empty[3]
+
+    # index the corners of the cells that are kept
+    corner_ids = np.ravel_multi_index((cell_i, cell_j), (num_x + 1, num_y + 1))
+    quads = np.column_stack((corner_ids, corner_ids + num_y + 1,
+                             corner_ids + num_y + 2, corner_ids + 1))
+    if flip:
+        quads = quads[:, ::-1]
+    used, quads = np.unique(quads, return_inverse=True)
+    vertices = to_3d + corners[used] @ axes
+    return positions, directions, vertices, quads.reshape(-1, 4)
+
+
+def faces_grid(face3ds: Sequence[Face3D], size: float, offset: float = 0.75,
+               flip: bool = True, mesh: bool = True) -> Tuple[np.ndarray, ...]:
+    """Get the sensor positions and directions of a grid over a list of faces.
+
+    See face_grid for the arguments and the output. The mesh faces index the joined
+    vertices of all the faces.
+    """
+    grids = [face_grid(face3d, size, offset, flip, mesh) for face3d in face3ds]
+    if not grids:
+        return np.zeros((0, 3)), np.zeros((0, 3)), np.zeros((0, 3)), \
+            np.zeros((0, 4), int)
+    starts = np.cumsum([0] + [len(grid[2]) for grid in grids[:-1]])
+    return (np.concatenate([grid[0] for grid in grids]),
+            np.concatenate([grid[1] for grid in grids]),
+            np.concatenate([grid[2] for grid in grids]),
+            np.concatenate([grid[3] + start for grid, start in zip(grids, starts)]))
+
+
+def write_pts(path: str, positions: np.ndarray, directions: np.ndarray) -> str:
+    """Write sensor positions and directions to a Radiance pts file.
+
+    Returns:
+        Path to the pts file.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savetxt(path, np.hstack((positions, directions)), fmt='%.6f')
+    return str(path)
@@ -0,0 +1,287 @@
+"""Host apertures and doors on the faces of their parent walls.
+
+The faces are indexed in a uniform grid over their bounding boxes so that each
+aperture or door is only compared against the few faces around it. This keeps the
+hosting close to linear for models with tens of thousands of openings.
+"""
+
+import itertools
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from ladybug_geometry.geometry2d import Polygon2D
+from ladybug_geometry.geometry3d import Face3D, Point3D
+
+
+def _bounds(face3ds: Sequence[Face3D]) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum and maximum points of a list of Face3Ds as two (N, 3) arrays."""
+    mins = np.array([(f.min.x, f.min.y, f.min.z) for f in face3ds], dtype=float)
+    maxs = np.array([(f.max.x, f.max.y, f.max.z) for f in face3ds], dtype=float)
+    return mins.reshape(-1, 3), maxs.reshape(-1, 3)
+
+
+class FaceIndex:
+    """A uniform grid over the bounding boxes of a list of Face3Ds.
+
+    Args:
+        face3ds: A list of Face3D objects.
+        cell_size: Size of the cells of the grid. Default: None which uses the
+            median of the largest dimension of the bounding boxes of the faces.
+    """
+
+    def __init__(self, face3ds: Sequence[Face3D], cell_size: float = None) -> None:
+        self.face3ds = list(face3ds)
+        self.mins, self.maxs = _bounds(self.face3ds)
+        if cell_size is None:
+            cell_size = float(np.median((self.maxs - self.mins).max(axis=1))) \
+                if self.face3ds else 1.0
+        self.cell_size = max(cell_size, 1e-3)
+        self._cells: Dict[Tuple[int, int, int], List[int]] = defaultdict(list)
+        for count, (low, high) in enumerate(zip(self._cell(self.mins),
+                                                self._cell(self.maxs))):
+            for cell in itertools.product(*(range(a, b + 1) for a, b in zip(low, high))):
+                self._cells[cell].append(count)
+
+    def _cell(self, points: np.ndarray) -> np.ndarray:
+        return np.floor(points / self.cell_size).astype(int)
+
+    def query(self, min_pt: Point3D, max_pt: Point3D, distance: float = 0) -> List[int]:
+        """Get the indices of the faces with a bounding box that overlaps a box.
+
+        Args:
+            min_pt: Minimum point of the box.
+            max_pt: Maximum point of the box.
+            distance: A distance to extend the box in every direction. Default: 0.
+
+        Returns:
+            A sorted list of indices of the faces.
+        """
+        low = np.array([min_pt.x, min_pt.y, min_pt.z]) - distance
+        high = np.array([max_pt.x, max_pt.y, max_pt.z]) + distance
+        candidates = set()
+        for cell in itertools.product(
+                *(range(a, b + 1) for a, b in zip(self._cell(low), self._cell(high)))):
+            candidates.update(self._cells.get(cell, ()))
+        if not candidates:
+            return []
+        candidates = np.array(sorted(candidates))
+        overlap = np.all((self.mins[candidates] <= high) &
+                         (self.maxs[candidates] >= low), axis=1)
+        return candidates[overlap].tolist()
+
+
+def _polygon2d(face3d: Face3D, points: Sequence[Point3D]) -> Polygon2D:
+    return Polygon2D([face3d.plane.xyz_to_xy(pt) for pt in points])
+
+
+def project_sub_face(face3d: Face3D, sub_face: Face3D) -> Face3D:
+    """Project a sub-face on the plane of a face and match its normal with the face.
+    """
+    plane = face3d.plane
+    projected = Face3D([plane.project_point(pt) for pt in sub_face.boundary])
+    if projected.normal.dot(face3d.normal) < 0:
+        projected = projected.flip()
+    return projected
+
+
+def _in_notch(boundary: Polygon2D, polygon: Polygon2D, tolerance: float) -> bool:
+    """Whether a polygon fills a notch in the boundary. e.g. a door at the bottom of a
+    wall."""
+    union = Polygon2D.boolean_union_all([boundary, polygon], tolerance)
+    return len(union) == 1 and \
+        abs(union[0].area - boundary.area - polygon.area) < polygon.area * 0.01
+
+
+def _contains(face3d: Face3D, sub_face: Face3D, tolerance: float) -> bool:
+    """Whether the projection of a sub-face is inside the boundary of a face or fills
+    a notch in its boundary."""
+    boundary = _polygon2d(face3d, face3d.boundary)
+    polygon = _polygon2d(face3d, sub_face.boundary)
+    relationship = boundary.polygon_relationship(polygon, tolerance)
+    return relationship == 1 or \
+        (relationship == -1 and _in_notch(boundary, polygon, tolerance))
+
+
+def find_hosts(face3ds: Sequence[Face3D], sub_faces: Sequence[Face3D],
+               face_keys: Sequence[str] = None, sub_face_keys: Sequence[str] = None,
+               tolerance: float = 0.01, max_distance: float = 0.5,
+               angle_tolerance: float = 1.0) -> List[Optional[int]]:
+    """Find the face that hosts each sub-face.
+
+    A face can host a sub-face if they are parallel, the sub-face is closer than the
+    max_distance to the plane of the face and the projection of the sub-face is
+    inside the boundary of the face or fills a notch in it. When there is more than
+    one host the closest one is used.
+
+    Args:
+        face3ds: A list of Face3Ds that can host the sub-faces.
+        sub_faces: A list of Face3Ds to be hosted.
+        face_keys: An optional list of keys for the faces. e.g. the GlobalId of their
+            wall.
+        sub_face_keys: An optional list of keys for the sub-faces. A sub-face with a
+            key is only hosted by the faces with the same key when there are any.
+            e.g. the GlobalId of the wall that the opening of the window voids.
+        tolerance: The maximum difference between point values for them to be
+            considered distinct. Default: 0.01.
+        max_distance: Maximum distance between a sub-face and its host. Windows and
+            doors are placed in the middle of the wall so this should be more than
+            half of the thickness of the walls. Default: 0.5.
+        angle_tolerance: Maximum angle between the normals in degrees. Default: 1.
+
+    Returns:
+        A list with the index of the host face for each sub-face or None if the
+        sub-face can't be hosted.
+    """
+    index = FaceIndex(face3ds)
+    min_dot = math.cos(math.radians(angle_tolerance))
+    hosts = []
+    for count, sub_face in enumerate(sub_faces):
+        candidates = index.query(sub_face.min, sub_face.max, max_distance)
+        key = sub_face_keys[count] if sub_face_keys is not None else None
+        if key is not None and face_keys is not None:
+            related = [i for i in candidates if face_keys[i] == key]
+            candidates = related or candidates
+
+        host, host_distance = None, None
+        center = sub_face.center
+        for i in candidates:
+            face3d = face3ds[i]
+            if abs(face3d.normal.dot(sub_face.normal)) < min_dot:
+                continue
+            distance = face3d.plane.distance_to_point(center)
+            if distance > max_distance or \
+                    (host is not None and distance >= host_distance):
+                continue
+            if _contains(face3d, sub_face, tolerance):
+                host, host_distance = i, distance
+        hosts.append(host)
+    return hosts
+
+
+def _fills_opening(face3d: Face3D, sub_face: Face3D, tolerance: float) -> bool:
+    """Whether the projection of a sub-face is inside a hole of a face or fills a
+    notch in its boundary."""
+    polygon = _polygon2d(face3d, sub_face.boundary)
+    center = polygon.center
+    for hole in face3d.holes or ():
+        if _polygon2d(face3d, hole).is_point_inside_bound_rect(center):
+            return True
+    boundary = _polygon2d(face3d, face3d.boundary)
+    return boundary.polygon_relationship(polygon, tolerance) == -1 and \
+        _in_notch(boundary, polygon, tolerance)
+
+
+def find_filled_faces(face3ds: Sequence[Face3D], sub_faces: Sequence[Face3D],
+                      hosts: Sequence[Optional[int]], face_keys: Sequence[str] = None,
+                      tolerance: float = 0.01, max_distance: float = 0.5,
+                      angle_tolerance: float = 1.0) -> List[List[int]]:
+    """Find the other faces with an opening that each hosted sub-face fills.
+
+    The opening of a window voids both sides of its wall but the window is only
+    hosted by one of them. A face other than the host is filled by the sub-face if
+    it is parallel to the sub-face, closer than the max_distance and the projection
+    of the sub-face is inside one of its holes or fills a notch in its boundary.
+
+    Args:
+        face3ds: A list of Face3Ds that can host the sub-faces.
+        sub_faces: A list of Face3Ds that are hosted.
+        hosts: The index of the host face of each sub-face or None. See find_hosts.
+        face_keys: An optional list of keys for the faces. A face is only filled by
+            the sub-faces that are hosted by a face with the same key. e.g. the
+            GlobalId of their wall.
+        tolerance: The maximum difference between point values for them to be
+            considered distinct. Default: 0.01.
+        max_distance: Maximum distance between a sub-face and the faces that it
+            fills. Default: 0.5.
+        angle_tolerance: Maximum angle between the normals in degrees. Default: 1.
+
+    Returns:
+        A list with the indices of the other faces that each sub-face fills.
+    """
+    index = FaceIndex(face3ds)
+    min_dot = math.cos(math.radians(angle_tolerance))
+    filled = []
+    for sub_face, host in zip(sub_faces, hosts):
+        faces = []
+        if host is not None:
+            center = sub_face.center
+            for i in index.query(sub_face.min, sub_face.max, max_distance):
+                if i == host or \
+                        (face_keys is not None and face_keys[i] != face_keys[host]):
+                    continue
+                face3d = face3ds[i]
+                if abs(face3d.normal.dot(sub_face.normal)) < min_dot or \
+                        face3d.plane.distance_to_point(center) > max_distance:
+                    continue
+                if _fills_opening(face3d, sub_face, tolerance):
+                    faces.append(i)
+        filled.append(faces)
+    return filled
+
+
+def _add_notches(boundary: Polygon2D, notches: Sequence[Polygon2D],
+                 tolerance: float) -> Optional[Polygon2D]:
+    """Add polygons that fill notches to a boundary. Returns None if the union is not
+    a single polygon."""
+    union = Polygon2D.boolean_union_all([boundary] + list(notches), tolerance)
+    if len(union) != 1:
+        return None
+    return union[0].reverse() if union[0].is_clockwise else union[0]
+
+
+def can_fill_notch(face3d: Face3D, sub_face: Face3D, tolerance: float = 0.01) -> bool:
+    """Whether a sub-face that is projected on a face can be added to its boundary.
+
+    Only the sub-faces that fill a notch in the boundary are added to it. The other
+    sub-faces always return True.
+
+    Args:
+        face3d: The host Face3D.
+        sub_face: A Face3D that is projected on the host. See project_sub_face.
+        tolerance: The maximum difference between point values for them to be
+            considered distinct. Default: 0.01.
+    """
+    boundary = _polygon2d(face3d, face3d.boundary)
+    polygon = _polygon2d(face3d, sub_face.boundary)
+    if boundary.is_point_inside_bound_rect(polygon.center):
+        return True
+    return _add_notches(boundary, [polygon], tolerance) is not None
+
+
+def fill_openings(face3d: Face3D, sub_faces: Sequence[Face3D],
+                  tolerance: float = 0.01) -> Face3D:
+    """Fill the openings of a face that are covered by hosted sub-faces.
+
+    The walls are voided by the openings of their windows and doors. A hole is
+    removed when the center of a sub-face is inside it. Sub-faces that fill a notch
+    in the boundary of the face are added to the boundary. Use can_fill_notch to
+    check each sub-face before it is hosted.
+
+    Args:
+        face3d: The host Face3D.
+        sub_faces: A list of Face3Ds that are projected on the host. See
+            project_sub_face.
+        tolerance: The maximum difference between point values for them to be
+            considered distinct. Default: 0.01.
+    """
+    if not sub_faces:
+        return face3d
+    plane = face3d.plane
+    boundary = _polygon2d(face3d, face3d.boundary)
+    polygons = [_polygon2d(face3d, sub_face.boundary) for sub_face in sub_faces]
+    centers = [polygon.center for polygon in polygons]
+
+    notches = [polygon for polygon, center in zip(polygons, centers)
+               if not boundary.is_point_inside_bound_rect(center)]
+    if notches:
+        boundary = _add_notches(boundary, notches, tolerance)
+        if boundary is None:
+            raise ValueError(
+                'The sub-faces in the notches of a face can not be added to its '
+                'boundary as one polygon. Check them with can_fill_notch.')
+    holes = [hole for hole in face3d.holes or ()
+             if not any(_polygon2d(face3d, hole).is_point_inside_bound_rect(center)
+                        for center in centers)]
+    return Face3D([plane.xy_to_xyz(pt) for pt in boundary], plane, holes or None)
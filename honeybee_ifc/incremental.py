@@ -0,0 +1,162 @@
+"""Incremental conversion of IFC revisions to an existing HBJSON file.
+
+The elements of two revisions of an IFC file are matched by GlobalId and compared
+using a hash of their attributes, placement and representation. Only the added and
+changed elements are converted again and the objects of the changed and removed
+elements are replaced in the HBJSON file. This relies on the Honeybee identifiers
+that are derived from the GlobalId of each element.
+"""
+
+import json
+import pathlib
+from typing import Dict, List, Union
+
+import ifcopenshell
+
+from ._helper import guid_from_identifier, entity_hash
+from .config import ConversionConfig
+from .model import Model
+
+# keys of the Honeybee objects in an HBJSON file
+ORPHANED_KEYS = ('orphaned_faces', 'orphaned_shades', 'orphaned_apertures',
+                 'orphaned_doors')
+
+
+def element_hashes(ifc_file: ifcopenshell.file,
+                   config: Union[str, dict, ConversionConfig] = 'full') -> Dict[str, str]:
+    """Get a dictionary of GlobalIds and hashes for the converted elements of a file.
+
+    The converted elements are the ones that the config selects. See
+    Model.select_elements.
+
+    The hash of windows and doors also includes their opening and the element that
+    the opening voids since they are used in their translation and hosting. The hash
+    of the other elements includes their openings and the elements that fill them
+    since the openings void their geometry. e.g. adding a window to a wall changes
+    the wall.
+    """
+    memo = {}
+    hashes = {}
+    selected = Model.select_elements(ifc_file, ConversionConfig.from_value(config))
+    for elements in selected.values():
+        for element in elements:
+            if element.GlobalId in hashes:
+                continue
+            digest = entity_hash(element, memo)
+            for fills in getattr(element, 'FillsVoids', None) or ():
+                opening = fills.RelatingOpeningElement
+                digest += entity_hash(opening, memo)
+                for voids in opening.VoidsElements or ():
+                    digest += entity_hash(voids.RelatingBuildingElement, memo)
+            for voids in getattr(element, 'HasOpenings', None) or ():
+                opening = voids.RelatedOpeningElement
+                digest += entity_hash(opening, memo)
+                for fills in opening.HasFillings or ():
+                    digest += entity_hash(fills.RelatedBuildingElement, memo)
+            hashes[element.GlobalId] = digest
+    return hashes
+
+
+class ModelDiff:
+    """Difference between the converted elements of two IFC files.
+
+    Args:
+        old_hashes: A dictionary of GlobalIds and hashes for the old file.
+        new_hashes: A dictionary of GlobalIds and hashes for the new file.
+    """
+
+    def __init__(self, old_hashes: Dict[str, str], new_hashes: Dict[str, str]) -> None:
+        self.added = sorted(set(new_hashes) - set(old_hashes))
+        self.removed = sorted(set(old_hashes) - set(new_hashes))
+        common = set(old_hashes) & set(new_hashes)
+        self.changed = sorted(guid for guid in common if old_hashes[guid] != new_hashes[guid])
+        self.unchanged = sorted(common - set(self.changed))
+
+    @classmethod
+    def from_files(cls, old_ifc_file_path: str, new_ifc_file_path: str,
+                   config: Union[str, dict, ConversionConfig] = 'full') -> 'ModelDiff':
+        """Compare the elements of two IFC files that a config selects."""
+        return cls(element_hashes(ifcopenshell.open(str(old_ifc_file_path)), config),
+                   element_hashes(ifcopenshell.open(str(new_ifc_file_path)), config))
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether there are any added, changed or removed elements."""
+        return bool(self.added or self.changed or self.removed)
+
+    @property
+    def to_convert(self) -> List[str]:
+        """GlobalIds of the elements that need to be converted."""
+        return self.added + self.changed
+
+    @property
+    def to_remove(self) -> List[str]:
+        """GlobalIds of the elements that need to be removed from the HBJSON."""
+        return self.changed + self.removed
+
+    def to_dict(self) -> dict:
+        return {
+            'added': self.added, 'changed': self.changed, 'removed': self.removed,
+            'unchanged': len(self.unchanged)
+        }
+
+    def __repr__(self) -> str:
+        return f'ModelDiff: added: {len(self.added)}, changed: {len(self.changed)}, ' \
+            f'removed: {len(self.removed)}, unchanged: {len(self.unchanged)}'
+
+
+def _remove_objects(objects: List[dict], guids: set) -> List[dict]:
+    return [obj for obj in objects
+            if guid_from_identifier(obj['identifier']) not in guids]
+
+
+def update_hbjson(hbjson_path: str, old_ifc_file_path: str, new_ifc_file_path: str,
+                  **kwargs) -> ModelDiff:
+    """Update an HBJSON file that is converted from one IFC revision to another one.
+
+    Only the added and changed elements of the new IFC file are converted. The
+    Honeybee objects of the changed and removed elements are replaced in the HBJSON
+    file which is overwritten in place.
+
+    Args:
+        hbjson_path: Path to the HBJSON file that is converted from the old IFC file.
+        old_ifc_file_path: Path to the IFC file that the HBJSON is converted from.
+        new_ifc_file_path: Path to the new revision of the IFC file.
+        kwargs: Other arguments for the Model. These should be the same as the ones
+            used to convert the old IFC file. e.g. merge_coplanar. The elements that
+            the config selects are compared.
+
+    Returns:
+        The ModelDiff between the two IFC files.
+    """
+    diff = ModelDiff.from_files(
+        old_ifc_file_path, new_ifc_file_path, kwargs.get('config', 'full'))
+    if not diff.has_changes:
+        return diff
+
+    hbjson_path = pathlib.Path(hbjson_path)
+    with open(hbjson_path) as f:
+        data = json.load(f)
+
+    to_remove = set(diff.to_remove)
+    for key in ORPHANED_KEYS:
+        data[key] = _remove_objects(data.get(key, []), to_remove)
+    radiance = data['properties'].setdefault('radiance', {'type': 'ModelRadianceProperties'})
+    radiance['sensor_grids'] = _remove_objects(radiance.get('sensor_grids', []), to_remove)
+
+    if diff.to_convert:
+        new_data = Model(new_ifc_file_path, guids=diff.to_convert, **kwargs) \
+            .to_honeybee().to_dict()
+        for key in ORPHANED_KEYS:
+            data[key] = data.get(key, []) + new_data.get(key, [])
+        radiance['sensor_grids'] += \
+            new_data['properties'].get('radiance', {}).get('sensor_grids', [])
+
+    for key in ORPHANED_KEYS:
+        if not data[key]:
+            del data[key]
+
+    with open(hbjson_path, 'w') as f:
+        json.dump(data, f)
+
+    return diff
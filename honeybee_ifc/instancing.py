@@ -0,0 +1,86 @@
+"""Convert the repeated geometry of windows, doors, columns and openings once.
+
+Elements with the same representation have the same geometry in the coordinates of
+their placement. e.g. the occurrences of a window type that are mapped from the same
+IfcRepresentationMap. The first element of each representation is the prototype
+and is converted as usual. The geometry of the other elements is derived from the
+prototype with the transform between their placements. Elements that are voided by
+openings or that are mirrored from the prototype are converted on their own.
+"""
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+from ifcopenshell.entity_instance import entity_instance as IfcElement
+from ifcopenshell.util.placement import get_local_placement
+from ladybug_geometry.geometry3d import Point3D, Polyface3D
+
+from ._helper import entity_hash
+
+
+def representation_key(element: IfcElement, memo: Dict[int, str] = None) -> str:
+    """Get a key for the representation of an element.
+
+    Returns None if the element has no representation or if its geometry also
+    depends on other elements. e.g. the openings that void it.
+    """
+    if not element.Representation or getattr(element, 'HasOpenings', None):
+        return None
+    return entity_hash(element.Representation, memo)
+
+
+def placement_matrix(element: IfcElement, unit_factor: float = 1.0) -> np.ndarray:
+    """Get the 4x4 matrix of the placement of an element in meters.
+
+    Args:
+        element: An IFC element.
+        unit_factor: Factor to convert the length unit of the file to meters.
+    """
+    matrix = np.array(get_local_placement(element.ObjectPlacement), dtype=float)
+    matrix[:3, 3] *= unit_factor
+    return matrix
+
+
+def find_instances(elements: Sequence[IfcElement], unit_factor: float = 1.0,
+                   memo: Dict[int, str] = None) \
+        -> Dict[str, Tuple[IfcElement, np.ndarray]]:
+    """Find the elements that can be derived from a prototype with the same geometry.
+
+    Args:
+        elements: A list of IFC elements.
+        unit_factor: Factor to convert the length unit of the file to meters.
+        memo: An optional dictionary to reuse the hashes of the entities that are
+            shared between elements. See entity_hash.
+
+    Returns:
+        A dictionary keyed by the GlobalId of each derived element with a tuple of
+        its prototype and the 4x4 matrix that transforms the geometry of the
+        prototype to the element. Prototypes and the elements that can't be derived
+        are not in the dictionary.
+    """
+    memo = {} if memo is None else memo
+    prototypes: Dict[str, Tuple[IfcElement, np.ndarray]] = {}
+    instances = {}
+    for element in elements:
+        key = representation_key(element, memo)
+        if key is None:
+            continue
+        if key not in prototypes:
+            prototypes[key] = element, np.linalg.inv(
+                placement_matrix(element, unit_factor))
+            continue
+        prototype, inverse = prototypes[key]
+        transform = placement_matrix(element, unit_factor) @ inverse
+        # a mirrored element would have its faces flipped
+        if np.linalg.det(transform[:3, :3]) > 0:
+            instances[element.GlobalId] = prototype, transform
+    return instances
+
+
+def transform_polyface3d(polyface3d: Polyface3D, matrix: np.ndarray) -> Polyface3D:
+    """Transform a Polyface3D with a 4x4 matrix without rebuilding its faces."""
+    vertices = np.array([(pt.x, pt.y, pt.z) for pt in polyface3d.vertices])
+    vertices = vertices @ matrix[:3, :3].T + matrix[:3, 3]
+    return Polyface3D([Point3D(*pt) for pt in vertices.tolist()],
+                      polyface3d.face_indices, polyface3d.edge_information)
+
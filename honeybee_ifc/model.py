@@ -2,15 +2,15 @@
 Import an IFC file and turn it into a Honeybee model.
 Currently, only supporting IFC files with IFC2x3 schema.
 """
+import logging
 import pathlib
 import multiprocessing
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, Union, \
+    TYPE_CHECKING
 
 import ifcopenshell
+from ifcopenshell.entity_instance import entity_instance as IfcElement
 from ifcopenshell.util.unit import calculate_unit_scale
-from ifcopenshell.util.placement import get_local_placement
-from ifcopenshell.util.selector import Selector
-
-from honeybee.model import Model as HBModel
 
 from .wall import Wall
 from .window import Window
@@ -18,29 +18,159 @@ from .door import Door
 from .slab import Slab
 from .shade import Shade
 from .space import Space
+from .element import Element
+from .opening import Opening
+from .cache import GeometryCache, file_hash
+from .config import ConversionConfig
+from .writer import HBJSONWriter
+from .compact import EXTENSION as COMPACT_EXTENSION, write_compact
+from .pipeline import write_hbjson
+from ._helper import guid_identifier, iterate_shapes
+from .profiler import Profiler
+from .hosting import can_fill_notch, find_filled_faces, find_hosts, project_sub_face
+from .instancing import find_instances
+
+if TYPE_CHECKING:
+    from honeybee.model import Model as HBModel
+    from honeybee.face import Face
+    from honeybee.aperture import Aperture
+    from honeybee.door import Door as HBDoor
+    from honeybee.shade import Shade as HBShade
+    from honeybee_radiance.sensorgrid import SensorGrid
+from ._parallel import build_geometry, build_grids, convert_elements
+from .grid import write_pts
+
+logger = logging.getLogger(__name__)
 
 
 class Model:
     """Honeybee-IFC model.
 
+    The triangles of each element are only kept until its geometry is built. After
+    that, the memory of the model is dominated by the ladybug Polyface3D and Face3D
+    objects of the elements. They are kept since the Honeybee objects are created
+    from them and rebuilding them on each access is slower. See benchmarks/memory.py
+    for the memory per element. Use partition.convert_storeys to convert a large
+    file one storey at a time when it doesn't fit in memory.
+
     Args:
         ifc_file_path: A string. The path to the IFC file.
+        merge_coplanar: Set to True to merge the coplanar and edge-adjacent triangles
+            of the walls into polygons with holes. This results in much fewer
+            Honeybee Faces. Default: False.
+        backend: The backend used to extract the faces of the elements. Use freecad
+            to extract them from the BREP data using FreeCAD or native to extract
+            them from the triangulated output of ifcopenshell. The native backend
+            doesn't need FreeCAD but its faces are not validated against the
+            verified models yet. Default: freecad.
+        lazy: Set to True to skip tessellating the elements when the model is
+            created. The geometry of each element is then created on first use. This
+            makes the model available much faster for when only a subset of the
+            elements or their GUIDs are needed. Default: False.
+        workers: Number of processes used to build the geometry of the elements and
+            to convert them to Honeybee objects. The results are collected in the
+            original order of the elements. Default: 1.
+        cache_folder: Optional path to a folder to cache the geometry of the elements
+            between runs. The geometry is keyed by the content of the IFC file, the
+            GlobalId of each element and the geometry settings. Elements that are
+            found in the cache are not tessellated again. Default: None.
+        cache_size: Maximum size of the cache folder in bytes. The least recently
+            used geometry is removed when the folder gets larger. Default: 1 GB.
+        guids: An optional list of GlobalIds to only convert a subset of the walls
+            and elements. Default: None which converts all of them.
+        profile: Set to True to record the time, CPU time, counts and peak memory of
+            each stage of the conversion and the time of each element. A Profiler
+            object can also be used to enable tracing memory or to add hooks. The
+            results are available from the profiler attribute. Default: False.
+        host_sub_faces: Set to True to add the windows and doors to the faces of
+            their walls as Apertures and Doors instead of orphaned objects. The host
+            of each window and door is found from the wall that its opening voids
+            and the position of the faces. The holes that they fill are removed from
+            the faces of the walls. The windows and doors that can't be hosted stay
+            orphaned. This requires merge_coplanar. Default: False.
+        ifc_file: An optional ifcopenshell file that is already opened from the
+            ifc_file_path. Use this to convert several subsets of a large file
+            without parsing it again for each subset. Default: None.
+        config: The elements that are converted and the outputs that are built. This
+            can be a ConversionConfig, a dictionary or a path to a JSON file for
+            ConversionConfig.from_dict or the name of a built-in profile. Use energy
+            to skip the spaces and the sensor grids or daylight to skip the columns.
+            The elements that are not selected are not tessellated. Default: full
+            which converts all the elements and builds the sensor grids.
+        instancing: Set to True to convert the windows, doors, columns and openings
+            with the same representation once. e.g. the occurrences of a window type.
+            The geometry of the other occurrences is derived from the first one with
+            the transform between their placements instead of being tessellated.
+            Default: False.
+        selection: An optional dictionary of the GlobalIds of the elements of each
+            kind that are already selected from the file with select_elements. e.g.
+            the elements of one storey. The config is not evaluated again, which
+            avoids scanning the whole file for each subset of a large file. guids
+            still filters the selected elements. Default: None.
+        ifc_hash: An optional hash of the content of the IFC file for the keys of
+            the cache. See cache.file_hash. Use this to not hash a large file again
+            for each of its subsets. Default: None which hashes the file if there
+            is a cache folder.
+        threads: Number of threads of the ifcopenshell geometry iterator that
+            tessellates the elements. Default: None which uses one thread per CPU.
     """
 
-    def __init__(self, ifc_file_path: str) -> None:
+    BACKENDS = ('freecad', 'native')
+    GRID_SIZE = 0.3
+    GRID_OFFSET = 0.75
+    # kinds of elements in the config that are instanced
+    INSTANCED_KINDS = ('windows', 'doors', 'shades')
+    # kinds of elements in the config other than the walls in the order they are selected
+    ELEMENT_KINDS = ('slabs', 'shades', 'windows', 'doors', 'spaces')
+
+    def __init__(self, ifc_file_path: str, merge_coplanar: bool = False,
+                 backend: str = 'freecad', lazy: bool = False, workers: int = 1,
+                 cache_folder: str = None, cache_size: int = 1024 ** 3,
+                 guids: Iterable[str] = None,
+                 profile: Union[bool, Profiler] = False,
+                 host_sub_faces: bool = False,
+                 ifc_file: ifcopenshell.file = None,
+                 config: Union[str, dict, ConversionConfig] = 'full',
+                 instancing: bool = False,
+                 selection: Dict[str, List[str]] = None,
+                 ifc_hash: str = None, threads: int = None) -> None:
+        if host_sub_faces and not merge_coplanar:
+            raise ValueError('host_sub_faces requires merge_coplanar to be True.')
+        self.profiler = profile if isinstance(profile, Profiler) \
+            else Profiler(enabled=bool(profile))
         self.ifc_file_path = self._validate_path(ifc_file_path)
-        self.ifc_file = ifcopenshell.open(self.ifc_file_path)
-        self.settings = self._ifc_settings()
+        self.merge_coplanar = merge_coplanar
+        self.host_sub_faces = host_sub_faces
+        self.backend = self._validate_backend(backend)
+        self.lazy = lazy
+        self.workers = max(1, workers)
+        self.threads = max(1, threads) if threads else multiprocessing.cpu_count()
+        self.guids = set(guids) if guids is not None else None
+        self.config = ConversionConfig.from_value(config)
+        self.instancing = instancing
+        self.ifc_file = ifc_file or ifcopenshell.open(str(self.ifc_file_path))
+        self.settings = self._ifc_settings(self.backend)
+        # ifcopenshell.geom creates the geometry in meters. The unit factor is only
+        # needed for the lengths that are read from the file. e.g. the placements.
         self.unit_factor = calculate_unit_scale(self.ifc_file)
-        self.elements = ('IfcSlab', 'IfcColumn', 'IfcWindow', 'IfcDoor', 'IfcSpace')
+        self.cache = GeometryCache(cache_folder, cache_size) if cache_folder else None
+        self._ifc_hash = (ifc_hash or file_hash(self.ifc_file_path)) \
+            if self.cache else None
         self.spaces = []
         self.doors = []
         self.windows = []
         self.slabs = []
         self.walls = []
         self.shades = []
-        self._extract_walls()
-        self._extract_elements()
+        self._openings = {}
+        self._hosting = None
+        if selection is None:
+            selected = self.select_elements(self.ifc_file, self.config)
+        else:
+            selected = {kind: [self.ifc_file.by_guid(guid) for guid in guids]
+                        for kind, guids in selection.items()}
+        self._extract_walls(selected.get('walls', []))
+        self._extract_elements(selected)
 
     @staticmethod
     def _validate_path(path: str) -> pathlib.Path:
@@ -50,53 +180,486 @@ class Model:
             raise ValueError(f'Path {path} does not exist.')
         return path
 
+    @classmethod
+    def _validate_backend(cls, backend: str) -> str:
+        """Validate geometry backend."""
+        backend = backend.lower()
+        if backend not in cls.BACKENDS:
+            raise ValueError(
+                f'Unsupported backend: {backend}. Choose from {", ".join(cls.BACKENDS)}.')
+        return backend
+
     @staticmethod
-    def _ifc_settings() -> ifcopenshell.geom.settings:
+    def _ifc_settings(backend: str = 'freecad') -> ifcopenshell.geom.settings:
         """IFC settings."""
         settings = ifcopenshell.geom.settings()
         settings.set(settings.USE_WORLD_COORDS, True)
-        settings.set(settings.USE_BREP_DATA, True)
+        if backend == 'freecad':
+            settings.set(settings.USE_BREP_DATA, True)
         return settings
 
-    def _extract_elements(self) -> None:
-        """Extract elements from the IFC file."""
-        iterator = ifcopenshell.geom.iterator(
-            self.settings, self.ifc_file, multiprocessing.cpu_count(),
-            include=self.elements)
+    @staticmethod
+    def _wall_settings() -> ifcopenshell.geom.settings:
+        """IFC settings for walls."""
+        settings = ifcopenshell.geom.settings()
+        settings.set(settings.USE_WORLD_COORDS, True)
+        return settings
+
+    def _iterate_shapes(self, settings: ifcopenshell.geom.settings, include):
+        """Tessellate elements in parallel and yield them with their shapes.
+
+        Args:
+            settings: An ifcopenshell.geom.settings object.
+            include: A list of IFC class names or IFC elements to tessellate.
+
+        Yields:
+            A tuple of (IFC element, shape) for each tessellated element. In lazy
+            mode, the elements are not tessellated and the shape is None.
+        """
+        if self.lazy:
+            for element in self._select_elements(include):
+                yield element, None
+            return
+        yield from self._tessellate(settings, include)
+
+    def _tessellate(self, settings: ifcopenshell.geom.settings, include):
+        """Tessellate elements in parallel with ifcopenshell.geom.iterator.
+
+        Args:
+            settings: An ifcopenshell.geom.settings object.
+            include: A list of IFC class names or IFC elements to tessellate.
+
+        Yields:
+            A tuple of (IFC element, shape) for each element that has geometry.
+        """
+        for shape in iterate_shapes(self.ifc_file, settings, self.threads, include):
+            yield self.ifc_file.by_guid(shape.guid), shape
+
+    def _select_elements(self, include) -> List[IfcElement]:
+        """Get the IFC elements with a representation from a list of IFC class names or
+        IFC elements."""
+        selected = []
+        for item in include:
+            elements = self.ifc_file.by_type(item) if isinstance(item, str) else [item]
+            selected.extend(element for element in elements if element.Representation)
+        return selected
 
-        if iterator.initialize():
-            while iterator.next():
-                shape = iterator.get()
-                element = self.ifc_file.by_guid(shape.guid)
+    def _cache_key(self, element: IfcElement, settings: ifcopenshell.geom.settings,
+                   *extra) -> str:
+        """Key of the geometry of an IFC element in the geometry cache."""
+        return self.cache.key(self._ifc_hash, element.GlobalId, settings, *extra)
 
-                if element.is_a() == 'IfcWindow':
-                    self.windows.append(Window(element, self.settings))
+    def _iterate_cached_shapes(self, settings: ifcopenshell.geom.settings, include,
+                               *extra):
+        """Same as _iterate_shapes but elements that are in the cache are not tessellated.
+
+        Args:
+            settings: An ifcopenshell.geom.settings object.
+            include: A list of IFC class names or IFC elements to tessellate.
+            extra: Any other values that change the cached geometry.
+
+        Yields:
+            A tuple of (IFC element, shape, cached geometry) for each element. The
+            cached geometry is None for the elements that are not in the cache and
+            the shape is None for the elements that are in the cache. The elements
+            with a cached file that can't be read are tessellated when converted.
+        """
+        if self.cache is None:
+            for element, shape in self._iterate_shapes(settings, include):
+                yield element, shape, None
+            return
+
+        elements = self._select_elements(include)
+        keys = [self._cache_key(element, settings, *extra) for element in elements]
+        missing = [element for element, key in zip(elements, keys)
+                   if key not in self.cache]
+        shapes = {element.GlobalId: shape for element, shape in
+                  self._iterate_shapes(settings, missing)} if missing else {}
+        # the cached geometry is read one element at a time
+        for element, key in zip(elements, keys):
+            yield element, shapes.pop(element.GlobalId, None), \
+                self.cache.get(key) if key in self.cache else None
+
+    def _add_element(self, element: IfcElement, kind: str, shape=None) -> Element:
+        """Create a Honeybee-IFC element and add it to the model.
+
+        Args:
+            element: An IFC element.
+            kind: The kind of the element in the config. e.g. windows.
+            shape: An optional shape generated by ifcopenshell.geom. Default: None.
+        """
+        if kind == 'windows':
+            obj = Window(element, self.settings, shape, self._openings)
 
-                elif element.is_a() == 'IfcDoor':
-                    self.doors.append(Door(element, self.settings))
+        elif kind == 'doors':
+            obj = Door(element, self.settings, shape, self._openings)
 
-                elif element.is_a() == 'IfcSlab':
-                    self.slabs.append(
-                        Slab(element, element.PredefinedType, self.settings))
+        elif kind == 'slabs':
+            obj = Slab(element, getattr(element, 'PredefinedType', None),
+                       self.settings, shape)
 
-                elif element.is_a() == 'IfcColumn':
-                    self.shades.append(
-                        Shade(element, self.settings))
+        elif kind == 'shades':
+            obj = Shade(element, self.settings, shape)
 
-                elif element.is_a() == 'IfcSpace':
-                    self.spaces.append(Space(element, self.settings))
+        elif kind == 'spaces':
+            obj = Space(element, self.settings, shape)
 
-                else:
-                    raise ValueError(f'Unsupported element type: {element.is_a()}')
+        else:
+            raise ValueError(f'Unsupported element kind: {kind}')
 
-    def _extract_walls(self) -> None:
-        """Extract IfcWall elements from the IFC file."""
+        getattr(self, kind).append(obj)
+        return obj
+
+    @classmethod
+    def select_elements(cls, ifc_file: ifcopenshell.file,
+                        config: ConversionConfig) -> Dict[str, List[IfcElement]]:
+        """Get the IFC elements of each kind that are converted with a config.
+
+        An element that is selected for more than one kind of the elements other
+        than the walls only belongs to the first one.
+
+        Args:
+            ifc_file: An ifcopenshell file.
+            config: A ConversionConfig.
+
+        Returns:
+            A dictionary of the list of IFC elements of each kind. e.g. walls.
+        """
+        selected, ids = {'walls': config.select(ifc_file, 'walls')}, set()
+        for kind in cls.ELEMENT_KINDS:
+            selected[kind] = []
+            for element in config.select(ifc_file, kind):
+                if element.id() not in ids:
+                    ids.add(element.id())
+                    selected[kind].append(element)
+        return selected
+
+    def _filter_guids(self, include) -> list:
+        """Filter a list of IFC class names or IFC elements by the guids of the model."""
+        if self.guids is None:
+            return include
+        return [element for element in self._select_elements(include)
+                if element.GlobalId in self.guids]
+
+    def _extract_elements(self, selected: Dict[str, List[IfcElement]]) -> None:
+        """Extract the elements that are selected by the config from the IFC file.
+
+        Args:
+            selected: A dictionary of the selected IFC elements of each kind. See
+                select_elements.
+        """
+        kinds, elements = {}, []
+        for kind in self.ELEMENT_KINDS:
+            for element in selected.get(kind, []):
+                kinds[element.id()] = kind
+                elements.append(element)
+        include = self._filter_guids(elements)
+        if not include:
+            return
+        with self.profiler.stage('element extraction') as record:
+            instances, memo = {}, {}
+            if self.instancing:
+                instances = find_instances(
+                    [element for element in include
+                     if kinds[element.id()] in self.INSTANCED_KINDS],
+                    self.unit_factor, memo)
+                include = [element for element in include
+                           if element.GlobalId not in instances]
+            objects = {}
+            for element, shape, polyface3d in self._iterate_cached_shapes(
+                    self.settings, include):
+                obj = self._add_element(element, kinds[element.id()], shape)
+                if polyface3d is not None:
+                    obj.set_polyface3d(polyface3d)
+                objects[obj.guid] = obj
+                ifc_type = element.is_a()
+                record[ifc_type] = record.get(ifc_type, 0) + 1
+            for guid, (prototype, matrix) in instances.items():
+                element = self.ifc_file.by_guid(guid)
+                obj = self._add_element(element, kinds[element.id()])
+                if prototype.GlobalId in objects:
+                    obj.set_instance(objects[prototype.GlobalId], matrix)
+                ifc_type = element.is_a()
+                record[ifc_type] = record.get(ifc_type, 0) + 1
+            if self.instancing:
+                record['instances'] = len(instances) + self._instance_openings(memo)
+
+        if self.cache is not None:
+            for opening in self._get_openings():
+                if opening.has_polyface3d:
+                    continue
+                polyface3d = self.cache.get(
+                    self._cache_key(opening.element, self.settings))
+                if polyface3d is not None:
+                    opening.set_polyface3d(polyface3d)
+
+    def _instance_openings(self, memo: Dict[int, str] = None) -> int:
+        """Derive the geometry of the openings with the same representation from one
+        of them.
+
+        Returns:
+            The number of instanced openings.
+        """
+        openings = dict((opening.guid, opening) for opening in self._get_openings())
+        instances = find_instances(
+            [opening.element for opening in openings.values()], self.unit_factor, memo)
+        for guid, (prototype, matrix) in instances.items():
+            openings[guid].set_instance(openings[prototype.GlobalId], matrix)
+        return len(instances)
+
+    def _extract_walls(self, walls: List[IfcElement]) -> None:
+        """Extract IfcWall elements from the IFC file.
+
+        Args:
+            walls: A list of the IFC walls that are selected by the config.
+        """
         # Don't use BREP data here. Which will give original trinagulated meshes.
-        selector = Selector()
-        self.walls = [Wall(element) for element in selector.parse(
-            self.ifc_file, '.IfcWall | .IfcWallStandardCase')]
+        walls = self._filter_guids(walls)
+        if not walls:
+            return
+        settings = self._wall_settings()
+        with self.profiler.stage('wall extraction') as record:
+            for element, shape, face3ds in self._iterate_cached_shapes(
+                    settings, walls, 'IfcWall', self.merge_coplanar):
+                wall = Wall(element, settings, shape, self.merge_coplanar)
+                if face3ds is not None:
+                    wall.set_face3ds(face3ds)
+                self.walls.append(wall)
+            record['IfcWall'] = len(self.walls)
+
+    def _get_openings(self) -> List[Opening]:
+        """Get the Openings of all the windows and doors that fill an opening."""
+        for element in self.windows + self.doors:
+            # add the opening to the cache of openings
+            if element.element.FillsVoids:
+                element.opening
+        return list(self._openings.values())
+
+    def _get_geometric_elements(self) -> List[Element]:
+        """Get all the elements of the model including the openings but the walls."""
+        return self.windows + self.doors + self._get_openings() + \
+            self.slabs + self.shades + self.spaces
+
+    def _build_geometry(self) -> None:
+        """Build the geometry of all the elements and walls in a process pool."""
+        with self.profiler.stage('geometry') as record:
+            elements = self._get_geometric_elements()
+            build_geometry(elements, self.walls, self.workers)
+            record['elements'] = len(elements) + len(self.walls)
+            record['workers'] = self.workers
+
+    def update_cache(self) -> None:
+        """Write the geometry that is already built to the geometry cache.
+
+        This method is called by to_honeybee and does nothing if the model does not
+        have a cache folder.
+        """
+        if self.cache is None:
+            return
+        items = []
+        for element in self._get_geometric_elements():
+            if element.has_polyface3d:
+                key = self._cache_key(element.element, self.settings)
+                if key not in self.cache:
+                    items.append((key, element.polyface3d))
+        settings = self._wall_settings()
+        for wall in self.walls:
+            if wall.has_face3ds:
+                key = self._cache_key(wall.wall, settings, 'IfcWall', self.merge_coplanar)
+                if key not in self.cache:
+                    items.append((key, wall.to_face3ds()))
+        self.cache.set_many(items)
+
+    def _convert(self, elements: list, convert: Callable) -> Iterator:
+        """Convert elements one by one and record the time of each element in the
+        profiler.
 
-    def to_hbjson(self, target_folder: str = '.', file_name: str = None) -> str:
+        Args:
+            elements: A list of Honeybee-IFC elements.
+            convert: A function that takes an element and returns a list of Honeybee
+                objects.
+        """
+        for element in elements:
+            with self.profiler.element(element.guid, element.ifc_element.is_a()):
+                objects = convert(element)
+            yield from objects
+
+    def _convert_in_pool(self, elements: list, from_dict: Callable) -> Iterator:
+        """Convert elements in a process pool and load the Honeybee objects in order.
+
+        The time of each element is not recorded in the profiler.
+
+        Args:
+            elements: A list of Honeybee-IFC elements.
+            from_dict: The from_dict method of the class of the Honeybee objects.
+        """
+        sub_faces, filled, _ = self._host()
+        for objects in convert_elements(elements, self.workers, sub_faces, filled):
+            for data in objects:
+                yield from_dict(data)
+
+    def _host(self) -> Tuple[Dict[str, Dict[int, list]], Dict[str, Dict[int, list]],
+                             Set[str]]:
+        """Host the windows and doors on the faces of the walls.
+
+        The result is computed once.
+
+        Returns:
+            A tuple with three items.
+
+            -   sub_faces: A dictionary of the hosted Honeybee Apertures and Doors
+                keyed by the GlobalId of the wall and the index of its face.
+
+            -   filled: A dictionary of the Face3Ds of the hosted Apertures and Doors
+                that also fill an opening of another face of their wall keyed by the
+                GlobalId of the wall and the index of that face. e.g. the other
+                side of the wall.
+
+            -   hosted: A set of the GlobalIds of the hosted windows and doors.
+        """
+        if self._hosting is not None:
+            return self._hosting
+        sub_faces, filled, hosted = {}, {}, set()
+        if not self.host_sub_faces:
+            self._hosting = sub_faces, filled, hosted
+            return self._hosting
+
+        with self.profiler.stage('hosting') as record:
+            face3ds, face_keys = [], []
+            for wall in self.walls:
+                for count, face3d in enumerate(wall.to_face3ds()):
+                    face3ds.append(face3d)
+                    face_keys.append((wall.guid, count))
+            elements = self.windows + self.doors
+            sub_face3ds = [element.moved_opening_face3d() for element in elements]
+            wall_guids = [guid for guid, _ in face_keys]
+            hosts = find_hosts(face3ds, sub_face3ds, wall_guids,
+                               [element.host_guid for element in elements])
+            others = find_filled_faces(face3ds, sub_face3ds, hosts, wall_guids)
+            for element, sub_face3d, host, faces in \
+                    zip(elements, sub_face3ds, hosts, others):
+                if host is None:
+                    continue
+                projected = project_sub_face(face3ds[host], sub_face3d)
+                if not can_fill_notch(face3ds[host], projected):
+                    logger.warning(
+                        '%s %s is not hosted. It fills a notch of wall %s that can not '
+                        'be added to the face.', type(element).__name__, element.guid,
+                        face_keys[host][0])
+                    continue
+                guid, count = face_keys[host]
+                sub_face = element.to_honeybee(projected)
+                sub_faces.setdefault(guid, {}).setdefault(count, []).append(sub_face)
+                hosted.add(element.guid)
+                for face in faces:
+                    guid, count = face_keys[face]
+                    projected = project_sub_face(face3ds[face], sub_face3d)
+                    if not can_fill_notch(face3ds[face], projected):
+                        logger.warning(
+                            '%s %s does not fill the opening of wall %s. It fills a '
+                            'notch that can not be added to the face.',
+                            type(element).__name__, element.guid, guid)
+                        continue
+                    filled.setdefault(guid, {}).setdefault(count, []).append(projected)
+            record.update(hosted=len(hosted), orphaned=len(elements) - len(hosted))
+
+        self._hosting = sub_faces, filled, hosted
+        return self._hosting
+
+    def _faces(self) -> Iterator['Face']:
+        """Yield Honeybee Faces for the walls and the slabs."""
+        sub_faces, filled, _ = self._host()
+        if self.workers > 1:
+            from honeybee.face import Face
+            yield from self._convert_in_pool(self.walls + self.slabs, Face.from_dict)
+            return
+        yield from self._convert(
+            self.walls, lambda wall: wall.to_honeybee(
+                sub_faces.get(wall.guid), filled.get(wall.guid)))
+        yield from self._convert(self.slabs, lambda slab: slab.to_honeybee())
+
+    def _apertures(self) -> Iterator['Aperture']:
+        """Yield Honeybee Apertures for the windows that are not hosted by a wall."""
+        _, _, hosted = self._host()
+        windows = [window for window in self.windows if window.guid not in hosted]
+        if self.workers > 1:
+            from honeybee.aperture import Aperture
+            return self._convert_in_pool(windows, Aperture.from_dict)
+        return self._convert(windows, lambda window: [window.to_honeybee()])
+
+    def _doors(self) -> Iterator['HBDoor']:
+        """Yield Honeybee Doors for the doors that are not hosted by a wall."""
+        _, _, hosted = self._host()
+        doors = [door for door in self.doors if door.guid not in hosted]
+        if self.workers > 1:
+            from honeybee.door import Door as HBDoor
+            return self._convert_in_pool(doors, HBDoor.from_dict)
+        return self._convert(doors, lambda door: [door.to_honeybee()])
+
+    def _shades(self) -> Iterator['HBShade']:
+        """Yield Honeybee Shades for the columns."""
+        if self.workers > 1:
+            from honeybee.shade import Shade as HBShade
+            return self._convert_in_pool(self.shades, HBShade.from_dict)
+        return self._convert(self.shades, lambda shade: shade.to_honeybee())
+
+    def _grid_data(self, size: float, offset: float,
+                   mesh: bool = True) -> Iterator[Tuple[Space, tuple]]:
+        """Yield the spaces and the arrays of their sensor grids.
+
+        The grids are calculated in a process pool if the model has more than one
+        worker. Otherwise, they are calculated one by one when they are used.
+        """
+        if self.workers > 1 and len(self.spaces) > 1:
+            yield from zip(self.spaces,
+                           build_grids(self.spaces, size, offset, self.workers, mesh))
+            return
+        for space in self.spaces:
+            yield space, None
+
+    def _grids(self) -> Iterator['SensorGrid']:
+        """Yield Honeybee-Radiance SensorGrids for the spaces.
+
+        Nothing is yielded if the config skips the sensor grids.
+        """
+        if not self.config.grids:
+            return iter(())
+        data = dict((space.guid, space_data) for space, space_data in
+                    self._grid_data(self.GRID_SIZE, self.GRID_OFFSET))
+
+        def convert(space):
+            grid = space.get_grids(self.GRID_OFFSET, self.GRID_SIZE, data[space.guid])
+            return [grid] if grid is not None else []
+
+        return self._convert(self.spaces, convert)
+
+    def to_honeybee(self) -> 'HBModel':
+        """Convert the model to a Honeybee Model."""
+        from honeybee.model import Model as HBModel
+
+        if self.workers > 1:
+            self._build_geometry()
+
+        with self.profiler.stage('honeybee conversion') as record:
+            faces, apertures = list(self._faces()), list(self._apertures())
+            doors, shades = list(self._doors()), list(self._shades())
+            hb_model = HBModel('Model', orphaned_faces=faces,
+                               orphaned_apertures=apertures, orphaned_doors=doors,
+                               orphaned_shades=shades)
+            record.update(faces=len(faces), apertures=len(apertures),
+                          doors=len(doors), shades=len(shades), workers=self.workers)
+
+        if self.config.grids:
+            with self.profiler.stage('grid generation') as record:
+                grids = list(self._grids())
+                hb_model.properties.radiance.add_sensor_grids(grids)
+                record['sensors'] = sum(len(grid.sensors) for grid in grids)
+        self.update_cache()
+
+        return hb_model
+
+    def to_hbjson(self, target_folder: str = '.', file_name: str = None,
+                  stream: bool = False, pipeline: bool = False) -> str:
         """Write the model to an HBJSON file.
 
         Args:
@@ -104,38 +667,121 @@ class Model:
                 Default to the current working directory.
             file_name: The name of the HBJSON file. Default to the name of the
                 IFC file.
+            stream: Set to True to write each Honeybee object to the file as soon as
+                it is created instead of creating a full Honeybee Model first. This
+                keeps the memory usage bounded for very large models. Default: False.
+            pipeline: Set to True to tessellate, convert and write the elements at
+                the same time in separate stages that are connected by bounded
+                queues. The objects are streamed to the file. Create the model with
+                lazy=True so the tessellation is also overlapped with the other
+                stages. The throughput of each stage is recorded in the profiler.
+                This doesn't support host_sub_faces. Default: False.
 
         Returns:
             Path to the written HBJSON file.
         """
+        if not file_name:
+            file_name = self.ifc_file_path.stem
 
-        faces = []
-        for wall in self.walls:
-            faces.extend(wall.to_honeybee())
+        if pipeline:
+            if not file_name.lower().endswith('.hbjson'):
+                file_name = f'{file_name}.hbjson'
+            return write_hbjson(self, pathlib.Path(target_folder, file_name))
 
-        apertures = [window.to_honeybee() for window in self.windows]
-        doors = [door.to_honeybee() for door in self.doors]
+        if stream:
+            return self._stream_hbjson(target_folder, file_name)
 
-        for slab in self.slabs:
-            faces.extend(slab.to_honeybee())
+        hb_model = self.to_honeybee()
 
-        shades = []
-        for shade in self.shades:
-            shades.extend(shade.to_honeybee())
+        with self.profiler.stage('serialization'):
+            path = hb_model.to_hbjson(name=file_name, folder=target_folder)
 
-        grids = []
-        for space in self.spaces:
-            grids.append(space.get_grids(size=0.3))
+        return path
 
-        hb_model = HBModel('Model', orphaned_faces=faces,
-                           orphaned_apertures=apertures, orphaned_doors=doors,
-                           orphaned_shades=shades)
+    def to_compact(self, target_folder: str = '.', file_name: str = None,
+                   compress: bool = True) -> str:
+        """Write the model to a compact file.
 
-        hb_model.properties.radiance.add_sensor_grids(grids)
+        The geometry is stored as packed float arrays with a small JSON header. See
+        the compact module for the format. Load the file with
+        honeybee_ifc.compact.load_compact.
+
+        Args:
+            target_folder: The folder where the file will be saved. Default to the
+                current working directory.
+            file_name: An optional name for the file. Default will be the name of the
+                IFC file.
+            compress: Set to False to write the file without compressing it.
+                Default: True.
 
+        Returns:
+            Path to the written file.
+        """
         if not file_name:
             file_name = self.ifc_file_path.stem
+        if not file_name.lower().endswith(COMPACT_EXTENSION):
+            file_name = f'{file_name}{COMPACT_EXTENSION}'
 
-        path = hb_model.to_hbjson(name=file_name, folder=target_folder)
+        hb_model = self.to_honeybee()
+
+        with self.profiler.stage('serialization'):
+            path = write_compact(
+                hb_model, pathlib.Path(target_folder, file_name), compress)
 
         return path
+
+    def to_pts(self, target_folder: str = '.', size: float = GRID_SIZE,
+               offset: float = GRID_OFFSET) -> List[str]:
+        """Write the sensor grids of the spaces to Radiance pts files.
+
+        The sensors are written straight from the arrays of positions and directions
+        without creating SensorGrid objects. There is one file per space that is named
+        after the identifier of its grid in the HBJSON file. e.g. Grid_<GlobalId>.pts.
+        Spaces without any sensors are skipped.
+
+        Args:
+            target_folder: The folder where the pts files will be saved. Default to
+                the current working directory.
+            size: Size of the grid cells. Default: 0.3.
+            offset: Distance between the floor and the sensors. Default: 0.75.
+
+        Returns:
+            A list of paths to the written pts files.
+        """
+        paths, sensors = [], 0
+        with self.profiler.stage('grid generation') as record:
+            for space, data in self._grid_data(size, offset, mesh=False):
+                with self.profiler.element(space.guid, space.element.is_a()):
+                    positions, directions, _, _ = \
+                        data or space.grid_data(offset, size, mesh=False)
+                    if not len(positions):
+                        continue
+                    sensors += len(positions)
+                    paths.append(write_pts(
+                        pathlib.Path(target_folder,
+                                     f'{guid_identifier("Grid", space.guid)}.pts'),
+                        positions, directions))
+            record.update(files=len(paths), sensors=sensors)
+        return paths
+
+    def _stream_hbjson(self, target_folder: str, file_name: str) -> str:
+        """Write the model to an HBJSON file one Honeybee object at a time."""
+        if self.workers > 1:
+            self._build_geometry()
+
+        if not file_name.lower().endswith('.hbjson'):
+            file_name = f'{file_name}.hbjson'
+        path = pathlib.Path(target_folder, file_name)
+
+        # conversion and serialization are interleaved when the objects are streamed
+        with self.profiler.stage('serialization') as record, \
+                HBJSONWriter(path) as writer:
+            writer.write_section('orphaned_faces', self._faces())
+            writer.write_section('orphaned_apertures', self._apertures())
+            writer.write_section('orphaned_doors', self._doors())
+            writer.write_section('orphaned_shades', self._shades())
+            writer.write_sensor_grids(self._grids())
+            record['objects'] = writer.count
+        self.update_cache()
+
+        return str(path)
@@ -1,5 +1,6 @@
 """Honeybee-IFC Opening object."""
 
+from typing import Dict
 
 import ifcopenshell
 from ifcopenshell.entity_instance import entity_instance as IfcElement
@@ -12,9 +13,33 @@ class Opening(Element):
     Args:
         opening: An IfcOpeningElement object.
         settings: An ifcopenshell.geom.settings object.
+        shape: An optional shape generated by ifcopenshell.geom. Default: None.
     """
 
-    def __init__(self, opening: IfcElement,  settings: ifcopenshell.geom.settings = None):
-        super().__init__(opening, settings)
-        self.opening = opening
-        self.settings = settings or self._settings()
+    __slots__ = ()
+
+    def __init__(self, opening: IfcElement,  settings: ifcopenshell.geom.settings = None,
+                 shape=None):
+        super().__init__(opening, settings, shape)
+
+    @property
+    def opening(self) -> IfcElement:
+        """Original IfcOpeningElement."""
+        return self.element
+
+    @classmethod
+    def from_cache(cls, opening: IfcElement, cache: Dict[str, 'Opening'],
+                   settings: ifcopenshell.geom.settings = None) -> 'Opening':
+        """Get an Opening from a cache of Openings keyed by GlobalId.
+
+        The Opening is created and added to the cache if it is not already there.
+
+        Args:
+            opening: An IfcOpeningElement object.
+            cache: A dictionary of Opening objects with GlobalId as keys.
+            settings: An ifcopenshell.geom.settings object.
+        """
+        guid = opening.GlobalId
+        if guid not in cache:
+            cache[guid] = cls(opening, settings)
+        return cache[guid]
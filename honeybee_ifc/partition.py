@@ -0,0 +1,271 @@
+"""Convert a large IFC file one building storey at a time.
+
+The elements of each IfcBuildingStorey are found from the spatial containment and
+the decomposition of the storey. Each storey is converted with its own Model and
+written to its own HBJSON file so only the geometry of one storey is kept in memory
+at a time. The HBJSON files of the storeys can be merged into one HBJSON file which
+is written one object at a time.
+"""
+
+import contextlib
+import json
+import pathlib
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+import ifcopenshell
+from ifcopenshell.entity_instance import entity_instance as IfcElement
+
+from .cache import file_hash
+from .config import ConversionConfig
+from .model import Model
+from .writer import HBJSONWriter, SECTIONS
+
+# name of the partition for the elements that are not in any storey
+UNASSIGNED = 'Unassigned'
+
+
+def _decomposition(entity: IfcElement) -> Iterator[IfcElement]:
+    """Yield the objects that an entity is decomposed into and their own parts."""
+    for rel in getattr(entity, 'IsDecomposedBy', None) or ():
+        for obj in rel.RelatedObjects:
+            yield obj
+            yield from _decomposition(obj)
+
+
+def _contained_elements(structure: IfcElement) -> Iterator[IfcElement]:
+    """Yield all the elements in a spatial structure element. e.g. a storey.
+
+    This includes the elements that are contained in the structure, their parts and
+    the spatial elements that the structure is decomposed into with their contents.
+    e.g. the spaces of a storey.
+    """
+    for rel in getattr(structure, 'ContainsElements', None) or ():
+        for element in rel.RelatedElements:
+            yield element
+            yield from _decomposition(element)
+    for rel in getattr(structure, 'IsDecomposedBy', None) or ():
+        for obj in rel.RelatedObjects:
+            yield obj
+            if obj.is_a('IfcSpatialStructureElement'):
+                yield from _contained_elements(obj)
+            else:
+                yield from _decomposition(obj)
+
+
+def _is_top_storey(storey: IfcElement) -> bool:
+    """Whether a storey is not a part of another storey."""
+    for rel in storey.Decomposes or ():
+        if rel.RelatingObject.is_a('IfcBuildingStorey'):
+            return False
+    return True
+
+
+def storey_partitions(ifc_file: ifcopenshell.file,
+                      config: Union[str, dict, ConversionConfig] = 'full') \
+        -> List[Tuple[str, List[str]]]:
+    """Get the GlobalIds of the elements of each building storey.
+
+    The storeys are sorted by their elevation. The elements that the config selects
+    but are not in any storey are added to a last partition called Unassigned.
+    Storeys without any elements are skipped.
+
+    Args:
+        ifc_file: An ifcopenshell file.
+        config: The config of the conversion. See ConversionConfig. Default: full.
+
+    Returns:
+        A list of tuples with the name of each storey and a list of the GlobalIds of
+        its elements. The name is the GlobalId of the storey if it has no name.
+    """
+    selected = Model.select_elements(ifc_file, ConversionConfig.from_value(config))
+    return _partitions(ifc_file, selected)
+
+
+def _partitions(ifc_file: ifcopenshell.file, selected: Dict[str, List[IfcElement]]) \
+        -> List[Tuple[str, List[str]]]:
+    """Same as storey_partitions with the output of Model.select_elements."""
+    storeys = [storey for storey in ifc_file.by_type('IfcBuildingStorey')
+               if _is_top_storey(storey)]
+    storeys.sort(key=lambda storey: storey.Elevation or 0)
+
+    partitions, assigned = [], set()
+    for storey in storeys:
+        guids = []
+        for element in _contained_elements(storey):
+            if element.GlobalId not in assigned:
+                assigned.add(element.GlobalId)
+                guids.append(element.GlobalId)
+        if guids:
+            partitions.append((storey.Name or storey.GlobalId, guids))
+
+    unassigned = []
+    for elements in selected.values():
+        for element in elements:
+            if element.GlobalId not in assigned:
+                assigned.add(element.GlobalId)
+                unassigned.append(element.GlobalId)
+    if unassigned:
+        partitions.append((UNASSIGNED, unassigned))
+    return partitions
+
+
+def _file_name(stem: str, count: int, name: str) -> str:
+    return f'{stem}_{count:03d}_{re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_")}'
+
+
+def _selections(selected: Dict[str, List[IfcElement]],
+                partitions: List[Tuple[str, List[str]]]) -> List[Dict[str, List[str]]]:
+    """Get the GlobalIds of the selected elements of each kind for each partition.
+
+    Args:
+        selected: The output of Model.select_elements for the whole file.
+        partitions: The output of storey_partitions.
+    """
+    partition_ids = {guid: count for count, (_, guids) in enumerate(partitions)
+                     for guid in guids}
+    selections = [{kind: [] for kind in selected} for _ in partitions]
+    for kind, elements in selected.items():
+        for element in elements:
+            count = partition_ids.get(element.GlobalId)
+            if count is not None:
+                selections[count][kind].append(element.GlobalId)
+    return selections
+
+
+def _balance(tasks: List[tuple], sizes: List[int], count: int) -> List[List[tuple]]:
+    """Split the tasks into groups with a similar total size starting from the
+    largest task."""
+    groups, totals = [[] for _ in range(count)], [0] * count
+    for size, task in sorted(zip(sizes, tasks), key=lambda item: -item[0]):
+        index = totals.index(min(totals))
+        groups[index].append(task)
+        totals[index] += size
+    return [group for group in groups if group]
+
+
+def _convert_partitions(ifc_file_path: str, tasks: List[tuple], kwargs: dict,
+                        ifc_file: ifcopenshell.file = None) -> List[Tuple[int, str]]:
+    """Convert several partitions of an IFC file that is only parsed once.
+
+    Args:
+        ifc_file_path: Path to the IFC file.
+        tasks: A list of tuples with the order of the partition, its selection, the
+            target folder and the file name.
+        kwargs: Other arguments for the Model of each partition.
+        ifc_file: The opened IFC file. Default: None which opens the file.
+
+    Returns:
+        A list of tuples with the order of each partition and the path to its HBJSON.
+    """
+    ifc_file = ifc_file or ifcopenshell.open(ifc_file_path)
+    paths = []
+    for count, selection, target_folder, file_name in tasks:
+        model = Model(ifc_file_path, ifc_file=ifc_file, selection=selection, **kwargs)
+        paths.append((count, model.to_hbjson(target_folder, file_name, stream=True)))
+    return paths
+
+
+def _section_objects(data: dict, section: str) -> List[dict]:
+    """Get the objects of a section of an HBJSON dictionary."""
+    if section == 'sensor_grids':
+        return data['properties'].get('radiance', {}).get('sensor_grids', [])
+    return data.get(section, [])
+
+
+def _spooled_objects(spool) -> Iterator[str]:
+    """Yield the JSON string of each object of a spool file."""
+    spool.seek(0)
+    for line in spool:
+        yield line.rstrip('\n')
+
+
+def merge_hbjsons(paths: Sequence[str], target_path: str,
+                  identifier: str = 'Model') -> str:
+    """Merge HBJSON files with orphaned objects into one HBJSON file.
+
+    Each HBJSON file is loaded once and only one of them is loaded at a time. The
+    objects of each section are spooled to a temporary file as JSON lines and the
+    spooled objects are written to the target file one section at a time.
+
+    Args:
+        paths: A list of paths to HBJSON files.
+        target_path: Path to the merged HBJSON file.
+        identifier: Identifier of the merged Honeybee Model. Default: Model.
+
+    Returns:
+        Path to the merged HBJSON file.
+    """
+    sections = SECTIONS + ('sensor_grids',)
+    with tempfile.TemporaryDirectory() as folder, contextlib.ExitStack() as stack:
+        spools = {section: stack.enter_context(
+            open(pathlib.Path(folder, f'{section}.jsonl'), 'w+')) for section in sections}
+        for path in paths:
+            with open(path) as f:
+                data = json.load(f)
+            for section, spool in spools.items():
+                for obj in _section_objects(data, section):
+                    spool.write(json.dumps(obj))
+                    spool.write('\n')
+            del data
+        with HBJSONWriter(target_path, identifier) as writer:
+            for section in SECTIONS:
+                writer.write_section(section, _spooled_objects(spools[section]))
+            writer.write_sensor_grids(_spooled_objects(spools['sensor_grids']))
+    return str(target_path)
+
+
+def convert_storeys(ifc_file_path: str, target_folder: str = '.', merge: bool = False,
+                    workers: int = 1, **kwargs) -> List[str]:
+    """Convert an IFC file to HBJSON one building storey at a time.
+
+    Args:
+        ifc_file_path: Path to the IFC file.
+        target_folder: The folder where the HBJSON files will be saved. Default to
+            the current working directory.
+        merge: Set to True to merge the storeys into one HBJSON file that is named
+            after the IFC file. Otherwise, there is one HBJSON file per storey that
+            is named after the IFC file, the order and the name of the storey.
+            Default: False.
+        workers: Number of processes to convert the storeys in parallel. The storeys
+            are split between the processes by their number of elements and each
+            process parses the IFC file once. Default: 1.
+        kwargs: Other arguments for the Model of each storey. e.g. merge_coplanar.
+
+    Returns:
+        A list of paths to the HBJSON files of the storeys or a list with the path
+        to the merged HBJSON file.
+    """
+    ifc_file_path = str(ifc_file_path)
+    stem = pathlib.Path(ifc_file_path).stem
+    ifc_file = ifcopenshell.open(ifc_file_path)
+    # the config is evaluated once for the whole file
+    selected = Model.select_elements(
+        ifc_file, ConversionConfig.from_value(kwargs.get('config', 'full')))
+    partitions = _partitions(ifc_file, selected)
+    selections = _selections(selected, partitions)
+    if kwargs.get('cache_folder') and not kwargs.get('ifc_hash'):
+        kwargs['ifc_hash'] = file_hash(ifc_file_path)
+    with tempfile.TemporaryDirectory() as temp_folder:
+        folder = temp_folder if merge else target_folder
+        tasks = [(count, selection, folder, _file_name(stem, count, name))
+                 for count, ((name, _), selection) in
+                 enumerate(zip(partitions, selections))]
+        if workers > 1 and len(tasks) > 1:
+            # each worker parses its own copy of the file once for all its storeys
+            sizes = [sum(len(guids) for guids in selection.values())
+                     for selection in selections]
+            groups = _balance(tasks, sizes, workers)
+            with ProcessPoolExecutor(len(groups)) as executor:
+                futures = [executor.submit(_convert_partitions, ifc_file_path, group,
+                                           kwargs) for group in groups]
+                results = [item for future in futures for item in future.result()]
+        else:
+            results = _convert_partitions(ifc_file_path, tasks, kwargs, ifc_file)
+        paths = [path for _, path in sorted(results)]
+
+        if not merge:
+            return paths
+        return [merge_hbjsons(paths, pathlib.Path(target_folder, f'{stem}.hbjson'))]
@@ -0,0 +1,377 @@
+"""Write a model to HBJSON with overlapped tessellation, conversion and serialization.
+
+The stages run at the same time and pass the elements to each other through bounded
+queues. A stage waits when the queue after it is full which keeps the memory bounded.
+
+1.  tessellation: A process opens its own copy of the IFC file and runs
+    ifcopenshell.geom.iterator over the elements that don't have their geometry yet.
+    A thread keeps the geometry of each shape for its element. An ifcopenshell file
+    is not thread-safe so only the main thread reads the file of the model.
+
+2.  conversion: The main thread builds the Polyface3D or the Face3Ds of each element,
+    in a process pool if the model has more than one worker, and converts it to
+    Honeybee objects.
+
+3.  serialization: A thread writes the Honeybee objects to the HBJSON file.
+
+The elements are tessellated in the order of the sections of the HBJSON file so each
+section can be written as soon as its objects are converted.
+"""
+
+import multiprocessing
+import pathlib
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Tuple, TYPE_CHECKING
+
+import ifcopenshell
+
+from ._helper import get_shape_data, iterate_shapes
+from ._parallel import _polyface3d_from_data, _wall_face3ds_from_data
+from .wall import Wall
+from .writer import HBJSONWriter, SECTIONS
+
+if TYPE_CHECKING:
+    from .model import Model
+
+# kinds of elements in the order they are tessellated with their section in the
+# HBJSON file. The openings are only needed for the geometry of windows and doors.
+KINDS = (('walls', 'orphaned_faces'), ('slabs', 'orphaned_faces'), ('openings', None),
+         ('windows', 'orphaned_apertures'), ('doors', 'orphaned_doors'),
+         ('shades', 'orphaned_shades'), ('spaces', 'sensor_grids'))
+
+_DONE = object()
+
+
+class _Stopped(Exception):
+    """Raised in a stage when another stage has failed."""
+
+
+class _Stage:
+    """Pass items between the stages and measure how long a stage waits for them.
+
+    Args:
+        stop: An event that is set when any stage fails.
+    """
+
+    def __init__(self, stop: threading.Event) -> None:
+        self.stop = stop
+        self.items = 0
+        self.waiting = 0.0
+
+    def get(self, source: queue.Queue, process: multiprocessing.Process = None):
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    if self.stop.is_set():
+                        raise _Stopped()
+                    if process is not None and not process.is_alive():
+                        # the last items can arrive after the process has exited
+                        try:
+                            return source.get(timeout=0.1)
+                        except queue.Empty:
+                            raise RuntimeError(
+                                'The tessellation process exited with code '
+                                f'{process.exitcode} before it finished.') from None
+        finally:
+            self.waiting += time.perf_counter() - start
+
+    def put(self, target: queue.Queue, item) -> None:
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    target.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    if self.stop.is_set():
+                        raise _Stopped()
+        finally:
+            self.waiting += time.perf_counter() - start
+
+    def report(self, record: dict, seconds: float) -> None:
+        """Add the throughput of the stage to a record of the profiler."""
+        record['items'] = self.items
+        record['waiting_seconds'] = round(self.waiting, 4)
+        record['busy_seconds'] = round(max(seconds - self.waiting, 0), 4)
+        record['items_per_second'] = round(self.items / seconds, 2) if seconds else None
+
+
+def _has_geometry(obj) -> bool:
+    if isinstance(obj, Wall):
+        return obj.has_face3ds or obj.has_shape_data
+    return obj.has_polyface3d or obj.has_shape_data or obj.is_instance
+
+
+def _plan(model: 'Model') -> List[Tuple[str, list, Dict[str, object], list]]:
+    """Split the objects of each kind in the order of KINDS.
+
+    This reads the IFC file so it must run before the threads start.
+
+    Returns:
+        A list of (kind, objects that are queued first, objects to tessellate by
+        their GlobalId, objects that are queued last). The objects that are queued
+        last are the instances, which are converted after their prototypes.
+    """
+    objects = {
+        'walls': model.walls, 'slabs': model.slabs, 'openings': model._get_openings(),
+        'windows': model.windows, 'doors': model.doors, 'shades': model.shades,
+        'spaces': model.spaces if model.config.grids else []
+    }
+    plan = []
+    for kind, _ in KINDS:
+        pending = {obj.guid: obj for obj in objects[kind] if not _has_geometry(obj)}
+        instances = [obj for obj in objects[kind] if not isinstance(obj, Wall) and
+                     obj.is_instance and not obj.has_polyface3d]
+        later = set(pending) | {obj.guid for obj in instances}
+        ready = [obj for obj in objects[kind] if obj.guid not in later]
+        plan.append((kind, ready, pending, instances))
+    return plan
+
+
+def _converters(model: 'Model') -> Dict[str, Callable]:
+    return {
+        'walls': lambda wall: wall.to_honeybee(),
+        'slabs': lambda slab: slab.to_honeybee(),
+        'openings': lambda opening: [],
+        'windows': lambda window: [window.to_honeybee()],
+        'doors': lambda door: [door.to_honeybee()],
+        'shades': lambda shade: shade.to_honeybee(),
+        'spaces': lambda space: [
+            grid for grid in [space.get_grids(model.GRID_OFFSET, model.GRID_SIZE)]
+            if grid is not None]
+    }
+
+
+def _tessellate_file(ifc_file_path: str, backend: str, threads: int,
+                     groups: List[Tuple[str, List[str]]],
+                     target: multiprocessing.Queue) -> None:
+    """Tessellate groups of elements of an IFC file in a separate process.
+
+    The GlobalId and the shape data of each element are queued. None is queued after
+    each group and an error is queued if the tessellation fails.
+
+    Args:
+        ifc_file_path: Path to the IFC file.
+        backend: The geometry backend of the model.
+        threads: Number of threads of ifcopenshell.geom.iterator.
+        groups: A list of (kind, GlobalIds of the elements to tessellate).
+        target: A queue for the shape data.
+    """
+    from .model import Model
+
+    try:
+        ifc_file = ifcopenshell.open(ifc_file_path)
+        for kind, guids in groups:
+            settings = Model._wall_settings() if kind == 'walls' \
+                else Model._ifc_settings(backend)
+            elements = [ifc_file.by_guid(guid) for guid in guids]
+            for shape in iterate_shapes(ifc_file, settings, threads, elements):
+                target.put((shape.guid, get_shape_data(None, settings, shape)))
+            target.put(None)
+    except BaseException as error:
+        target.put(error)
+
+
+def _tessellate(plan: list, process: multiprocessing.Process,
+                shapes: multiprocessing.Queue, stage: _Stage,
+                target: queue.Queue) -> None:
+    """Queue the objects in the order of KINDS with the geometry from the
+    tessellation process. This thread doesn't read the IFC file."""
+    for kind, ready, pending, instances in plan:
+        for obj in ready:
+            stage.put(target, (kind, obj))
+            stage.items += 1
+        if pending:
+            pending = dict(pending)
+            while True:
+                item = stage.get(shapes, process)
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                guid, data = item
+                obj = pending.pop(guid, None)
+                if obj is None:
+                    continue
+                obj.set_shape_data(data)
+                stage.put(target, (kind, obj))
+                stage.items += 1
+        # the elements that are not in the iterator are tessellated when converted
+        # and the instances are converted after their prototypes
+        for obj in list(pending.values()) + instances:
+            stage.put(target, (kind, obj))
+            stage.items += 1
+    stage.put(target, _DONE)
+
+
+def _serialize(path: pathlib.Path, stage: _Stage, source: queue.Queue) -> str:
+    """Write the Honeybee objects from a queue to an HBJSON file."""
+    item = stage.get(source)
+
+    def objects(section: str) -> Iterator:
+        nonlocal item
+        while item is not _DONE and item[0] == section:
+            yield item[1]
+            stage.items += 1
+            item = stage.get(source)
+
+    with HBJSONWriter(path) as writer:
+        for section in SECTIONS:
+            writer.write_section(section, objects(section))
+        writer.write_sensor_grids(objects('sensor_grids'))
+        if item is not _DONE:
+            raise ValueError(f'{item[0]} objects are out of order.')
+    return str(path)
+
+
+def _convert(model: 'Model', stage: _Stage, source: queue.Queue,
+             target: queue.Queue, queue_size: int) -> None:
+    """Build the geometry of the elements from a queue, convert them to Honeybee
+    objects and queue the objects with their section."""
+    sections = dict(KINDS)
+    converters = _converters(model)
+    executor = ProcessPoolExecutor(model.workers) if model.workers > 1 else None
+    in_flight = deque()
+
+    def finish():
+        kind, obj, future = in_flight.popleft()
+        if future is not None:
+            if isinstance(obj, Wall):
+                obj.set_face3ds(future.result())
+            else:
+                obj.set_polyface3d(future.result())
+        with model.profiler.element(obj.guid, obj.ifc_element.is_a()):
+            hb_objects = converters[kind](obj)
+        for hb_object in hb_objects:
+            stage.put(target, (sections[kind], hb_object))
+        stage.items += 1
+
+    try:
+        while True:
+            item = stage.get(source)
+            if item is _DONE:
+                break
+            kind, obj = item
+            future = None
+            if executor is not None and obj.has_shape_data:
+                if isinstance(obj, Wall):
+                    future = executor.submit(
+                        _wall_face3ds_from_data, (obj.shape_data(), obj.merge_coplanar))
+                else:
+                    future = executor.submit(_polyface3d_from_data, obj.shape_data())
+            in_flight.append((kind, obj, future))
+            # convert the elements in order as soon as their geometry is ready
+            while in_flight and (len(in_flight) > queue_size or in_flight[0][2] is None
+                                 or in_flight[0][2].done()):
+                finish()
+        while in_flight:
+            finish()
+        stage.put(target, _DONE)
+    finally:
+        if executor is not None:
+            for _, _, future in in_flight:
+                if future is not None:
+                    future.cancel()
+            executor.shutdown()
+
+
+def _run(name: str, model: 'Model', function: Callable, stage: _Stage, *args,
+         errors: list) -> None:
+    """Run a stage and record its throughput. Errors are added to a list and stop
+    the other stages."""
+    try:
+        with model.profiler.stage(name) as record:
+            start = time.perf_counter()
+            try:
+                function(*args)
+            finally:
+                stage.report(record, time.perf_counter() - start)
+    except _Stopped:
+        pass
+    except BaseException as error:
+        errors.append(error)
+        stage.stop.set()
+
+
+def write_hbjson(model: 'Model', path: str, queue_size: int = 256) -> str:
+    """Write a model to an HBJSON file with overlapped stages.
+
+    See the module docstring for the stages. The throughput of each stage is recorded
+    in the profiler of the model as tessellation, conversion and serialization.
+
+    Args:
+        model: A Honeybee-IFC Model. Create the model with lazy=True so the
+            tessellation is overlapped with the other stages too. The tessellation
+            process opens the IFC file from model.ifc_file_path.
+        path: Path to the HBJSON file.
+        queue_size: Maximum number of elements and Honeybee objects that wait
+            between two stages. Default: 256.
+
+    Returns:
+        Path to the written HBJSON file.
+    """
+    if model.host_sub_faces:
+        raise ValueError('The pipeline does not support host_sub_faces.')
+
+    stop = threading.Event()
+    errors = []
+    elements, hb_objects = queue.Queue(queue_size), queue.Queue(queue_size)
+    tessellation, conversion, serialization = _Stage(stop), _Stage(stop), _Stage(stop)
+    # read the IFC file before the threads start
+    plan = _plan(model)
+    groups = [(kind, list(pending)) for kind, _, pending, _ in plan if pending]
+    shapes = multiprocessing.Queue(queue_size)
+    process = multiprocessing.Process(
+        target=_tessellate_file,
+        args=(str(model.ifc_file_path), model.backend, model.threads, groups, shapes)
+    ) if groups else None
+    threads = [
+        threading.Thread(
+            target=_run, args=('tessellation', model, _tessellate, tessellation, plan,
+                               process, shapes, tessellation, elements),
+            kwargs={'errors': errors}, daemon=True),
+        threading.Thread(
+            target=_run, args=('serialization', model, _serialize, serialization,
+                               pathlib.Path(path), serialization, hb_objects),
+            kwargs={'errors': errors}, daemon=True)
+    ]
+
+    with model.profiler.stage('pipeline') as total:
+        if process is not None:
+            process.start()
+        try:
+            for thread in threads:
+                thread.start()
+            _run('conversion', model, _convert, conversion, model, conversion,
+                 elements, hb_objects, queue_size, errors=errors)
+            for thread in threads:
+                thread.join()
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            if process is not None:
+                # the process waits on the full queue if a stage has stopped
+                if stop.is_set():
+                    process.terminate()
+                process.join()
+        total['items'] = conversion.items
+        # more than the seconds of the pipeline when the stages overlap
+        total['busy_seconds'] = round(sum(
+            model.profiler.stages.get(name, {}).get('busy_seconds', 0)
+            for name in ('tessellation', 'conversion', 'serialization')), 4)
+
+    if errors:
+        raise errors[0]
+    if stop.is_set():
+        raise RuntimeError('The pipeline stopped before the file was written.')
+    model.update_cache()
+    return str(path)
+
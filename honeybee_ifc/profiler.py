@@ -0,0 +1,197 @@
+"""Honeybee-IFC Profiler to measure the stages of a conversion."""
+
+import heapq
+import json
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# tracemalloc is process-wide. The first stage that traces memory starts it and the
+# last one stops it so stages can run in several threads at the same time.
+_tracing_lock = threading.Lock()
+_tracing_stages = 0
+_started_tracing = False
+
+
+def _start_tracing() -> None:
+    global _tracing_stages, _started_tracing
+    with _tracing_lock:
+        if not _tracing_stages:
+            # don't stop tracing that was started by someone else
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+        _tracing_stages += 1
+
+
+def _stop_tracing() -> float:
+    """Stop tracing for a stage and get the peak traced memory in MB."""
+    global _tracing_stages
+    with _tracing_lock:
+        peak = tracemalloc.get_traced_memory()[1]
+        _tracing_stages -= 1
+        if not _tracing_stages and _started_tracing:
+            tracemalloc.stop()
+    return round(peak / 1024 ** 2, 2)
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident memory since the start of the process in MB or None if it is not
+    available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return round(peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024, 2)
+
+
+class Profiler:
+    """Honeybee-IFC Profiler.
+
+    Record wall time, CPU time, counts and peak memory for each stage of a conversion
+    and the time for each IFC element. When the profiler is not enabled all the
+    methods do nothing so it can always be used in the code.
+
+    The peak resident memory is a peak of the whole process. Each stage records the
+    process peak when it finishes as process_peak_rss_mb and how much the stage
+    raised it as peak_rss_increase_mb. A stage that stays below the peak of an
+    earlier stage has an increase of 0.
+
+    The stages and the elements can be measured from several threads at the same
+    time. e.g. the stages of the pipeline. The traced memory is then shared by the
+    stages that overlap and the hooks are called from each thread.
+
+    Args:
+        enabled: Set to False to disable the profiler. Default: True.
+        trace_memory: Set to True to also record the peak memory that is allocated
+            by Python in each stage using tracemalloc. This makes the conversion
+            slower. The peak resident memory of the process is always recorded.
+            Default: False.
+        slowest: Number of the slowest elements to keep. Default: 10.
+        hooks: An optional list of functions that are called with the name of the
+            event (stage or element) and a dictionary of the recorded values each
+            time a stage or an element is finished. Default: None.
+    """
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = False,
+                 slowest: int = 10, hooks: List[Callable[[str, dict], None]] = None):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.slowest = slowest
+        self.hooks = list(hooks or [])
+        self.stages: Dict[str, dict] = {}
+        self.element_types: Dict[str, dict] = {}
+        self._slowest_elements = []
+        self._lock = threading.Lock()
+
+    def _emit(self, event: str, data: dict) -> None:
+        for hook in self.hooks:
+            hook(event, data)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure a stage of the conversion.
+
+        The context manager yields a dictionary which can be used to record other
+        values for the stage. e.g. the number of elements.
+
+        Args:
+            name: Name of the stage.
+        """
+        record = {}
+        if not self.enabled:
+            yield record
+            return
+
+        if self.trace_memory:
+            _start_tracing()
+        start, cpu_start = time.perf_counter(), time.process_time()
+        peak_start = _peak_rss_mb()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - start, 4)
+            record['cpu_seconds'] = round(time.process_time() - cpu_start, 4)
+            peak = _peak_rss_mb()
+            record['process_peak_rss_mb'] = peak
+            record['peak_rss_increase_mb'] = \
+                None if peak is None else round(peak - peak_start, 2)
+            if self.trace_memory:
+                record['peak_traced_mb'] = _stop_tracing()
+            with self._lock:
+                self.stages[name] = record
+            logger.info('%s finished in %.3f seconds. %s', name, record['seconds'],
+                        {k: v for k, v in record.items() if k not in ('seconds',)})
+            self._emit('stage', dict(record, name=name))
+
+    @contextmanager
+    def element(self, guid: str, ifc_type: str):
+        """Measure the time that is spent on one IFC element.
+
+        Args:
+            guid: GlobalId of the element.
+            ifc_type: IFC class of the element. e.g. IfcWindow.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                record = self.element_types.setdefault(
+                    ifc_type, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+                record['count'] += 1
+                record['seconds'] += seconds
+                record['max_seconds'] = max(record['max_seconds'], seconds)
+
+                item = (seconds, guid, ifc_type)
+                if len(self._slowest_elements) < self.slowest:
+                    heapq.heappush(self._slowest_elements, item)
+                elif self.slowest:
+                    heapq.heappushpop(self._slowest_elements, item)
+
+            logger.debug('%s %s took %.4f seconds.', ifc_type, guid, seconds)
+            self._emit('element', {'guid': guid, 'type': ifc_type, 'seconds': seconds})
+
+    @property
+    def slowest_elements(self) -> List[dict]:
+        """The slowest elements sorted from the slowest."""
+        with self._lock:
+            elements = sorted(self._slowest_elements, reverse=True)
+        return [{'guid': guid, 'type': ifc_type, 'seconds': round(seconds, 4)}
+                for seconds, guid, ifc_type in elements]
+
+    def to_dict(self) -> dict:
+        """Get the recorded values as a dictionary."""
+        return {
+            'stages': self.stages,
+            'element_types': {
+                ifc_type: {key: round(value, 4) if isinstance(value, float) else value
+                           for key, value in record.items()}
+                for ifc_type, record in self.element_types.items()},
+            'slowest_elements': self.slowest_elements
+        }
+
+    def to_json(self, path: str = None, indent: int = 4) -> str:
+        """Get the recorded values as a JSON string and optionally write it to a file.
+        """
+        report = json.dumps(self.to_dict(), indent=indent)
+        if path:
+            with open(path, 'w') as f:
+                f.write(report)
+        return report
@@ -3,9 +3,13 @@
 
 import ifcopenshell
 from ifcopenshell.entity_instance import entity_instance as IfcElement
-from honeybee.shade import Shade as HBShade
-from honeybee.typing import clean_and_id_string
+from typing import List, TYPE_CHECKING
+from ladybug_geometry.geometry3d import Polyface3D
 from .element import Element
+from ._helper import guid_identifier
+
+if TYPE_CHECKING:
+    from honeybee.shade import Shade as HBShade
 
 
 class Shade(Element):
@@ -14,14 +18,27 @@ class Shade(Element):
     Args:
         shade: Any Ifc object that needs to be converted to shade.
         settings: An ifcopenshell.geom.settings object.
+        shape: An optional shape generated by ifcopenshell.geom. Default: None.
     """
 
-    def __init__(self, shade: IfcElement,  settings: ifcopenshell.geom.settings = None):
-        super().__init__(shade, settings)
-        self.shade = shade
-        self.settings = settings or self._settings()
+    __slots__ = ()
+
+    def __init__(self, shade: IfcElement,  settings: ifcopenshell.geom.settings = None,
+                 shape=None):
+        super().__init__(shade, settings, shape)
+
+    @property
+    def shade(self) -> IfcElement:
+        """Original IFC element."""
+        return self.element
 
     def to_honeybee(self):
         """Convert IFC object to Honeybee shade."""
-        return [HBShade(clean_and_id_string('Shade'), face)
-                for face in self.polyface3d.faces]
+        return self.shades_from_polyface3d(self.guid, self.polyface3d)
+
+    @staticmethod
+    def shades_from_polyface3d(guid: str, polyface3d: Polyface3D) -> List['HBShade']:
+        """Get a list of Honeybee Shade objects for an element from its Polyface3D."""
+        from honeybee.shade import Shade as HBShade
+        return [HBShade(guid_identifier('Shade', guid, count), face)
+                for count, face in enumerate(polyface3d.faces)]
@@ -2,10 +2,13 @@
 
 import ifcopenshell
 from ifcopenshell.entity_instance import entity_instance as IfcElement
-from honeybee.face import Face as Face
-from honeybee.typing import clean_and_id_string
+from ladybug_geometry.geometry3d import Polyface3D
 from .element import Element
-from typing import List
+from ._helper import guid_identifier
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from honeybee.face import Face
 
 
 class Slab(Element):
@@ -14,16 +17,29 @@ class Slab(Element):
     Args:
         slab: An IFC object.
         settings: An IFC settings object.
+        shape: An optional shape generated by ifcopenshell.geom. Default: None.
     """
 
+    __slots__ = ('predefined_type',)
+
     def __init__(self, slab: IfcElement, predefined_type: str,
-                 settings: ifcopenshell.geom.settings = None) -> None:
-        super().__init__(slab, settings)
-        self.slab = slab
+                 settings: ifcopenshell.geom.settings = None, shape=None) -> None:
+        super().__init__(slab, settings, shape)
         self.predefined_type = predefined_type
-        self.settings = settings or self._settings()
 
-    def to_honeybee(self) -> List[Face]:
+    @property
+    def slab(self) -> IfcElement:
+        """Original IFC slab."""
+        return self.element
+
+    def to_honeybee(self) -> List['Face']:
         """Get a list of Honeybee Face objects for the wall."""
-        return [Face(clean_and_id_string('Face'), face.flip()) for
-                face in self.polyface3d.faces]
+        return self.faces_from_polyface3d(self.guid, self.polyface3d)
+
+    @staticmethod
+    def faces_from_polyface3d(guid: str, polyface3d: Polyface3D) -> List['Face']:
+        """Get a list of Honeybee Face objects for a slab from its Polyface3D."""
+        from honeybee.face import Face
+
+        return [Face(guid_identifier('Face', guid, count), face.flip()) for
+                count, face in enumerate(polyface3d.faces)]
@@ -1,11 +1,16 @@
 """Honeybee-IFC Space object."""
 
 import ifcopenshell
-from typing import List
+import numpy as np
+from typing import List, Tuple, TYPE_CHECKING
 from ifcopenshell.entity_instance import entity_instance as IfcElement
-from honeybee_radiance.sensorgrid import SensorGrid
-from honeybee.typing import clean_and_id_string
+from ladybug_geometry.geometry3d import Face3D, Mesh3D, Point3D
 from .element import Element
+from .grid import is_floor, faces_grid
+from ._helper import guid_identifier
+
+if TYPE_CHECKING:
+    from honeybee_radiance.sensorgrid import SensorGrid
 
 
 class Space(Element):
@@ -14,21 +19,61 @@ class Space(Element):
     Args:
         space: IfcElement object.
         settings: ifcopenshell.geom.settings object.
+        shape: An optional shape generated by ifcopenshell.geom. Default: None.
     """
 
-    def __init__(self, space: IfcElement, settings: ifcopenshell.geom.settings) -> None:
-        super().__init__(space, settings)
-        self.space = space
-        self.settings = settings
+    __slots__ = ()
+
+    def __init__(self, space: IfcElement, settings: ifcopenshell.geom.settings,
+                 shape=None) -> None:
+        super().__init__(space, settings, shape)
+
+    @property
+    def space(self) -> IfcElement:
+        """Original IFC space."""
+        return self.element
+
+    def floor_faces(self, angle_tolerance: float = 1.0) -> List[Face3D]:
+        """Get the faces of the space that point downwards.
+
+        Args:
+            angle_tolerance: Maximum angle between the normal of a face and the
+                negative Z axis in degrees. Default: 1.
+        """
+        return [face for face in self.polyface3d.faces
+                if is_floor(face, angle_tolerance)]
+
+    def grid_data(self, offset: float = 0.75, size: float = 0.6,
+                  mesh: bool = True) -> Tuple[np.ndarray, ...]:
+        """Get the positions and directions of the sensors of the space as arrays.
+
+        See grid.faces_grid for the details.
+        """
+        return faces_grid(self.floor_faces(), size, offset, mesh=mesh)
+
+    def get_grids(self, offset: float = 0.75, size: float = 0.6,
+                  data: Tuple[np.ndarray, ...] = None) -> 'SensorGrid':
+        """Generate a sensor grid from the floor of the space.
+
+        Args:
+            offset: Distance between the floor and the sensors. Default: 0.75.
+            size: Size of the grid cells. Default: 0.6.
+            data: Optional output of grid_data if it is already calculated. e.g. in a
+                process pool. Default: None.
 
-    def get_grids(self, offset=0.75, size=0.6) -> List[SensorGrid]:
-        """Generate sensor grids from the floor of the space."""
+        Returns:
+            A SensorGrid or None if no sensor fits on the floor of the space.
+        """
+        from honeybee_radiance.sensorgrid import SensorGrid
 
-        faces = []
-        for face in self.polyface3d.faces:
-            if face.normal.z == -1:
-                faces.append(face)
+        positions, directions, vertices, quads = data or self.grid_data(offset, size)
+        if not len(positions):
+            return None
 
-        return SensorGrid.from_face3d(clean_and_id_string('Grid'),
-                                      faces, x_dim=size, y_dim=size,
-                                      offset=offset, flip=True)
+        grid = SensorGrid.from_position_and_direction(
+            guid_identifier('Grid', self.guid), positions.tolist(), directions.tolist())
+        if len(quads):
+            grid.mesh = Mesh3D([Point3D(*vertex) for vertex in vertices.tolist()],
+                               [tuple(quad) for quad in quads.tolist()])
+        grid.base_geometry = self.floor_faces()
+        return grid
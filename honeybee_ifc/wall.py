@@ -1,13 +1,17 @@
 """Honeybee-IFC Wall object."""
 
 import ifcopenshell
-from typing import List
+import numpy as np
+from typing import Dict, List, Tuple, TYPE_CHECKING
 from ifcopenshell.entity_instance import entity_instance as IfcElement
-from ladybug_geometry.geometry3d import Face3D, Point3D
-from honeybee.face import Face as Face
-from honeybee.facetype import face_types
-from honeybee.typing import clean_and_id_string
+from ladybug_geometry.geometry3d import Face3D
 from ifcopenshell import geom
+from ._helper import guid_identifier, get_triangles, get_face3ds_from_triangles, \
+    merge_coplanar_triangles, default_settings
+from .hosting import fill_openings
+
+if TYPE_CHECKING:
+    from honeybee.face import Face
 
 
 class Wall():
@@ -16,35 +20,135 @@ class Wall():
     Args:
         wall: An IFC wall object.
         settings: An IFC settings object.
+        shape: An optional shape generated by ifcopenshell.geom. The shape is not
+            kept. Only its vertices and triangles arrays are kept until the Face3Ds
+            are computed. Default: None.
+        merge_coplanar: Set to True to merge the coplanar and edge-adjacent triangles
+            of the wall into polygons with holes. Default: False.
     """
 
-    def __init__(self, wall: IfcElement, settings: ifcopenshell.geom.settings = None) -> None:
+    __slots__ = ('wall', 'merge_coplanar', 'settings', '_data', '_face3ds')
+
+    def __init__(self, wall: IfcElement, settings: ifcopenshell.geom.settings = None,
+                 shape=None, merge_coplanar: bool = False) -> None:
         self.wall = wall
+        self.merge_coplanar = merge_coplanar
         self.settings = settings or self._settings()
-        self.shape = geom.create_shape(self.settings, self.wall)
+        self._data = None
+        self._face3ds = None
+        if shape is not None:
+            self.set_shape(shape)
 
     @staticmethod
     def _settings() -> ifcopenshell.geom.settings:
-        settings = ifcopenshell.geom.settings()
-        settings.set(settings.USE_WORLD_COORDS, True)
-        return settings
+        return default_settings()
+
+    @property
+    def ifc_element(self):
+        """Original IFC wall."""
+        return self.wall
+
+    @property
+    def guid(self) -> str:
+        """Global id of the IFC wall."""
+        return self.wall.GlobalId
+
+    def create_shape(self):
+        """Tessellate the wall with ifcopenshell.geom.
+
+        The shape is not kept. Each call tessellates the wall again.
+        """
+        return geom.create_shape(self.settings, self.wall)
+
+    @property
+    def has_face3ds(self) -> bool:
+        """Whether the Face3Ds of the wall are already computed."""
+        return self._face3ds is not None
+
+    @property
+    def has_shape_data(self) -> bool:
+        """Whether the triangles of the wall are kept until its Face3Ds are computed."""
+        return self._data is not None
+
+    def set_shape(self, shape) -> None:
+        """Keep the vertices and triangles of a shape that is generated by
+        ifcopenshell.geom for the wall until its Face3Ds are computed."""
+        self._data = get_triangles(shape.geometry.verts, shape.geometry.faces)
+
+    def set_shape_data(self, data: Tuple[np.ndarray, np.ndarray]) -> None:
+        """Keep the output of shape_data that is created elsewhere. e.g. in another
+        process."""
+        self._data = data
+
+    def shape_data(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Vertices and triangles arrays of the wall that can be sent to other processes.
+        """
+        if self._data is not None:
+            return self._data
+        shape = self.create_shape()
+        return get_triangles(shape.geometry.verts, shape.geometry.faces)
+
+    def set_face3ds(self, face3ds: List[Face3D]) -> None:
+        """Set Face3Ds that are computed elsewhere. e.g. in a process pool."""
+        self._face3ds = tuple(face3ds)
+        # the tessellation is not needed anymore
+        self._data = None
+
+    @staticmethod
+    def face3ds_from_data(data: Tuple[np.ndarray, np.ndarray],
+                          merge_coplanar: bool = False) -> List[Face3D]:
+        """Get a list of Face3D objects from the output of shape_data."""
+        vertices, triangles = data
+        if merge_coplanar:
+            return merge_coplanar_triangles(vertices, triangles)
+        return get_face3ds_from_triangles(vertices, triangles)
 
     def to_face3ds(self) -> List[Face3D]:
         """Get a list of Face3D objects for the wall."""
+        if self._face3ds is None:
+            self.set_face3ds(
+                self.face3ds_from_data(self.shape_data(), self.merge_coplanar))
+        return list(self._face3ds)
 
-        # Indices of vertices per triangle face e.g. [f1v1, f1v2, f1v3, f2v1, f2v2, f2v3, ...]
-        faces = self.shape.geometry.faces
-        # X Y Z of vertices in flattened list e.g. [v1x, v1y, v1z, v2x, v2y, v2z, ...]
-        verts = self.shape.geometry.verts
+    def to_honeybee(self, sub_faces: Dict[int, list] = None,
+                    filled: Dict[int, List[Face3D]] = None) -> List['Face']:
+        """Get a list of Honeybee Face objects for the wall.
 
-        point3ds = [Point3D(verts[i], verts[i + 1], verts[i + 2])
-                    for i in range(0, len(verts), 3)]
-        face3ds = [Face3D([point3ds[faces[i]], point3ds[faces[i + 1]], point3ds[faces[i + 2]]])
-                   for i in range(0, len(faces), 3)]
+        Args:
+            sub_faces: An optional dictionary of Honeybee Apertures and Doors that are
+                hosted by the faces of the wall keyed by the index of the face. The
+                holes that they fill are removed from the faces. Default: None.
+            filled: An optional dictionary of the Face3Ds of the sub-faces that are
+                hosted by other faces of the wall but also fill an opening of a face
+                keyed by the index of the face. e.g. the hole on the other side of
+                the wall. The openings that they fill are removed too. Default: None.
+        """
+        return self.faces_from_face3ds(self.guid, self.to_face3ds(), sub_faces, filled)
+
+    @staticmethod
+    def faces_from_face3ds(guid: str, face3ds: List[Face3D],
+                           sub_faces: Dict[int, list] = None,
+                           filled: Dict[int, List[Face3D]] = None) -> List['Face']:
+        """Get a list of Honeybee Face objects for a wall from its Face3Ds.
 
-        return face3ds
+        See to_honeybee for the sub_faces and filled arguments.
+        """
+        from honeybee.face import Face
+        from honeybee.facetype import face_types
+        from honeybee.aperture import Aperture
 
-    def to_honeybee(self) -> List[Face]:
-        """Get a list of Honeybee Face objects for the wall."""
-        return [Face(clean_and_id_string('Wall'), face, face_types.wall) for
-                face in self.to_face3ds()]
+        sub_faces, filled = sub_faces or {}, filled or {}
+        faces = []
+        for count, face3d in enumerate(face3ds):
+            hosted = sub_faces.get(count, [])
+            face3d = fill_openings(face3d, [sub_face.geometry for sub_face in hosted] +
+                                   filled.get(count, []))
+            face = Face(guid_identifier('Wall', guid, count), face3d,
+                        face_types.wall)
+            for sub_face in hosted:
+                if isinstance(sub_face, Aperture):
+                    face.add_aperture(sub_face)
+                else:
+                    face.add_door(sub_face)
+            faces.append(face)
+        return faces
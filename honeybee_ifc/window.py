@@ -1,12 +1,16 @@
 """Honeybee-IFC Window object."""
 
+from typing import Dict, TYPE_CHECKING
+
 import ifcopenshell
 from ifcopenshell.entity_instance import entity_instance as IfcElement
 from ladybug_geometry.geometry3d import Face3D, LineSegment3D
-from honeybee.aperture import Aperture
-from honeybee.typing import clean_and_id_string
 from .element import Element
 from .opening import Opening
+from ._helper import guid_identifier
+
+if TYPE_CHECKING:
+    from honeybee.aperture import Aperture
 
 
 class Window(Element):
@@ -15,22 +19,50 @@ class Window(Element):
     Args:
         window: An IFC window object.
         settings: An IFC settings object.
+        shape: An optional shape generated by ifcopenshell.geom. Default: None.
+        openings: An optional dictionary of Opening objects keyed by GlobalId that
+            is shared between the elements of a Model so that each IfcOpeningElement
+            is only tessellated once. Default: None.
     """
 
-    def __init__(self, window: IfcElement, settings: ifcopenshell.geom.settings) -> None:
-        super().__init__(window, settings)
-        self.window = window
-        self.settings = settings
+    __slots__ = ('_openings', '_opening', '_face3d')
+
+    def __init__(self, window: IfcElement, settings: ifcopenshell.geom.settings,
+                 shape=None, openings: Dict[str, Opening] = None) -> None:
+        super().__init__(window, settings, shape)
+        self._openings = openings if openings is not None else {}
+        self._opening = None
+        self._face3d = None
+
+    @property
+    def window(self) -> IfcElement:
+        """Original IFC window."""
+        return self.element
 
     @property
     def opening(self) -> Opening:
         """Honeybee-IFC Element for the IfcOpeningElement of an IfcWindow"""
-        return Opening(self.element.FillsVoids[0].RelatingOpeningElement)
+        if self._opening is None:
+            self._opening = Opening.from_cache(
+                self.element.FillsVoids[0].RelatingOpeningElement, self._openings,
+                self.settings)
+        return self._opening
+
+    @property
+    def host_guid(self) -> str:
+        """GlobalId of the element that is voided by the opening. e.g. the wall.
+
+        None if the opening does not void any element.
+        """
+        voids = self.opening.element.VoidsElements
+        return voids[0].RelatingBuildingElement.GlobalId if voids else None
 
     @property
     def face3d(self) -> Face3D:
         """A Face3D representation."""
-        return sorted(self.polyface3d.faces, key=lambda x: x.area, reverse=True)[0]
+        if self._face3d is None:
+            self._face3d = max(self.polyface3d.faces, key=lambda x: x.area)
+        return self._face3d
 
     def moved_opening_face3d(self) -> Face3D:
         """Get a simplified Face3D representation that is moved to the center of the opening."""
@@ -38,19 +70,29 @@ class Window(Element):
         # we need to do this check because people create openings that are way more
         # extruded than the thickness of the wall. Which means the face with the largest
         # area may not be the one that we want.
+        normal = self.face3d.plane.n.normalize()
         parallel_faces = [
             face for face in self.opening.polyface3d.faces if
-            face.normal.normalize().is_equivalent(self.face3d.plane.n.normalize(), 0.001)]
-
-        area_sorted_faces = sorted(
-            parallel_faces, key=lambda x: x.area, reverse=True)
+            face.normal.normalize().is_equivalent(normal, 0.001)]
 
-        face3d = area_sorted_faces[0]
+        face3d = max(parallel_faces, key=lambda x: x.area)
 
         line = LineSegment3D.from_end_points(face3d.center, self.polyface3d.center)
         # move the largest face to the center of the window object.
         return face3d.move(line.v)
 
-    def to_honeybee(self) -> Aperture:
-        """Get a Honeybee Aperture object."""
-        return Aperture(clean_and_id_string('Aperture'), self.moved_opening_face3d())
+    def to_honeybee(self, face3d: Face3D = None) -> 'Aperture':
+        """Get a Honeybee Aperture object.
+
+        Args:
+            face3d: An optional Face3D to use instead of the moved opening face. e.g.
+                the face projected on its host wall. Default: None.
+        """
+        return self.aperture_from_face3d(self.guid, face3d or self.moved_opening_face3d())
+
+    @staticmethod
+    def aperture_from_face3d(guid: str, face3d: Face3D) -> 'Aperture':
+        """Get a Honeybee Aperture object for a window from its Face3D."""
+        from honeybee.aperture import Aperture
+
+        return Aperture(guid_identifier('Aperture', guid), face3d)
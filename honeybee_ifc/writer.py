@@ -0,0 +1,132 @@
+"""Write HBJSON files one Honeybee object at a time."""
+
+import json
+import pathlib
+from typing import Any, Iterable
+
+# keys of the Honeybee objects in an HBJSON file in the order they are written
+SECTIONS = ('orphaned_faces', 'orphaned_apertures', 'orphaned_doors', 'orphaned_shades')
+
+
+class HBJSONWriter:
+    """Write an HBJSON file while the Honeybee objects are being created.
+
+    The header and the model properties are taken from an empty Honeybee Model and
+    the Honeybee objects are written to the file as they are added. Only one object
+    is kept in memory at a time. The sections must be written in order and each
+    section can only be written once. The result can be loaded with
+    honeybee.model.Model.from_hbjson.
+
+    Usage:
+
+    .. code-block:: python
+
+        with HBJSONWriter('model.hbjson') as writer:
+            writer.write_section('orphaned_faces', faces)
+            writer.write_section('orphaned_apertures', apertures)
+            writer.write_sensor_grids(grids)
+
+    Args:
+        path: Path to the HBJSON file.
+        identifier: Identifier of the Honeybee Model. Default: Model.
+    """
+
+    def __init__(self, path: str, identifier: str = 'Model') -> None:
+        from honeybee.model import Model as HBModel
+
+        self.path = pathlib.Path(path)
+        self._header = HBModel(identifier).to_dict()
+        self._properties = self._header.pop('properties')
+        for section in SECTIONS:
+            self._header.pop(section, None)
+        self._file = None
+        self._written = []
+        self._grids_written = False
+        self.count = 0
+
+    def __enter__(self) -> 'HBJSONWriter':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None and self._file is not None:
+            # don't finish a file that is not complete
+            self._file.close()
+            self._file = None
+            return
+        self.close()
+
+    def open(self) -> None:
+        """Open the file and write the header of the model."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w')
+        self._file.write('{')
+        self._file.write(', '.join(
+            f'{json.dumps(key)}: {json.dumps(value)}'
+            for key, value in self._header.items()))
+
+    def _write_objects(self, objects: Iterable[Any]) -> None:
+        self._file.write('[')
+        for count, obj in enumerate(objects):
+            if count:
+                self._file.write(', ')
+            if isinstance(obj, str):
+                self._file.write(obj)
+            else:
+                json.dump(obj if isinstance(obj, dict) else obj.to_dict(), self._file)
+            self.count += 1
+        self._file.write(']')
+
+    def write_section(self, section: str, objects: Iterable[Any]) -> None:
+        """Write a list of Honeybee objects to the file.
+
+        Args:
+            section: One of orphaned_faces, orphaned_apertures, orphaned_doors and
+                orphaned_shades.
+            objects: An iterable of Honeybee objects, their dictionaries or their
+                dictionaries as JSON strings. Use a generator to only create the
+                objects when they are written.
+        """
+        assert section in SECTIONS, \
+            f'Unsupported section: {section}. Choose from {", ".join(SECTIONS)}.'
+        assert section not in self._written, f'{section} is already written.'
+        assert not self._grids_written, \
+            'Honeybee objects must be written before the sensor grids.'
+        self._file.write(f', {json.dumps(section)}: ')
+        self._write_objects(objects)
+        self._written.append(section)
+
+    def write_sensor_grids(self, grids: Iterable[Any]) -> None:
+        """Write the model properties and a list of sensor grids to the file.
+
+        This must be the last section that is written.
+
+        Args:
+            grids: An iterable of honeybee-radiance SensorGrid objects, their
+                dictionaries or their dictionaries as JSON strings.
+        """
+        assert not self._grids_written, 'Sensor grids are already written.'
+        properties = dict(self._properties)
+        radiance = dict(properties.pop('radiance'))
+        radiance.pop('sensor_grids', None)
+
+        self._file.write(', "properties": {')
+        for key, value in properties.items():
+            self._file.write(f'{json.dumps(key)}: {json.dumps(value)}, ')
+        self._file.write('"radiance": {')
+        for key, value in radiance.items():
+            self._file.write(f'{json.dumps(key)}: {json.dumps(value)}, ')
+        self._file.write('"sensor_grids": ')
+        self._write_objects(grids)
+        self._file.write('}}')
+        self._grids_written = True
+
+    def close(self) -> None:
+        """Write the model properties if they are not written yet and close the file."""
+        if self._file is None:
+            return
+        if not self._grids_written:
+            self.write_sensor_grids([])
+        self._file.write('}')
+        self._file.close()
+        self._file = None
@@ -0,0 +1,61 @@
+"""Testing the on-disk geometry cache."""
+
+import os
+
+import ifcopenshell.geom
+
+from honeybee_ifc.cache import GeometryCache
+
+
+def test_cache_round_trip(tmp_path):
+    cache = GeometryCache(tmp_path)
+    settings = ifcopenshell.geom.settings()
+    key = cache.key('hash', 'guid', settings)
+    assert key not in cache
+    cache.set(key, [1, 2, 3])
+    assert key in cache
+    assert cache.get(key) == [1, 2, 3]
+    assert GeometryCache(tmp_path).size == cache.size
+
+
+def test_cache_key_changes_with_extra_values():
+    settings = ifcopenshell.geom.settings()
+    assert GeometryCache.key('hash', 'guid', settings, True) != \
+        GeometryCache.key('hash', 'guid', settings, False)
+
+
+def test_cache_eviction(tmp_path):
+    cache = GeometryCache(tmp_path, max_size=2000)
+    settings = ifcopenshell.geom.settings()
+    keys = [cache.key('hash', str(i), settings) for i in range(20)]
+    for key in keys:
+        cache.set(key, list(range(100)))
+    assert cache.size <= 2000
+    assert keys[0] not in cache
+    assert keys[-1] in cache
+
+
+def test_cache_eviction_order(tmp_path):
+    cache = GeometryCache(tmp_path)
+    settings = ifcopenshell.geom.settings()
+    keys = [cache.key('hash', str(i), settings) for i in range(4)]
+    for key in keys:
+        cache.set(key, list(range(100)))
+    cache.max_size = cache.size
+    # files with the same modification time as on coarse-resolution filesystems
+    for path in tmp_path.iterdir():
+        os.utime(path, (1000, 1000))
+    assert cache.get(keys[0]) is not None
+    cache.set(cache.key('hash', 'new', settings), list(range(100)))
+    assert keys[0] in cache
+    assert keys[1] not in cache
+
+
+def test_cache_set_many_keeps_the_last_items(tmp_path):
+    cache = GeometryCache(tmp_path)
+    settings = ifcopenshell.geom.settings()
+    cache.set(cache.key('hash', 'first', settings), list(range(100)))
+    cache.max_size = cache.size * 10
+    keys = [cache.key('hash', str(i), settings) for i in range(200)]
+    cache.set_many((key, list(range(100))) for key in keys)
+    assert [key for key in keys if key in cache] == keys[-10:]
@@ -0,0 +1,65 @@
+"""Testing the batch conversion command."""
+
+import pytest
+
+from honeybee_ifc.cli import JobLog, collect_files, convert_files
+
+
+def test_collect_files(tmp_path):
+    folder = tmp_path / 'ifcs'
+    (folder / 'sub').mkdir(parents=True)
+    for path in (folder / 'a.ifc', folder / 'sub' / 'b.IFC', folder / 'notes.txt'):
+        path.write_text('')
+    manifest = tmp_path / 'manifest.txt'
+    manifest.write_text('# batch\nifcs/a.ifc\n\n')
+
+    files = collect_files([str(folder)], 'out')
+    assert [(path.split('/')[-1], output) for path, output in files] == \
+        [('a.ifc', 'out'), ('b.IFC', 'out/sub')]
+
+    assert collect_files([str(manifest), str(folder / 'a.ifc')], 'out') == \
+        [(str(folder / 'a.ifc'), 'out')]
+
+    other = tmp_path / 'other' / 'a.ifc'
+    other.parent.mkdir()
+    other.write_text('')
+    with pytest.raises(ValueError):
+        # two files with the same name in the same output folder
+        collect_files([str(folder / 'a.ifc'), str(other)], 'out')
+
+
+def test_job_log_resume(tmp_path):
+    ifc_file = tmp_path / 'a.ifc'
+    ifc_file.write_text('')
+    output = tmp_path / 'a.hbjson'
+    output.write_text('')
+
+    log = JobLog(tmp_path / 'jobs.jsonl')
+    log.add({'path': str(ifc_file), 'status': 'done', 'output': str(output)})
+    # a crash while writing the log leaves an incomplete line
+    with open(log.path, 'a') as f:
+        f.write('{"path": ')
+    assert JobLog(log.path).is_done(str(ifc_file))
+
+    ifc_file.write_text('changed')
+    assert not JobLog(log.path).is_done(str(ifc_file))
+
+
+def test_job_log_add_after_crash(tmp_path):
+    ifc_file = tmp_path / 'a.ifc'
+    ifc_file.write_text('')
+    output = tmp_path / 'a.hbjson'
+    output.write_text('')
+    path = tmp_path / 'jobs.jsonl'
+    path.write_text('{"path": ')
+
+    JobLog(path).add({'path': str(ifc_file), 'status': 'done', 'output': str(output)})
+    assert JobLog(path).is_done(str(ifc_file))
+
+
+def test_convert_files_with_process_pool(synthetic_ifc, tmp_path):
+    # the Model of each job starts its own process pool
+    results = convert_files([(str(synthetic_ifc), str(tmp_path))], workers=2,
+                            options={'workers': 2})
+    assert [result['status'] for result in results] == ['done'], results[0]['error']
+    assert results[0]['size_mb'] > 0
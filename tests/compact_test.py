@@ -0,0 +1,73 @@
+"""Testing the compact format."""
+
+import json
+
+import numpy as np
+import pytest
+from honeybee.aperture import Aperture
+from honeybee.face import Face
+from honeybee.model import Model as HBModel
+from honeybee.shade import Shade
+from honeybee_radiance.sensorgrid import SensorGrid
+from ladybug_geometry.geometry3d import Face3D, Point3D
+
+from honeybee_ifc.compact import load_compact, read_compact, write_compact
+
+
+def _model():
+    boundary = [Point3D(0, 0, 0), Point3D(4, 0, 0), Point3D(4, 0, 3), Point3D(0, 0, 3)]
+    hole = [Point3D(3, 0, 2), Point3D(3.5, 0, 2), Point3D(3.5, 0, 2.5),
+            Point3D(3, 0, 2.5)]
+    face = Face('Wall', Face3D(boundary, holes=[hole]))
+    face.add_aperture(Aperture('Window', Face3D(
+        [Point3D(1, 0, 1), Point3D(2, 0, 1), Point3D(2, 0, 2), Point3D(1, 0, 2)])))
+    shades = [Shade(f'Shade_{i}', Face3D([Point3D(i, 1, 0), Point3D(i + 1, 1, 0),
+                                          Point3D(i + 1, 1, 1)])) for i in range(3)]
+    model = HBModel('Model', orphaned_faces=[face], orphaned_shades=shades)
+    model.properties.radiance.add_sensor_grid(SensorGrid.from_planar_positions(
+        'Grid', [(x, y, 0.75) for x in range(3) for y in range(2)], (0, 0, 1)))
+    return model
+
+
+def test_compact_round_trip(tmp_path):
+    model = _model()
+    expected = json.loads(json.dumps(model.to_dict()))
+    for compress in (True, False):
+        path = write_compact(model, tmp_path / f'model_{compress}.hbz', compress)
+        assert read_compact(path) == expected
+        loaded = load_compact(path)
+        assert loaded.to_dict() == model.to_dict()
+        assert len(loaded.faces[0].geometry.holes) == 1
+        assert len(loaded.properties.radiance.sensor_grids[0].sensors) == 6
+    assert (tmp_path / 'model_True.hbz').stat().st_size < \
+        (tmp_path / 'model_False.hbz').stat().st_size
+
+
+def test_compact_packed_arrays(tmp_path):
+    path = write_compact(_model(), tmp_path / 'model.hbz')
+    with np.load(path) as container:
+        # the boundary and the hole of the wall, the window and the shades
+        assert container['loops'].tolist() == [4, 4, 4, 3, 3, 3]
+        assert container['points'].shape == (21, 3)
+        assert container['sensors'].shape == (6, 6)
+        header = json.loads(container['header'].tobytes())
+    # the properties of the shades are stored once
+    references = [shade['properties'] for shade in header['model']['orphaned_shades']]
+    assert all('$shared' in reference for reference in references)
+    assert len({reference['$shared'] for reference in references}) == 1
+
+
+def test_compact_shared_copies(tmp_path):
+    data = read_compact(write_compact(_model(), tmp_path / 'model.hbz'))
+    shades = data['orphaned_shades']
+    shades[0]['properties']['radiance']['modifier'] = 'changed'
+    assert shades[1]['properties'] == shades[2]['properties']
+    assert shades[1]['properties']['radiance'].get('modifier') != 'changed'
+
+
+def test_compact_unsupported_file(tmp_path):
+    path = tmp_path / 'other.hbz'
+    with open(path, 'wb') as f:
+        np.savez(f, header=np.frombuffer(b'{"format": "other"}', dtype=np.uint8))
+    with pytest.raises(ValueError):
+        read_compact(path)
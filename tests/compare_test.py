@@ -0,0 +1,71 @@
+"""Testing the comparison of converted models with verified models."""
+
+import random
+
+import numpy as np
+import pytest
+from honeybee.aperture import Aperture
+from honeybee.model import Model as HBModel
+from ladybug_geometry.geometry3d import Face3D, Point3D, Vector3D
+
+from honeybee_ifc.compare import KDTree, compare_models, match_objects
+
+
+def _apertures(count=20):
+    apertures = []
+    for i in range(count):
+        x = (i % 5) * 2.0
+        z = (i // 5) * 3.0
+        face3d = Face3D([Point3D(x, 0, z), Point3D(x + 1, 0, z),
+                         Point3D(x + 1, 0, z + 1), Point3D(x, 0, z + 1)])
+        apertures.append(Aperture(f'Aperture_{i}', face3d))
+    return apertures
+
+
+def test_kd_tree_query():
+    rng = np.random.default_rng(0)
+    points = rng.random((500, 3)) * 10
+    tree = KDTree(points, leaf_size=4)
+    for point in rng.random((20, 3)) * 10:
+        distances = np.linalg.norm(points - point, axis=1)
+        expected = np.argsort(distances)[:3].tolist()
+        assert [index for _, index in tree.query(point, 3)] == expected
+        within = tree.query(point, 500, max_distance=1.0)
+        assert len(within) == int(np.sum(distances <= 1.0))
+    assert KDTree(np.empty((0, 3))).query((0, 0, 0)) == []
+
+
+def test_match_objects_in_any_order():
+    references = _apertures()
+    objects = [aperture.duplicate() for aperture in references]
+    random.Random(0).shuffle(objects)
+    report = match_objects(objects, references)
+    assert report['passed'] and report['matched'] == 20
+    assert report['max_distance'] == 0
+
+
+def test_match_objects_differences():
+    references = _apertures()
+    objects = [aperture.duplicate() for aperture in references]
+    objects[0].move(Vector3D(0, 0.5, 0))
+    objects[1] = Aperture('Flipped', objects[1].geometry.flip())
+    objects[2] = Aperture('Larger', objects[2].geometry.scale(1.1, objects[2].center))
+    report = match_objects(objects, references)
+    assert not report['passed']
+    assert report['unmatched'] == ['Aperture_0'] and report['missing'] == ['Aperture_0']
+    assert [item['identifier'] for item in report['mismatched']] == \
+        ['Flipped', 'Larger']
+    assert report['matched'] == 17
+    assert match_objects(objects[2:], references[2:], area_tolerance=None)['passed']
+
+
+def test_compare_models():
+    model = HBModel('model', orphaned_apertures=_apertures())
+    reference = HBModel('reference', orphaned_apertures=_apertures()[::-1])
+    report = compare_models(model, reference)
+    assert report['passed']
+    assert report['apertures']['count'] == 20 and report['faces']['count'] == 0
+    report = compare_models(model, HBModel('reference', orphaned_apertures=_apertures(19)))
+    assert not report['passed'] and not report['apertures']['passed']
+    with pytest.raises(ValueError):
+        compare_models(model, reference, kinds=('rooms',))
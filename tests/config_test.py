@@ -0,0 +1,42 @@
+"""Testing the conversion configs and profiles."""
+
+import json
+
+import ifcopenshell
+import pytest
+
+from honeybee_ifc.config import ConversionConfig
+
+
+def test_config_profiles():
+    config = ConversionConfig.from_profile('energy')
+    assert config.spaces is None and not config.grids
+    assert config.walls == '.IfcWall | .IfcWallStandardCase'
+    config = ConversionConfig.from_profile('daylight')
+    assert config.shades is None and config.grids
+    with pytest.raises(ValueError):
+        ConversionConfig.from_profile('acoustics')
+
+
+def test_config_from_dict(tmp_path):
+    config = ConversionConfig.from_dict(
+        {'profile': 'energy', 'shades': '.IfcColumn | .IfcBeam'})
+    assert config.shades == '.IfcColumn | .IfcBeam' and config.spaces is None
+    assert ConversionConfig.from_dict(config.to_dict()).to_dict() == config.to_dict()
+    with pytest.raises(ValueError):
+        ConversionConfig.from_dict({'rooms': '.IfcSpace'})
+
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({'walls': None, 'grids': False}))
+    config = ConversionConfig.from_value(str(path))
+    assert config.walls is None and config.slabs == '.IfcSlab'
+    with pytest.raises(ValueError):
+        ConversionConfig.from_value('missing.json')
+
+
+def test_config_select(synthetic_ifc):
+    ifc_file = ifcopenshell.open(str(synthetic_ifc))
+    config = ConversionConfig(windows='.IfcWindow | .IfcWindow')
+    windows = config.select(ifc_file, 'windows')
+    assert len(windows) == len(ifc_file.by_type('IfcWindow'))
+    assert ConversionConfig.from_profile('energy').select(ifc_file, 'spaces') == []
@@ -41,6 +41,29 @@ def office_model(converted_small_office: Path):
     return HBModel.from_hbjson(converted_small_office)
 
 
+@pytest.fixture(scope='session')
+def office_selection(ifc_small_office: Path):
+    """GlobalIds of the IFC elements of each kind that are converted by default."""
+    import ifcopenshell
+    from honeybee_ifc.config import ConversionConfig
+    ifc_file = ifcopenshell.open(str(ifc_small_office))
+    selected = Model.select_elements(ifc_file, ConversionConfig.from_profile('full'))
+    return {kind: {element.GlobalId for element in elements if element.Representation}
+            for kind, elements in selected.items()}
+
+
 @pytest.fixture(scope='session')
 def verified_office_model():
     return HBModel.from_hbjson('tests/assets/hbjsons/SmallOffice_d_IFC2x3.hbjson')
+
+
+@pytest.fixture(scope='session')
+def synthetic_ifc(tmp_path_factory):
+    from benchmarks.generator import generate
+    return generate(tmp_path_factory.mktemp('ifc') / 'synthetic.ifc', storeys=2,
+                    rooms=3, windows=4, doors=2, columns=2)
+
+
+@pytest.fixture(scope='session')
+def synthetic_model(synthetic_ifc):
+    return Model(synthetic_ifc).to_honeybee()
@@ -0,0 +1,48 @@
+"""Testing the NumPy sensor grids against Face3D.mesh_grid."""
+
+import numpy as np
+import pytest
+from ladybug_geometry.geometry3d import Face3D, Point3D
+
+from honeybee_ifc.grid import face_grid, faces_grid, is_floor, write_pts
+
+
+def _floor(points, holes=None):
+    face = Face3D([Point3D(*pt) for pt in points],
+                  holes=[[Point3D(*pt) for pt in hole] for hole in holes or []] or None)
+    return face if face.normal.z < 0 else face.flip()
+
+
+FLOORS = [
+    _floor([(0, 0, 0), (5, 0, 0), (5, 4, 0), (0, 4, 0)]),
+    _floor([(0, 0, 1), (6, 0, 1), (6, 2, 1), (2, 2, 1), (2, 5, 1), (0, 5, 1)]),
+    _floor([(0, 0, 0), (10, 0, 0), (10, 10, 0), (0, 10, 0)],
+           [[(3, 3, 0), (6, 3, 0), (6, 6, 0), (3, 6, 0)]]),
+    # slightly sloped floor
+    _floor([(0, 0, 0), (5, 0, 0.05), (5, 4, 0.05), (0, 4, 0)])
+]
+
+
+@pytest.mark.parametrize('floor', FLOORS)
+def test_face_grid_matches_mesh_grid(floor):
+    mesh = floor.mesh_grid(0.3, None, 0.75, True)
+    positions, directions, vertices, quads = face_grid(floor, 0.3, 0.75)
+    expected = np.array([(pt.x, pt.y, pt.z) for pt in mesh.face_centroids])
+    assert positions.shape == expected.shape
+    assert np.allclose(positions, expected)
+    normal = mesh.face_normals[0]
+    assert np.allclose(directions, (normal.x, normal.y, normal.z))
+    assert len(vertices) == len(mesh.vertices) and len(quads) == len(mesh.faces)
+
+
+def test_faces_grid_and_pts(tmp_path):
+    positions, directions, vertices, quads = faces_grid(FLOORS[:2], 0.3)
+    assert len(positions) == len(quads) == 208 + 180
+    assert quads.max() == len(vertices) - 1
+    path = write_pts(tmp_path / 'grid.pts', positions, directions)
+    assert np.allclose(np.loadtxt(path), np.hstack((positions, directions)), atol=1e-6)
+
+
+def test_is_floor():
+    assert all(is_floor(floor) for floor in FLOORS)
+    assert not is_floor(FLOORS[0].flip())
@@ -0,0 +1,134 @@
+"""Testing geometry helpers that work on triangulated meshes."""
+
+import math
+
+import numpy as np
+from ladybug_geometry.geometry3d import Vector3D, Point3D, Face3D, Polyface3D
+
+from honeybee_ifc._helper import get_face3ds_from_triangles, merge_coplanar_triangles, \
+    face3d_from_segments, get_polyface3d, weld_vertices
+
+
+def _grid_with_hole(size=5):
+    """A flat grid of squares with a 2x2 hole in the middle."""
+    vertices = np.array(
+        [(x, y, 0) for y in range(size) for x in range(size)], dtype=float)
+    triangles = []
+    for y in range(size - 1):
+        for x in range(size - 1):
+            if 1 <= x <= 2 and 1 <= y <= 2:
+                continue
+            a = y * size + x
+            triangles.extend([(a, a + 1, a + size + 1), (a, a + size + 1, a + size)])
+    return vertices, np.array(triangles)
+
+
+def test_face3ds_from_triangles_skip_degenerate():
+    vertices = np.array([(0, 0, 0), (1, 0, 0), (1, 1, 0), (2, 0, 0)], dtype=float)
+    triangles = np.array([(0, 1, 2), (0, 1, 3)])
+    face3ds = get_face3ds_from_triangles(vertices, triangles)
+    assert len(face3ds) == 1
+    assert face3ds[0].normal.z == 1
+
+
+def test_face3ds_from_triangles_tolerance():
+    # a sliver with an area of 2.5e-5 is degenerate for the default tolerance
+    vertices = np.array([(0, 0, 0), (1, 0, 0), (1, 0.00005, 0)], dtype=float)
+    triangles = np.array([(0, 1, 2)])
+    assert get_face3ds_from_triangles(vertices, triangles) == []
+    assert len(get_face3ds_from_triangles(vertices, triangles, tolerance=0.001)) == 1
+
+
+def test_weld_vertices_across_cells():
+    # the first two vertices are closer than the tolerance but in different cells
+    vertices = np.array([(0.0149, 0, 0), (0.0151, 0, 0), (1, 0, 0), (1, 1, 0)])
+    triangles = np.array([(0, 2, 3), (1, 2, 3), (0, 1, 2)])
+    welded, triangles = weld_vertices(vertices, triangles)
+    assert len(welded) == 3
+    assert triangles.tolist() == [[0, 1, 2], [0, 1, 2]]
+
+
+def test_merge_coplanar_with_hole():
+    vertices, triangles = _grid_with_hole()
+    face3ds = merge_coplanar_triangles(vertices, triangles)
+    assert len(face3ds) == 1
+    assert face3ds[0].area == 12
+    assert len(face3ds[0].boundary) == 4
+    assert len(face3ds[0].holes) == 1
+
+
+def test_merge_coplanar_box():
+    vertices = np.array([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+                         (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)], dtype=float)
+    triangles = np.array([
+        (0, 2, 1), (0, 3, 2), (4, 5, 6), (4, 6, 7), (0, 1, 5), (0, 5, 4),
+        (1, 2, 6), (1, 6, 5), (2, 3, 7), (2, 7, 6), (3, 0, 4), (3, 4, 7)])
+    face3ds = merge_coplanar_triangles(vertices, triangles)
+    assert len(face3ds) == 6
+    assert all(len(face.vertices) == 4 for face in face3ds)
+
+
+def _loop_segments(points):
+    return [(points[i], points[(i + 1) % len(points)]) for i in range(len(points))]
+
+
+def test_face3d_from_segments_with_hole():
+    outer = [(0, 0, 0), (4, 0, 0), (4, 4, 0), (0, 4, 0)]
+    # the hole is walked in the same direction and one segment is reversed
+    inner = [(1, 1, 0), (3, 1, 0), (3, 3, 0), (1, 3.001, 0)]
+    segments = _loop_segments(inner)[::-1] + _loop_segments(outer)
+    segments[0] = segments[0][::-1]
+    face3d = face3d_from_segments(segments, normal=Vector3D(0, 0, -1))
+    assert len(face3d.holes) == 1
+    assert abs(face3d.area - 12) < 0.01
+    assert face3d.normal.z == -1
+
+
+def test_face3d_from_segments_many_edges():
+    count = 5000
+    circle = [(math.cos(2 * math.pi * i / count) * 100,
+               math.sin(2 * math.pi * i / count) * 100, 5) for i in range(count)]
+    # a seam that is walked in both directions and an open chain are ignored
+    segments = _loop_segments(circle) + [((100, 0, 5), (0, 0, 5)),
+                                         ((0, 0, 5), (100, 0, 5)),
+                                         ((0, 0, 5), (1, 1, 5))]
+    face3d = face3d_from_segments(segments)
+    assert len(face3d.boundary) == count and not face3d.holes
+    assert face3d_from_segments([((0, 0, 0), (1, 0, 0))]) is None
+
+
+def test_polyface3d_flipped_faces():
+    faces = [face.flip() if i % 2 else face
+             for i, face in enumerate(Polyface3D.from_box(2, 3, 4).faces)]
+    # a vertex that is off by less than the tolerance is welded
+    faces[0] = faces[0].move(Vector3D(0.001, 0, 0))
+    polyface3d = get_polyface3d(faces)
+    assert polyface3d.is_solid
+    assert len(polyface3d.vertices) == 8
+    assert abs(polyface3d.volume - 24) < 0.1
+    for face in polyface3d.faces:
+        assert face.normal.dot(face.center - polyface3d.center) > 0
+    # the outward faces are kept instead of being rebuilt by ladybug-geometry
+    assert polyface3d.faces[2] is faces[2]
+
+
+def test_polyface3d_with_hole():
+    boundary = [Point3D(0, 0, 0), Point3D(4, 0, 0), Point3D(4, 4, 0), Point3D(0, 4, 0)]
+    hole = [Point3D(1, 1, 0), Point3D(2, 1, 0), Point3D(2, 2, 0), Point3D(1, 2, 0)]
+    up = Vector3D(0, 0, 1)
+    faces = [Face3D(boundary, holes=[hole]), Face3D(boundary, holes=[hole]).move(up)]
+    for loop in (boundary, hole):
+        for start, end in zip(loop, loop[1:] + loop[:1]):
+            faces.append(Face3D([start, end, end.move(up), start.move(up)]))
+    polyface3d = get_polyface3d(faces)
+    assert polyface3d.is_solid
+    assert abs(polyface3d.volume - 15) < 1e-6
+    assert polyface3d.faces[0].normal.z == -1 and polyface3d.faces[1].normal.z == 1
+
+
+def test_polyface3d_open():
+    faces = Polyface3D.from_box(2, 3, 4).faces[:5]
+    polyface3d = get_polyface3d(faces)
+    assert not polyface3d.is_solid
+    assert len(polyface3d.faces) == 5
+    assert len(polyface3d.naked_edges) == 4
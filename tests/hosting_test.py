@@ -0,0 +1,93 @@
+"""Testing hosting apertures and doors on the faces of walls."""
+
+import pytest
+from ladybug_geometry.geometry3d import Face3D, Point3D
+
+from honeybee_ifc.hosting import FaceIndex, can_fill_notch, find_hosts, \
+    find_filled_faces, fill_openings, project_sub_face
+
+
+def _wall_side(y, hole=True):
+    """A 5 x 3 wall face at y with a 1 x 1 hole in the middle."""
+    boundary = [Point3D(0, y, 0), Point3D(5, y, 0), Point3D(5, y, 3), Point3D(0, y, 3)]
+    holes = [[Point3D(2, y, 1), Point3D(2, y, 2), Point3D(3, y, 2), Point3D(3, y, 1)]] \
+        if hole else None
+    return Face3D(boundary, holes=holes)
+
+
+def _window(x=2, y=0.1):
+    return Face3D([Point3D(x, y, 1), Point3D(x + 1, y, 1), Point3D(x + 1, y, 2),
+                   Point3D(x, y, 2)])
+
+
+def test_face_index_query():
+    faces = [_wall_side(0), _wall_side(0.2), _wall_side(0).move(Point3D(100, 0, 0))]
+    index = FaceIndex(faces)
+    window = _window()
+    assert index.query(window.min, window.max) == []
+    assert index.query(window.min, window.max, 0.1) == [0, 1]
+    assert index.query(Point3D(50, 0, 0), Point3D(51, 1, 1)) == []
+
+
+def test_find_hosts():
+    faces = [_wall_side(0), _wall_side(0.2), _wall_side(5)]
+    windows = [_window(), _window(y=0.12), _window(y=2.5), _window(x=4.5)]
+    hosts = find_hosts(faces, windows)
+    # equal distance to both sides uses the first side
+    assert hosts[0] == 0
+    assert hosts[1] == 1
+    # too far from any wall and outside of the boundary
+    assert hosts[2] is None and hosts[3] is None
+
+    # the related wall is preferred over a closer face
+    hosts = find_hosts(faces, [_window(y=0.12)], ['a', 'a', 'b'], ['b'],
+                       max_distance=5)
+    assert hosts == [2]
+
+
+def test_fill_openings_and_project():
+    face = _wall_side(0)
+    aperture = project_sub_face(face, _window())
+    assert aperture.normal.is_equivalent(face.normal, 0.001)
+    filled = fill_openings(face, [aperture])
+    assert not filled.has_holes
+    assert filled.is_sub_face(aperture, 0.01, 0.01)
+    assert fill_openings(face, [_window(x=0.5)]).has_holes
+
+
+def test_fill_openings_on_both_sides():
+    faces = [_wall_side(0), _wall_side(0.2).flip(), _wall_side(5)]
+    window = _window()
+    hosts = find_hosts(faces, [window], ['a', 'a', 'b'], ['a'])
+    assert hosts == [0]
+    assert find_filled_faces(faces, [window], hosts, ['a', 'a', 'b']) == [[1]]
+    assert find_filled_faces(faces, [window], [None]) == [[]]
+    other_side = fill_openings(faces[1], [project_sub_face(faces[1], window)])
+    assert not other_side.has_holes
+    assert other_side.normal.is_equivalent(faces[1].normal, 0.001)
+
+
+def test_door_in_notch():
+    # a wall face with a 1 x 2 notch at the bottom for a door
+    wall = Face3D([Point3D(0, 0, 0), Point3D(2, 0, 0), Point3D(2, 0, 2),
+                   Point3D(3, 0, 2), Point3D(3, 0, 0), Point3D(5, 0, 0),
+                   Point3D(5, 0, 3), Point3D(0, 0, 3)])
+    door = Face3D([Point3D(2, 0.1, 0), Point3D(3, 0.1, 0), Point3D(3, 0.1, 2),
+                   Point3D(2, 0.1, 2)])
+    assert find_hosts([wall], [door]) == [0]
+    door = project_sub_face(wall, door)
+    filled = fill_openings(wall, [door])
+    assert abs(filled.area - 15) < 0.001
+    # the door is on the boundary which is_sub_face doesn't accept
+    assert find_hosts([filled], [door]) == [0]
+
+
+def test_notch_that_can_not_be_filled():
+    wall = _wall_side(0, hole=False)
+    # a door next to the wall that doesn't touch it
+    door = Face3D([Point3D(6, 0, 0), Point3D(7, 0, 0), Point3D(7, 0, 2),
+                   Point3D(6, 0, 2)])
+    assert not can_fill_notch(wall, door)
+    assert can_fill_notch(wall, project_sub_face(wall, _window()))
+    with pytest.raises(ValueError):
+        fill_openings(wall, [door])
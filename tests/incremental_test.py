@@ -0,0 +1,87 @@
+"""Testing the comparison of IFC revisions for incremental conversion."""
+
+import ifcopenshell
+from honeybee.model import Model as HBModel
+
+from honeybee_ifc._helper import guid_identifier, guid_from_identifier
+from honeybee_ifc.compare import compare_models
+from honeybee_ifc.incremental import ModelDiff, element_hashes, update_hbjson
+from honeybee_ifc.model import Model
+
+GUID = '2O2Fr$t4X7Zf8NOew3FLOH'
+
+
+def _ifc_file(x=0.0, creation_date=1, opening=False):
+    ifc_file = ifcopenshell.file(schema='IFC2X3')
+    owner_history = ifc_file.createIfcOwnerHistory(CreationDate=creation_date)
+    point = ifc_file.createIfcCartesianPoint((x, 0.0, 0.0))
+    placement = ifc_file.createIfcLocalPlacement(
+        None, ifc_file.createIfcAxis2Placement3D(point))
+    wall = ifc_file.createIfcWall(GUID, owner_history, 'Wall', None, None, placement)
+    ifc_file.createIfcWall('0000000000000000000001', owner_history, 'Wall')
+    if opening:
+        ifc_file.createIfcRelVoidsElement(
+            '0000000000000000000002', owner_history, None, None, wall,
+            ifc_file.createIfcOpeningElement('0000000000000000000003', owner_history))
+    return ifc_file
+
+
+def test_guid_identifier_round_trip():
+    identifier = guid_identifier('Wall', GUID, 3)
+    assert identifier == 'Wall_2O2Fr-t4X7Zf8NOew3FLOH_3'
+    assert guid_from_identifier(identifier) == GUID
+    assert guid_from_identifier(guid_identifier('Aperture', GUID)) == GUID
+    assert guid_from_identifier('Wall_2f274e71') is None
+
+
+def test_diff_ignores_owner_history():
+    diff = ModelDiff(element_hashes(_ifc_file()), element_hashes(_ifc_file(creation_date=2)))
+    assert not diff.has_changes
+
+
+def test_diff_finds_moved_element():
+    diff = ModelDiff(element_hashes(_ifc_file()), element_hashes(_ifc_file(x=1.0)))
+    assert diff.changed == [GUID]
+    assert diff.to_convert == [GUID]
+    assert len(diff.unchanged) == 1
+
+
+def test_diff_finds_wall_with_new_opening():
+    diff = ModelDiff(element_hashes(_ifc_file()), element_hashes(_ifc_file(opening=True)))
+    assert diff.changed == [GUID]
+    assert not diff.added and not diff.removed
+
+
+def test_diff_uses_the_config():
+    old_file, new_file = _ifc_file(), _ifc_file()
+    for count, ifc_file in enumerate((old_file, new_file)):
+        point = ifc_file.createIfcCartesianPoint((float(count), 0.0, 0.0))
+        ifc_file.createIfcBeam(
+            '0000000000000000000004', None, 'Beam', None, None,
+            ifc_file.createIfcLocalPlacement(
+                None, ifc_file.createIfcAxis2Placement3D(point)))
+    assert not ModelDiff(element_hashes(old_file), element_hashes(new_file)).has_changes
+    config = {'shades': '.IfcColumn | .IfcBeam'}
+    diff = ModelDiff(element_hashes(old_file, config), element_hashes(new_file, config))
+    assert diff.changed == ['0000000000000000000004']
+
+
+def test_update_hbjson(synthetic_ifc, tmp_path):
+    hbjson_path = Model(synthetic_ifc).to_hbjson(str(tmp_path), 'model')
+    ifc_file = ifcopenshell.open(str(synthetic_ifc))
+    column = ifc_file.by_type('IfcColumn')[0]
+    location = column.ObjectPlacement.RelativePlacement.Location
+    x, y, z = location.Coordinates
+    location.Coordinates = (x + 1.0, y, z)
+    slab = ifc_file.by_type('IfcSlab')[0]
+    slab_guid = slab.GlobalId
+    ifc_file.remove(slab)
+    new_ifc_file_path = tmp_path / 'revision.ifc'
+    ifc_file.write(str(new_ifc_file_path))
+
+    diff = update_hbjson(hbjson_path, synthetic_ifc, new_ifc_file_path)
+    assert diff.changed == [column.GlobalId]
+    assert diff.removed == [slab_guid]
+    assert not diff.added
+    expected = Model(new_ifc_file_path).to_honeybee()
+    assert compare_models(HBModel.from_hbjson(hbjson_path), expected)['passed']
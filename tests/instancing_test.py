@@ -0,0 +1,37 @@
+"""Testing the instancing of elements with the same representation."""
+
+import ifcopenshell
+import numpy as np
+from ladybug_geometry.geometry3d import Point3D, Polyface3D
+
+from honeybee_ifc.instancing import find_instances, placement_matrix, \
+    transform_polyface3d
+
+
+def test_find_instances(synthetic_ifc):
+    ifc_file = ifcopenshell.open(str(synthetic_ifc))
+    windows = ifc_file.by_type('IfcWindow')
+    instances = find_instances(windows)
+    # all the windows of the synthetic building have the same representation
+    assert len(instances) == len(windows) - 1
+    for guid, (prototype, matrix) in instances.items():
+        element = ifc_file.by_guid(guid)
+        expected = placement_matrix(element)
+        assert np.allclose(matrix @ placement_matrix(prototype), expected)
+
+    # walls are voided by openings and are never instanced
+    assert not find_instances(ifc_file.by_type('IfcWall'))
+
+
+def test_transform_polyface3d():
+    box = Polyface3D.from_box(1, 2, 3)
+    matrix = np.identity(4)
+    # rotate 90 degrees around Z and move
+    matrix[:3, :3] = ((0, -1, 0), (1, 0, 0), (0, 0, 1))
+    matrix[:3, 3] = (10, 0, 0)
+    moved = transform_polyface3d(box, matrix)
+    assert moved.face_indices == box.face_indices
+    for vertex, original in zip(moved.vertices, box.vertices):
+        assert vertex.is_equivalent(Point3D(10 - original.y, original.x, original.z), 1e-9)
+    assert abs(moved.volume - box.volume) < 1e-9
+    assert moved.is_solid
@@ -1,62 +1,61 @@
 """Testing center point locations and normals for apertures in HBJSONs exported from
-two IFC file."""
+two IFC file.
 
-import pytest
+The counts are checked against the elements of the IFC file. The verified model was
+exported when the geometry iterator dropped its first shape so it can miss an object.
+"""
 
+from honeybee_ifc._helper import guid_from_identifier
+from honeybee_ifc.compare import compare_models
 
-def test_number_of_apertures(office_model):
-    assert len(office_model.apertures) == 80
 
+def _guids(objects, prefix: str) -> set:
+    return {guid_from_identifier(obj.identifier) for obj in objects
+            if obj.identifier.startswith(f'{prefix}_')}
 
-def test_number_of_doors(office_model):
-    assert len(office_model.doors) == 33
 
+def test_number_of_apertures(office_model, office_selection):
+    assert len(office_model.apertures) == len(office_selection['windows'])
+    assert _guids(office_model.apertures, 'Aperture') == office_selection['windows']
 
-def test_number_of_shades(office_model):
-    assert len(office_model.shades) == 36
 
+def test_number_of_doors(office_model, office_selection):
+    assert len(office_model.doors) == len(office_selection['doors'])
+    assert _guids(office_model.doors, 'Door') == office_selection['doors']
 
-def test_number_of_faces(office_model):
-    assert len(office_model.faces) == 3299
 
+def test_number_of_shades(office_model, office_selection):
+    # each column is converted to a shade per face
+    assert _guids(office_model.shades, 'Shade') == office_selection['shades']
 
-def test_number_of_grids(office_model):
-    assert len(office_model.properties.radiance.sensor_grids) == 29
 
+def test_number_of_faces(office_model, office_selection):
+    assert _guids(office_model.faces, 'Wall') == office_selection['walls']
+    assert _guids(office_model.faces, 'Face') == office_selection['slabs']
 
-def test_aperture_center_normal(office_model, verified_office_model):
-    """Make sure the center point location & normal matches the verified model."""
-
-    verified_center_points = [
-        aperture.geometry.center for aperture in verified_office_model.apertures]
 
-    verified_normals = [
-        aperture.geometry.normal for aperture in verified_office_model.apertures]
+def test_number_of_grids(office_model, office_selection):
+    grids = office_model.properties.radiance.sensor_grids
+    assert _guids(grids, 'Grid') == office_selection['spaces']
 
-    for count, aperture in enumerate(office_model.apertures):
-        center = aperture.geometry.center
-        expected_center = verified_center_points[count]
-        assert center.distance_to_point(expected_center) < 0.01
 
-        normal = aperture.geometry.normal.normalize()
-        vec = verified_normals[count]
-        assert normal.angle(vec) <= 0.01
+def _check_verified(report: dict) -> None:
+    """Every verified object is matched. The model can have one more object that
+    the verified model missed."""
+    assert not report['missing'] and not report['mismatched'], report
+    assert len(report['unmatched']) <= 1, report
 
 
-def test_door_center_normal(office_model, verified_office_model):
-    """Make sure the center point location & normal matches the verified model."""
-
-    verified_center_points = [
-        door.geometry.center for door in verified_office_model.doors]
+def test_aperture_center_normal(office_model, verified_office_model):
+    """Make sure the center point location & normal matches the verified model.
 
-    verified_normals = [
-        door.geometry.normal for door in verified_office_model.doors]
+    The apertures are matched by their center point so their order doesn't matter.
+    """
+    report = compare_models(office_model, verified_office_model, kinds=('apertures',))
+    _check_verified(report['apertures'])
 
-    for count, door in enumerate(office_model.doors):
-        center = door.geometry.center
-        expected_center = verified_center_points[count]
-        assert center.distance_to_point(expected_center) < 0.01
 
-        normal = door.geometry.normal.normalize()
-        vec = verified_normals[count]
-        assert normal.angle(vec) <= 0.01
+def test_door_center_normal(office_model, verified_office_model):
+    """Make sure the center point location & normal matches the verified model."""
+    report = compare_models(office_model, verified_office_model, kinds=('doors',))
+    _check_verified(report['doors'])
@@ -0,0 +1,58 @@
+"""Testing the conversion of an IFC file by building storey."""
+
+import ifcopenshell
+import ifcopenshell.guid
+from honeybee.model import Model as HBModel
+from honeybee.shade import Shade
+from ladybug_geometry.geometry3d import Face3D, Point3D
+
+from honeybee_ifc._helper import guid_from_identifier
+from honeybee_ifc.compare import compare_models
+from honeybee_ifc.partition import storey_partitions, merge_hbjsons, convert_storeys
+
+
+def test_storey_partitions(synthetic_ifc):
+    ifc_file = ifcopenshell.open(str(synthetic_ifc))
+    partitions = storey_partitions(ifc_file)
+    assert [name for name, _ in partitions] == ['Level 0', 'Level 1']
+    guids = [guid for _, storey_guids in partitions for guid in storey_guids]
+    assert len(guids) == len(set(guids))
+    for ifc_class in ('IfcWall', 'IfcWindow', 'IfcDoor', 'IfcSpace', 'IfcSlab'):
+        assert {e.GlobalId for e in ifc_file.by_type(ifc_class)} <= set(guids)
+
+
+def test_merge_hbjsons(tmp_path):
+    paths = []
+    for count in range(3):
+        face = Face3D([Point3D(count, 0, 0), Point3D(count + 1, 0, 0),
+                       Point3D(count + 1, 1, 0)])
+        hb_model = HBModel(f'Storey_{count}', orphaned_shades=[Shade(f'S_{count}', face)])
+        paths.append(hb_model.to_hbjson(f'storey_{count}', tmp_path))
+
+    merged = HBModel.from_hbjson(merge_hbjsons(paths, tmp_path / 'merged.hbjson'))
+    assert [shade.identifier for shade in merged.shades] == ['S_0', 'S_1', 'S_2']
+
+
+def test_convert_storeys(synthetic_ifc, synthetic_model, tmp_path):
+    paths = convert_storeys(synthetic_ifc, tmp_path, workers=2)
+    assert len(paths) == 2
+    merged = convert_storeys(synthetic_ifc, tmp_path, merge=True)
+    assert len(merged) == 1
+    assert compare_models(HBModel.from_hbjson(merged[0]), synthetic_model)['passed']
+
+
+def test_convert_storeys_unassigned(synthetic_ifc, tmp_path):
+    # a beam that is converted to a shade and is not in any storey
+    ifc_file = ifcopenshell.open(str(synthetic_ifc))
+    column = ifc_file.by_type('IfcColumn')[0]
+    beam = ifc_file.createIfcBeam(
+        ifcopenshell.guid.new(), column.OwnerHistory, 'Beam', None, None,
+        column.ObjectPlacement, column.Representation)
+    ifc_file_path = tmp_path / 'beam.ifc'
+    ifc_file.write(str(ifc_file_path))
+    config = {'shades': '.IfcColumn | .IfcBeam'}
+    assert storey_partitions(ifc_file, config)[-1] == ('Unassigned', [beam.GlobalId])
+
+    merged = convert_storeys(ifc_file_path, tmp_path, merge=True, config=config)
+    shades = HBModel.from_hbjson(merged[0]).shades
+    assert beam.GlobalId in {guid_from_identifier(shade.identifier) for shade in shades}
@@ -0,0 +1,81 @@
+"""Testing the profiler of the conversion."""
+
+import json
+import threading
+import tracemalloc
+
+from honeybee_ifc.profiler import Profiler
+
+
+def test_profiler_stages_and_elements(tmp_path):
+    events = []
+    profiler = Profiler(trace_memory=True, slowest=2,
+                        hooks=[lambda event, data: events.append(event)])
+    with profiler.stage('element extraction') as record:
+        record['IfcWindow'] = 3
+        for guid in ('a', 'b', 'c'):
+            with profiler.element(guid, 'IfcWindow'):
+                pass
+
+    stage = profiler.stages['element extraction']
+    assert stage['IfcWindow'] == 3
+    assert stage['seconds'] >= 0 and 'peak_traced_mb' in stage
+    if stage['process_peak_rss_mb'] is not None:
+        assert 0 <= stage['peak_rss_increase_mb'] <= stage['process_peak_rss_mb']
+    assert profiler.element_types['IfcWindow']['count'] == 3
+    assert len(profiler.slowest_elements) == 2
+    assert events == ['element', 'element', 'element', 'stage']
+
+    path = tmp_path / 'profile.json'
+    profiler.to_json(path)
+    assert json.loads(path.read_text())['stages']['element extraction']['IfcWindow'] == 3
+
+
+def test_disabled_profiler():
+    profiler = Profiler(enabled=False)
+    with profiler.stage('wall extraction') as record:
+        record['IfcWall'] = 1
+        with profiler.element('a', 'IfcWall'):
+            pass
+    assert profiler.to_dict() == {
+        'stages': {}, 'element_types': {}, 'slowest_elements': []}
+
+
+def test_profiler_peak_rss_increase():
+    profiler = Profiler()
+    with profiler.stage('allocation'):
+        data = bytearray(64 * 1024 ** 2)
+        data[::4096] = b'x' * len(data[::4096])
+    del data
+    with profiler.stage('small'):
+        pass
+    allocation, small = profiler.stages['allocation'], profiler.stages['small']
+    if allocation['process_peak_rss_mb'] is None:
+        return
+    # the second stage doesn't inherit the peak of the first one
+    assert allocation['peak_rss_increase_mb'] > 32
+    assert small['peak_rss_increase_mb'] < 32
+    assert small['process_peak_rss_mb'] >= allocation['process_peak_rss_mb']
+
+
+def test_profiler_stages_in_threads():
+    profiler = Profiler(trace_memory=True)
+    started, finish = threading.Event(), threading.Event()
+
+    def stage():
+        with profiler.stage('thread'):
+            started.set()
+            finish.wait(10)
+            assert len([0] * 100000)
+
+    thread = threading.Thread(target=stage)
+    with profiler.stage('main'):
+        thread.start()
+        started.wait(10)
+    # the stage of the thread is still tracing after the first stage is finished
+    assert tracemalloc.is_tracing()
+    finish.set()
+    thread.join()
+    assert not tracemalloc.is_tracing()
+    assert set(profiler.stages) == {'thread', 'main'}
+    assert profiler.stages['thread']['peak_traced_mb'] > 0
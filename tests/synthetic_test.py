@@ -0,0 +1,178 @@
+"""Testing the conversion of a synthetic IFC building with 2 storeys and 3 rooms per
+storey."""
+
+import multiprocessing
+
+import ifcopenshell
+import pytest
+from honeybee.model import Model as HBModel
+
+from benchmarks.generator import generate
+from honeybee_ifc.compact import load_compact
+from honeybee_ifc.compare import compare_models
+from honeybee_ifc.element import Element
+from honeybee_ifc.model import Model
+from honeybee_ifc.hosting import find_hosts
+
+
+def test_synthetic_counts(synthetic_model):
+    assert len(synthetic_model.apertures) == 8
+    assert len(synthetic_model.doors) == 4
+    # each column is a box with 6 faces
+    assert len(synthetic_model.shades) == 4 * 6
+    assert len(synthetic_model.properties.radiance.sensor_grids) == 6
+
+
+def test_synthetic_apertures_are_vertical(synthetic_model):
+    for aperture in synthetic_model.apertures:
+        assert abs(aperture.normal.z) < 0.01
+        assert abs(aperture.area - 1.2 * 1.2) < 0.01
+
+
+def test_synthetic_hosted_sub_faces(synthetic_ifc):
+    hb_model = Model(synthetic_ifc, merge_coplanar=True, host_sub_faces=True) \
+        .to_honeybee()
+    assert not hb_model.orphaned_apertures and not hb_model.orphaned_doors
+    assert len(hb_model.apertures) == 8
+    assert len(hb_model.doors) == 4
+    for face in hb_model.orphaned_faces:
+        # the openings are filled on both sides of the walls
+        assert not face.geometry.has_holes
+        for sub_face in face.apertures + face.doors:
+            assert find_hosts([face.geometry], [sub_face.geometry]) == [0]
+
+
+def test_synthetic_workers(synthetic_ifc):
+    expected = Model(synthetic_ifc, merge_coplanar=True, host_sub_faces=True) \
+        .to_honeybee()
+    model = Model(synthetic_ifc, merge_coplanar=True, host_sub_faces=True, workers=2,
+                  profile=True)
+    hb_model = model.to_honeybee()
+    assert hb_model.to_dict() == expected.to_dict()
+    assert model.profiler.stages['honeybee conversion']['workers'] == 2
+
+
+def test_synthetic_notch_that_can_not_be_filled(synthetic_ifc, monkeypatch, caplog):
+    monkeypatch.setattr('honeybee_ifc.model.can_fill_notch', lambda *args: False)
+    hb_model = Model(synthetic_ifc, merge_coplanar=True, host_sub_faces=True) \
+        .to_honeybee()
+    assert len(hb_model.orphaned_apertures) == 8
+    assert len(hb_model.orphaned_doors) == 4
+    assert 'is not hosted' in caplog.text
+
+
+def test_synthetic_compact_elements(synthetic_ifc):
+    model = Model(synthetic_ifc, backend='native')
+    elements = model.walls + model.windows + model.doors + model.slabs + \
+        model.shades + model.spaces
+    for element in elements:
+        assert not hasattr(element, '__dict__')
+    assert model.windows[0].window is model.windows[0].element
+    # elements without settings share the default settings
+    assert Element(model.windows[0].element).settings is \
+        Element(model.doors[0].element).settings
+
+    window = model.windows[0]
+    assert window.has_shape_data
+    vertices, triangles = window.shape_data()
+    assert triangles.dtype.itemsize == 4
+    window.polyface3d
+    # the triangles are released once the geometry is built
+    assert window.has_polyface3d and not window.has_shape_data
+    wall = model.walls[0]
+    assert wall.has_shape_data
+    wall.to_face3ds()
+    assert wall.has_face3ds and not wall.has_shape_data
+
+
+def test_synthetic_energy_profile(synthetic_ifc):
+    model = Model(synthetic_ifc, config='energy')
+    assert not model.spaces
+    hb_model = model.to_honeybee()
+    assert not hb_model.properties.radiance.sensor_grids
+    assert len(hb_model.shades) == 4 * 6
+
+    model = Model(synthetic_ifc, config={'shades': None, 'walls': None})
+    assert not model.shades and not model.walls
+    assert len(model.windows) == 8
+
+
+def test_synthetic_instancing(synthetic_ifc):
+    model = Model(synthetic_ifc, instancing=True)
+    reference = Model(synthetic_ifc)
+    elements = {element.guid: element for element in reference.windows +
+                reference.doors + reference.shades + reference._get_openings()}
+    instanced = [element for element in model.windows + model.doors + model.shades +
+                 model._get_openings() if element.is_instance]
+    assert instanced
+    for element in instanced:
+        expected = elements[element.guid].polyface3d
+        assert abs(element.polyface3d.area - expected.area) < 1e-6
+        assert element.polyface3d.center.is_equivalent(expected.center, 1e-6)
+
+
+def test_synthetic_pipeline(synthetic_ifc, tmp_path):
+    expected = HBModel.from_hbjson(
+        Model(synthetic_ifc).to_hbjson(str(tmp_path), 'stream', stream=True))
+    model = Model(synthetic_ifc, lazy=True, profile=True)
+    hb_model = HBModel.from_hbjson(
+        model.to_hbjson(str(tmp_path), 'pipeline', pipeline=True))
+    for attr in ('orphaned_faces', 'orphaned_apertures', 'orphaned_doors', 'shades'):
+        assert sorted(obj.identifier for obj in getattr(hb_model, attr)) == \
+            sorted(obj.identifier for obj in getattr(expected, attr))
+    assert len(hb_model.properties.radiance.sensor_grids) == 6
+    stages = model.profiler.stages
+    assert stages['tessellation']['items'] == stages['conversion']['items']
+
+
+def test_synthetic_pipeline_tessellation_error(synthetic_ifc, tmp_path):
+    # the tessellation process opens its own copy of the file
+    model = Model(synthetic_ifc, lazy=True)
+    model.ifc_file_path = tmp_path / 'missing.ifc'
+    with pytest.raises(OSError):
+        model.to_hbjson(str(tmp_path), 'pipeline', pipeline=True)
+    assert not multiprocessing.active_children()
+
+
+def test_synthetic_millimetres(synthetic_model, tmp_path):
+    path = generate(tmp_path / 'millimetres.ifc', storeys=2, rooms=3, windows=4,
+                    doors=2, columns=2, length_unit='MILLIMETRE')
+    model = Model(path, instancing=True)
+    assert model.unit_factor == 0.001
+    hb_model = model.to_honeybee()
+    for attr in ('faces', 'apertures', 'doors', 'shades'):
+        objects, expected = getattr(hb_model, attr), getattr(synthetic_model, attr)
+        assert len(objects) == len(expected)
+        assert abs(sum(obj.area for obj in objects) -
+                   sum(obj.area for obj in expected)) < 1e-6
+    assert hb_model.min.is_equivalent(synthetic_model.min, 1e-6)
+    assert hb_model.max.is_equivalent(synthetic_model.max, 1e-6)
+    assert sum(len(grid.sensors) for grid in hb_model.properties.radiance.sensor_grids) \
+        == sum(len(grid.sensors)
+               for grid in synthetic_model.properties.radiance.sensor_grids)
+
+
+def test_synthetic_compact_output(synthetic_ifc, synthetic_model, tmp_path):
+    path = Model(synthetic_ifc).to_compact(str(tmp_path))
+    assert path.endswith('synthetic.hbz')
+    assert compare_models(load_compact(path), synthetic_model)['passed']
+
+
+def test_synthetic_cache_without_fills_voids(synthetic_ifc, tmp_path):
+    ifc_file = ifcopenshell.open(str(synthetic_ifc))
+    ifc_file.remove(ifc_file.by_type('IfcRelFillsElement')[0])
+    path = tmp_path / 'unfilled.ifc'
+    ifc_file.write(str(path))
+    for _ in range(2):
+        model = Model(path, cache_folder=str(tmp_path / 'cache'))
+        assert len(model.windows) == 8 and len(model.doors) == 4
+
+
+def test_synthetic_every_element_is_tessellated(synthetic_ifc):
+    """The first shape of the geometry iterator must not be dropped."""
+    model = Model(synthetic_ifc, backend='native')
+    for ifc_type, elements in (('IfcWall', model.walls), ('IfcWindow', model.windows),
+                               ('IfcDoor', model.doors)):
+        expected = {element.GlobalId for element in model.ifc_file.by_type(ifc_type)}
+        assert {element.guid for element in elements} == expected
+        assert all(element.has_shape_data for element in elements)